@@ -1,44 +1,126 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-import gradio as gr
+import asyncio
+import contextlib
 import os
-from app import demo
+import threading
 
-# Workaround para erro de Jinja2 no Vercel/Serverless
-# Criamos uma nova instância FastAPI e montamos o Gradio nela
-app = FastAPI()
+from fastapi import FastAPI, Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from config import Config
+from src import metrics
+from src.profiler import iniciar_profiler
+from src.rest_api import create_router
+from src.services import get_services, warm_up
+from src.static_assets import PUBLIC, PWA
+
+# Importante para partidas a frio (Vercel/Serverless): este módulo não importa
+# gradio, pandas nem openpyxl e não lê as planilhas. Rotas estáticas respondem
+# de imediato; a interface Gradio é montada na primeira requisição que chega
+# até ela e os dados são carregados na primeira validação (ou no aquecimento)
 
-# 1. Configurar rotas de arquivos estáticos (PWA)
-# Precisamos definir isso AQUI também, pois o 'demo.app' do app.py é ignorado ao usar mount_gradio_app
 current_dir = os.path.dirname(os.path.realpath(__file__))
 # O arquivo api/index.py está em /api, então subimos um nível para a raiz
 root_dir = os.path.dirname(current_dir)
-pwa_directory = os.path.join(root_dir, "src", "pwa")
 assets_directory = os.path.join(root_dir, "assets")
 
-# Montar pasta assets
-# IMPORTANTE: Usamos '/public' e não '/assets' para evitar conflito com 
-# os arquivos internos do frontend do Gradio que também usam '/assets'
-app.mount("/public", StaticFiles(directory=assets_directory), name="public")
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Profiler por amostragem (Config.PROFILE_ENABLED)
+    iniciar_profiler()
+    # Aquecimento opcional: carrega os dados sem atrasar a inicialização
+    if Config.EAGER_LOAD:
+        threading.Thread(target=warm_up, name="lg-ai-warmup", daemon=True).start()
+    # Compressão calculada antes das primeiras visitas; os derivados de imagem
+    # vêm da implantação (build_snapshot.py --static) ou do primeiro pedido
+    for assets in (PUBLIC, PWA):
+        threading.Thread(target=assets.preparar, name="lg-ai-static", daemon=True).start()
+    yield
+
+
+# Workaround para erro de Jinja2 no Vercel/Serverless
+# Criamos uma nova instância FastAPI e montamos o Gradio nela
+app = FastAPI(lifespan=lifespan)
+
+# 1. Configurar rotas de arquivos estáticos (PWA)
+# Precisamos definir isso AQUI também, pois o 'demo.app' do app.py é ignorado ao usar mount_gradio_app
+
+# Pasta assets servida em '/public' (e não '/assets' para evitar conflito com
+# os arquivos internos do frontend do Gradio que também usam '/assets').
+# Arquivos saem da memória com ETag/304, brotli/gzip e derivados AVIF/WebP;
+# URLs com ?v=<hash> (PUBLIC.url) recebem cache imutável
+@app.api_route("/public/{nome:path}", methods=["GET", "HEAD"])
+async def public(nome: str, request: Request):
+    return await run_in_threadpool(PUBLIC.responder, request, nome)
 
 # Rotas do PWA
-@app.get("/app-manifest.json")
-async def manifest():
-    return FileResponse(os.path.join(pwa_directory, "manifest.json"))
-
-@app.get("/sw.js")
-async def service_worker():
-    return FileResponse(os.path.join(pwa_directory, "sw.js"))
-
-@app.get("/favicon.ico")
-async def favicon():
-    return FileResponse(os.path.join(assets_directory, "fav-ai-lg.ico"))
-
-# 2. Montar Gradio
-app = gr.mount_gradio_app(
-    app, 
-    demo, 
-    path="/",
-    favicon_path=os.path.join(assets_directory, "fav-ai-lg.ico")
-)
+@app.api_route("/app-manifest.json", methods=["GET", "HEAD"])
+async def manifest(request: Request):
+    return await run_in_threadpool(PWA.responder, request, "manifest.json")
+
+@app.api_route("/sw.js", methods=["GET", "HEAD"])
+async def service_worker(request: Request):
+    # O service worker precisa ser sempre revalidado para atualizar o PWA
+    return await run_in_threadpool(PWA.responder, request, "sw.js", False)
+
+@app.api_route("/favicon.ico", methods=["GET", "HEAD"])
+async def favicon(request: Request):
+    return await run_in_threadpool(PUBLIC.responder, request, "fav-ai-lg.ico")
+
+# Métricas no formato Prometheus: latência da validação por status e canal,
+# da formatação, das etapas de carga e da gravação do analytics
+if Config.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+# 2. API REST (JSON) para integrações, sem passar pela fila do Gradio
+# Definida antes do mount do Gradio na raiz para ter precedência
+app.include_router(create_router(
+    lambda: get_services().validator,
+    lambda: get_services().analytics,
+    lambda: get_services().template_builder
+))
+
+
+class LazyGradioApp:
+    """
+    Aplicação ASGI que monta a interface Gradio na primeira requisição.
+    
+    A importação do gradio (e de app.py) acontece em uma thread auxiliar para
+    não bloquear o event loop enquanto as rotas leves continuam respondendo.
+    """
+    
+    def __init__(self):
+        self._app = None
+        self._lock = asyncio.Lock()
+    
+    def _build(self):
+        import gradio as gr
+        from app import HEAD_HTML, demo
+        
+        gradio_app = gr.mount_gradio_app(
+            FastAPI(),
+            demo,
+            path="/",
+            head=HEAD_HTML,
+            favicon_path=os.path.join(assets_directory, "fav-ai-lg.ico")
+        )
+        return gradio_app, demo
+    
+    async def __call__(self, scope, receive, send):
+        if self._app is None:
+            async with self._lock:
+                if self._app is None:
+                    gradio_app, demo = await run_in_threadpool(self._build)
+                    # Montado após a inicialização do servidor: os eventos de
+                    # startup do Gradio (fila de eventos) rodam aqui
+                    demo.run_startup_events()
+                    await demo.run_extra_startup_events()
+                    self._app = gradio_app
+        
+        await self._app(scope, receive, send)
+
+
+# 3. Montar Gradio
+app.mount("/", LazyGradioApp())
@@ -1,35 +1,37 @@
 import gradio as gr
+import time
 import traceback
 from pathlib import Path
+from typing import Any, Dict
 
 from config import Config
-from src import DataLoader, Validator, ResponseFormatter, setup_logger
-from src.analytics import Analytics
+from src import setup_logger
+from src.error_report import FORMATOS_RELATORIO_ERROS, destino_relatorio_erros
+from src.formatter import ResponseFormatter
+from src.metrics import CONSULTAS
+from src.report_export import exportar
+from src.profiler import iniciar_profiler
+from src.services import Services, get_services, get_services_async
+from src.static_assets import PUBLIC, PWA
+from src.tracing import span, trace
 from src.utils import ValidationError
 
 # Setup
 logger = setup_logger("lg_ai_app")
-analytics = Analytics()
 
-# Carrega dados
-logger.info("Iniciando aplicação LG-AI...")
-data_loader = DataLoader()
-data_loader.load_all()
+# Dados, validadores e analytics são criados na primeira consulta (ou no
+# aquecimento), não na importação: veja src/services.py
 
-validator = Validator(data_loader)
-formatter = ResponseFormatter()
 
-# Listas para interface
-lista_redes = data_loader.get_lista_redes()
-lista_campos = data_loader.get_lista_campos()
-
-logger.info(f"Aplicação iniciada: {len(lista_redes)} redes, {len(lista_campos)} campos")
-
-
-def responder_interface(rede: str, campo: str) -> str:
+async def responder_interface(rede: str, campo: str) -> str:
     """
     Handler principal da interface Gradio.
     
+    Roda direto no event loop: com os dados carregados a consulta é só
+    busca em memória, o analytics apenas enfileira o evento e logs e traces
+    são gravados pelas threads do logger e do tracing. Só a primeira
+    chamada, que carrega os dados, vai para uma thread.
+    
     Args:
         rede: Rede selecionada
         campo: Campo selecionado
@@ -37,45 +39,199 @@ def responder_interface(rede: str, campo: str) -> str:
     Returns:
         HTML formatado com resultado
     """
-    try:
-        # Validação
-        resultado = validator.validar_campo(rede, campo)
+    with trace("responder_interface", rede=rede, campo=campo):
+        try:
+            with span("services"):
+                services = await get_services_async()
+            return _responder(services, rede, campo)
+        
+        except ValidationError as e:
+            logger.warning("Erro de validação: %s", e)
+            return ResponseFormatter.format_error(str(e))
         
-        # Analytics
-        analytics.log_query(rede, campo, resultado['status'])
+        except Exception as e:
+            logger.error("Erro inesperado: %s", e)
+            logger.error(traceback.format_exc())
+            return ResponseFormatter.format_error(f"Erro interno: {e}")
+
+
+def _responder(services: Services, rede: str, campo: str) -> str:
+    """Consulta em memória: validação, HTML (ambos em cache) e analytics"""
+    # VALIDACAO só vê as faltas no cache de respostas; CONSULTAS conta todas
+    inicio = time.perf_counter()
+    try:
+        resultado, resposta_html = services.formatter.render_cached(
+            (services.data_loader.require_data().versao, rede, campo),
+            lambda: services.validator.validar_campo(rede, campo)
+        )
+    except ValidationError:
+        CONSULTAS.observe(time.perf_counter() - inicio, 'error', '')
+        raise
+    CONSULTAS.observe(time.perf_counter() - inicio, resultado['status'], resultado['canal'])
+    
+    # No event loop o analytics não espera vaga na fila
+    services.analytics.log_query(
+        rede, campo, resultado['status'], resultado['canal'], bloquear=False
+    )
+    return resposta_html
+
+
+def validar_arquivo_interface(rede: str, arquivo: str, formato_erros: str = "csv"):
+    """
+    Handler da validação de arquivo de vendas.
+    
+    Gerador: envia o andamento à interface enquanto o arquivo é lido e, ao
+    final, o relatório. As violações de cada linha são gravadas durante a
+    leitura no relatório de erros para download.
+    
+    Args:
+        rede: Rede selecionada
+        arquivo: Caminho do arquivo enviado
+        formato_erros: Formato do relatório de erros ('csv' ou 'xlsx')
+    
+    Yields:
+        Tupla (HTML do andamento ou do relatório, caminho do relatório de
+        erros ou None)
+    """
+    try:
+        if not arquivo:
+            raise ValidationError("Nenhum arquivo enviado")
+        destino = destino_relatorio_erros(arquivo, formato_erros)
         
-        # Formatação
-        return formatter.format_response(resultado)
+        validacao = get_services().file_validator.iter_validacao(rede, Path(arquivo), destino)
+        relatorio: Dict[str, Any] = {}
+        for progresso in validacao:
+            if progresso.relatorio is None:
+                yield ResponseFormatter.format_progresso_arquivo(
+                    progresso.linhas, progresso.violacoes, progresso.fracao
+                ), None
+            else:
+                relatorio = progresso.relatorio
         
+        yield (
+            ResponseFormatter.format_relatorio_arquivo(relatorio),
+            None if relatorio['valido'] else relatorio['relatorio_erros']
+        )
+    
     except ValidationError as e:
-        logger.warning(f"Erro de validação: {e}")
-        return formatter.format_error(str(e))
+        logger.warning("Erro de validação de arquivo: %s", e)
+        yield ResponseFormatter.format_error(str(e)), None
     
     except Exception as e:
-        logger.error(f"Erro inesperado: {e}")
+        logger.error("Erro inesperado ao validar arquivo: %s", e)
         logger.error(traceback.format_exc())
-        return formatter.format_error(f"Erro interno: {e}")
+        yield ResponseFormatter.format_error(f"Erro interno: {e}"), None
+
+
+def relatorio_rede_interface(rede: str):
+    """
+    Handler do relatório com todos os campos de uma rede.
+    
+    Args:
+        rede: Rede selecionada
+    
+    Returns:
+        HTML do relatório, caminhos dos arquivos CSV e Excel exportados e
+        do modelo de planilha do canal da rede
+    """
+    try:
+        services = get_services()
+        relatorio, resposta_html = services.formatter.render_cached(
+            ('relatorio', services.data_loader.require_data().versao, rede),
+            lambda: services.validator.relatorio_rede(rede),
+            ResponseFormatter.format_relatorio_rede
+        )
+        modelo = services.template_builder.salvar(relatorio['canal'])
+        return (
+            resposta_html,
+            str(exportar(relatorio, 'csv')),
+            str(exportar(relatorio, 'xlsx')),
+            str(modelo)
+        )
+    
+    except ValidationError as e:
+        logger.warning("Erro de validação no relatório da rede: %s", e)
+        return ResponseFormatter.format_error(str(e)), None, None, None
+    
+    except Exception as e:
+        logger.error("Erro inesperado no relatório da rede: %s", e)
+        logger.error(traceback.format_exc())
+        return ResponseFormatter.format_error(f"Erro interno: {e}"), None, None, None
+
+
+def atualizar_listas():
+    """
+    Preenche as opções dos dropdowns com a versão atual dos dados.
+    
+    Executado a cada carregamento da página; é também o que carrega os
+    dados na primeira visita.
+    
+    Returns:
+        Atualizações para os dropdowns de rede, campo, rede do arquivo e
+        rede do relatório
+    """
+    data_loader = get_services().data_loader
+    redes = data_loader.get_lista_redes()
+    campos = data_loader.get_lista_campos()
+    return gr.update(choices=redes), gr.update(choices=campos), gr.update(choices=redes), gr.update(choices=redes)
+
+
+def sugerir_redes(key_up_data: gr.KeyUpData):
+    """
+    Typeahead de redes: opções ordenadas pela busca aproximada.
+    
+    Args:
+        key_up_data: Texto digitado no dropdown
+    
+    Returns:
+        Atualização das opções do dropdown
+    """
+    data_loader = get_services().data_loader
+    consulta = key_up_data.input_value or ""
+    if not consulta.strip():
+        return gr.update(choices=data_loader.get_lista_redes())
+    return gr.update(choices=data_loader.buscar_redes(consulta, Config.TYPEAHEAD_LIMITE))
+
+
+def sugerir_campos(key_up_data: gr.KeyUpData):
+    """
+    Typeahead de campos: opções ordenadas pela busca aproximada.
+    
+    Args:
+        key_up_data: Texto digitado no dropdown
+    
+    Returns:
+        Atualização das opções do dropdown
+    """
+    data_loader = get_services().data_loader
+    consulta = key_up_data.input_value or ""
+    if not consulta.strip():
+        return gr.update(choices=data_loader.get_lista_campos())
+    return gr.update(choices=data_loader.buscar_campos(consulta, Config.TYPEAHEAD_LIMITE))
 
 
 # Interface Gradio
 from src.theme import LGTheme
 
+# Cabeçalho da página: ícones, manifest e registro do service worker.
+# Passado como `head` (em gr.HTML os <script> não são executados)
+HEAD_HTML = f"""
+    <link rel="icon" href="/favicon.ico" sizes="any">
+    <link rel="apple-touch-icon" href="{PUBLIC.url('fav-ai-lg.png')}">
+    <link rel="manifest" href="/app-manifest.json">
+    <meta name="viewport" content="width=device-width, initial-scale=1, maximum-scale=1, user-scalable=no">
+    <link rel="apple-touch-startup-image" href="{PUBLIC.url('fav-ai-lg.png')}">
+    <script>
+        if ('serviceWorker' in navigator) {{
+            navigator.serviceWorker.register('/sw.js')
+                .then(reg => console.log('Service Worker registered'))
+                .catch(err => console.log('Service Worker registration failed', err));
+        }}
+    </script>
+"""
+
 with gr.Blocks(title="IA Clube LG", theme=LGTheme()) as demo:
     gr.HTML("""
-        <head>
-            <link rel="icon" href="/favicon.ico" sizes="any">
-            <link rel="apple-touch-icon" href="/public/fav-ai-lg.png">
-            <link rel="manifest" href="/app-manifest.json">
-            <meta name="viewport" content="width=device-width, initial-scale=1, maximum-scale=1, user-scalable=no">
-            <link rel="apple-touch-startup-image" href="/public/fav-ai-lg.png">
-            <script>
-                if ('serviceWorker' in navigator) {
-                    navigator.serviceWorker.register('/sw.js')
-                        .then(reg => console.log('Service Worker registered'))
-                        .catch(err => console.log('Service Worker registration failed', err));
-                }
-            </script>
-        </head>
         <div class="header-container">
             <h2>Assistente Técnico - Clube LG</h2>
         </div>
@@ -88,33 +244,92 @@ with gr.Blocks(title="IA Clube LG", theme=LGTheme()) as demo:
             "Você também pode baixar o modelo oficial da planilha e o manual."
         )
     
-    # Inputs
-    with gr.Row():
-        rede_dropdown = gr.Dropdown(
-            choices=lista_redes,
+    with gr.Tab("🔍 Consultar campo"):
+        # Inputs
+        with gr.Row():
+            rede_dropdown = gr.Dropdown(
+                choices=[],
+                label="🏢 Selecione sua rede",
+                filterable=True,
+                interactive=True
+            )
+            campo_dropdown = gr.Dropdown(
+                choices=[],
+                label="📝 Selecione o campo que deseja verificar",
+                filterable=True,
+                interactive=True
+            )
+        
+        # Botão e resultado
+        submit_btn = gr.Button("🔍 Consultar", variant="primary")
+        resultado_output = gr.HTML()
+        
+        submit_btn.click(
+            fn=responder_interface,
+            inputs=[rede_dropdown, campo_dropdown],
+            outputs=resultado_output,
+            concurrency_limit=Config.GRADIO_CONCURRENCY_CONSULTA
+        )
+        
+        # Typeahead: opções reordenadas pela busca a cada tecla
+        rede_dropdown.key_up(sugerir_redes, outputs=rede_dropdown, queue=False, show_progress="hidden")
+        campo_dropdown.key_up(sugerir_campos, outputs=campo_dropdown, queue=False, show_progress="hidden")
+    
+    with gr.Tab("📂 Validar arquivo"):
+        arquivo_rede_dropdown = gr.Dropdown(
+            choices=[],
             label="🏢 Selecione sua rede",
-            filterable=False,
+            filterable=True,
             interactive=True
         )
-        campo_dropdown = gr.Dropdown(
-            choices=lista_campos,
-            label="📝 Selecione o campo que deseja verificar",
-            filterable=False,
-            interactive=True
+        arquivo_upload = gr.File(
+            label="📤 Envie seu arquivo de vendas (.xlsx ou .csv)",
+            file_types=list(Config.EXTENSOES_ARQUIVO_VENDAS),
+            type="filepath"
+        )
+        formato_erros_radio = gr.Radio(
+            choices=list(FORMATOS_RELATORIO_ERROS),
+            value="csv",
+            label="📄 Formato do relatório de erros"
         )
+        validar_arquivo_btn = gr.Button("✅ Validar arquivo", variant="primary")
+        relatorio_output = gr.HTML()
+        relatorio_erros_output = gr.File(label="📥 Relatório de erros por linha")
+        
+        validar_arquivo_btn.click(
+            fn=validar_arquivo_interface,
+            inputs=[arquivo_rede_dropdown, arquivo_upload, formato_erros_radio],
+            outputs=[relatorio_output, relatorio_erros_output]
+        )
+        arquivo_rede_dropdown.key_up(sugerir_redes, outputs=arquivo_rede_dropdown, queue=False, show_progress="hidden")
     
-    # Botão e resultado
-    submit_btn = gr.Button("🔍 Consultar", variant="primary")
-    resultado_output = gr.HTML()
+    with gr.Tab("📋 Campos da rede"):
+        relatorio_rede_dropdown = gr.Dropdown(
+            choices=[],
+            label="🏢 Selecione sua rede",
+            filterable=True,
+            interactive=True
+        )
+        relatorio_rede_btn = gr.Button("📋 Ver todos os campos", variant="primary")
+        relatorio_rede_output = gr.HTML()
+        with gr.Row():
+            relatorio_csv = gr.File(label="📥 Baixar lista (.csv)")
+            relatorio_xlsx = gr.File(label="📥 Baixar lista (.xlsx)")
+            relatorio_modelo = gr.File(label="📥 Modelo de planilha do canal (.xlsx)")
+        
+        relatorio_rede_btn.click(
+            fn=relatorio_rede_interface,
+            inputs=relatorio_rede_dropdown,
+            outputs=[relatorio_rede_output, relatorio_csv, relatorio_xlsx, relatorio_modelo]
+        )
+        relatorio_rede_dropdown.key_up(sugerir_redes, outputs=relatorio_rede_dropdown, queue=False, show_progress="hidden")
     
-    submit_btn.click(
-        fn=responder_interface,
-        inputs=[rede_dropdown, campo_dropdown],
-        outputs=resultado_output
+    # Opções preenchidas ao abrir a página, sempre com os dados atuais
+    demo.load(
+        fn=atualizar_listas,
+        outputs=[rede_dropdown, campo_dropdown, arquivo_rede_dropdown, relatorio_rede_dropdown]
     )
     
-
-    
     # Downloads
     with gr.Row():
         gr.File(
@@ -235,27 +450,29 @@ button.primary:hover {
 </style>
 """)
 
-# Mount static files (PWA)
-from fastapi import Response
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
-import os
+# Limites da fila (ver Config.GRADIO_*); vale também para a interface
+# montada em api/index.py
+demo.queue(
+    default_concurrency_limit=Config.GRADIO_CONCURRENCY_PADRAO,
+    max_size=Config.GRADIO_QUEUE_MAX_SIZE
+)
 
-pwa_directory = "src/pwa"
+# Arquivos estáticos (PWA) com ETag, compressão e cache, como em api/index.py
+from fastapi import Request
 
-# Mount assets architecture for PWA
-demo.app.mount("/public", StaticFiles(directory="assets"), name="public")
+@demo.app.get("/public/{nome:path}")
+async def public(nome: str, request: Request):
+    return PUBLIC.responder(request, nome)
 
 @demo.app.get("/app-manifest.json")
-async def manifest():
-    return FileResponse(os.path.join(pwa_directory, "manifest.json"))
+async def manifest(request: Request):
+    return PWA.responder(request, "manifest.json")
 
 @demo.app.get("/sw.js")
-async def service_worker():
-    return FileResponse(os.path.join(pwa_directory, "sw.js"))
-
-# Mount other static files if needed, but avoid root mount to prevent conflicts
-# demo.app.mount("/", StaticFiles(directory="src/pwa", html=True), name="pwa")
+async def service_worker(request: Request):
+    return PWA.responder(request, "sw.js", imutavel=False)
 
 if __name__ == "__main__":
-    demo.launch()
\ No newline at end of file
+    iniciar_profiler()
+    get_services()
+    demo.launch(head=HEAD_HTML, max_threads=Config.GRADIO_MAX_THREADS)
\ No newline at end of file
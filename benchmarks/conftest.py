@@ -0,0 +1,93 @@
+"""
+Benchmarks do caminho de validação (pytest-benchmark).
+
+Ficam fora de tests/ para não atrasar a suíte de testes. Exemplos:
+    
+    # Todas as escalas, resultado em JSON
+    pytest benchmarks/ --no-cov --benchmark-json=benchmarks/results/bench.json
+    
+    # Salva uma linha de base e compara as próximas execuções com ela,
+    # falhando se a mediana piorar mais de 20%
+    pytest benchmarks/ --no-cov --benchmark-autosave
+    pytest benchmarks/ --no-cov --benchmark-compare --benchmark-compare-fail=median:20%
+
+As escalas (multiplicador do tamanho das planilhas reais) são escolhidas
+com --escalas (padrão 1,10,100).
+"""
+import functools
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+from src.data_loader import DataLoader
+from src.formatter import ResponseFormatter
+from src.validator import Validator
+from benchmarks.synthetic import gerar_dados, gerar_planilhas
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--escalas", default="1,10,100",
+        help="Escalas dos dados sintéticos, separadas por vírgula (1 = planilhas reais)"
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "escala" in metafunc.fixturenames:
+        escalas = [int(e) for e in metafunc.config.getoption("escalas").split(",")]
+        metafunc.parametrize("escala", escalas, ids=[f"{e}x" for e in escalas], scope="session")
+
+
+@functools.lru_cache(maxsize=None)
+def _dados(escala: int):
+    return gerar_dados(escala)
+
+
+@pytest.fixture
+def dados(escala):
+    """Dados sintéticos na escala do teste (gerados uma vez por sessão)"""
+    return _dados(escala)
+
+
+@pytest.fixture
+def data_loader(dados):
+    loader = DataLoader()
+    loader.set_data(dados)
+    return loader
+
+
+@pytest.fixture
+def validator(data_loader):
+    return Validator(data_loader)
+
+
+@pytest.fixture
+def formatter():
+    return ResponseFormatter()
+
+
+@pytest.fixture(scope="session")
+def _diretorios_planilhas(tmp_path_factory):
+    return {}
+
+
+@pytest.fixture
+def planilhas(escala, _diretorios_planilhas, tmp_path_factory, monkeypatch):
+    """Planilhas sintéticas em disco, usadas no lugar das reais pelo DataLoader"""
+    if escala not in _diretorios_planilhas:
+        diretorio = tmp_path_factory.mktemp(f"planilhas_{escala}x")
+        (diretorio / "manual.pdf").write_bytes(b"%PDF-1.4\n")
+        _diretorios_planilhas[escala] = (diretorio, gerar_planilhas(diretorio, escala))
+    diretorio, (redes, campos, modelo) = _diretorios_planilhas[escala]
+    
+    monkeypatch.setattr(Config, "REDES_FILE", redes)
+    monkeypatch.setattr(Config, "CAMPOS_FILE", campos)
+    monkeypatch.setattr(Config, "MODELO_FILE", modelo)
+    monkeypatch.setattr(Config, "MANUAL_FILE", diretorio / "manual.pdf")
+    monkeypatch.setattr(Config, "SNAPSHOT_FILE", diretorio / "dados.pkl")
+    monkeypatch.setattr(Config, "SHARED_DATA", False)
+    return diretorio
@@ -0,0 +1,361 @@
+"""
+Teste de carga local da API (FastAPI + uvicorn).
+
+Sobe a aplicação em uma thread com uvicorn, dispara requisições concorrentes
+com httpx e mede latência (p50/p90/p99/máx) e vazão por rota. O resultado é
+gravado em JSON e pode ser comparado com uma execução anterior para detectar
+regressões:
+    
+    # Dados sintéticos 10× maiores que as planilhas reais
+    python -m benchmarks.load_test --escala 10 --saida benchmarks/results/carga.json
+    
+    # Aplicação real (api/index.py, com as planilhas de data/)
+    python -m benchmarks.load_test --app real
+    
+    # Falha (código 1) se p99 ou vazão piorarem mais de 20%
+    python -m benchmarks.load_test --comparar benchmarks/results/carga.json --tolerancia 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import gerar_dados
+
+SAIDA_PADRAO = Path(__file__).parent / "results" / "carga.json"
+
+# Peso de cada tipo de requisição na mistura de carga
+MISTURA = (
+    ('validacao', 0.70),
+    ('validacao_invalida', 0.05),
+    ('busca_redes', 0.15),
+    ('relatorio', 0.05),
+    ('dados', 0.05),
+)
+
+
+# Variáveis de ambiente lidas pela fábrica da aplicação no processo do servidor
+_ENV_APP = "LG_AI_CARGA_APP"
+_ENV_ESCALA = "LG_AI_CARGA_ESCALA"
+
+
+def criar_app():
+    """
+    Fábrica usada pelo uvicorn (--factory) no processo do servidor.
+    
+    Com LG_AI_CARGA_APP=real usa api/index.py (planilhas de data/); caso
+    contrário, apenas a API REST sobre dados sintéticos na escala
+    LG_AI_CARGA_ESCALA. Os dados são carregados antes da primeira requisição.
+    """
+    if os.getenv(_ENV_APP) == "real":
+        import api.index
+        from src.services import get_services
+        
+        get_services()
+        return api.index.app
+    
+    from fastapi import FastAPI
+    
+    from src.data_loader import DataLoader
+    from src.rest_api import create_router
+    from src.validator import Validator
+    
+    loader = DataLoader()
+    loader.set_data(gerar_dados(int(os.getenv(_ENV_ESCALA, "1"))))
+    validator = Validator(loader)
+    
+    app = FastAPI()
+    app.include_router(create_router(lambda: validator))
+    return app
+
+
+def _dados_cliente(app: str, escala: int):
+    """Mesmos dados do servidor, usados para sortear as requisições"""
+    if app != "real":
+        return gerar_dados(escala)
+    
+    from src.data_loader import DataLoader
+    
+    loader = DataLoader()
+    loader.load_all()
+    return loader.data
+
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def iniciar_servidor(app: str, escala: int, porta: int, workers: int) -> subprocess.Popen:
+    """
+    Sobe o uvicorn em outro processo (cliente e servidor não disputam o GIL)
+    e aguarda até aceitar conexões.
+    """
+    env = {**os.environ, _ENV_APP: app, _ENV_ESCALA: str(escala)}
+    processo = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "benchmarks.load_test:criar_app", "--factory",
+            "--host", "127.0.0.1", "--port", str(porta), "--workers", str(workers),
+            "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=Path(__file__).parent.parent, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    
+    limite = time.monotonic() + 120
+    while True:
+        if processo.poll() is not None:
+            raise RuntimeError(f"Servidor encerrou ao iniciar (código {processo.returncode})")
+        try:
+            with socket.create_connection(("127.0.0.1", porta), timeout=0.5):
+                return processo
+        except OSError:
+            if time.monotonic() > limite:
+                processo.kill()
+                raise RuntimeError("Servidor não iniciou em 120s")
+            time.sleep(0.1)
+
+
+def gerador_requisicoes(dados, semente: int = 0) -> Callable[[], Tuple[str, str, Dict[str, str]]]:
+    """Sorteia (tipo, caminho, parâmetros) conforme MISTURA"""
+    rng = random.Random(semente)
+    redes = sorted(dados.mapa_rede_canal)
+    campos = [c.upper() for c in dados.status_table.campos]
+    tipos = [t for t, _ in MISTURA]
+    pesos = [p for _, p in MISTURA]
+    
+    def proxima():
+        tipo = rng.choices(tipos, pesos)[0]
+        rede = rng.choice(redes)
+        if tipo == 'validacao':
+            return tipo, "/v1/validacao", {'rede': rede, 'campo': rng.choice(campos)}
+        if tipo == 'validacao_invalida':
+            return tipo, "/v1/validacao", {'rede': rede, 'campo': rng.choice(campos)[:-2] + "XX"}
+        if tipo == 'busca_redes':
+            return tipo, "/v1/busca/redes", {'q': rede[:rng.randint(2, 6)]}
+        if tipo == 'relatorio':
+            return tipo, "/v1/relatorio", {'rede': rede}
+        return tipo, "/v1/dados", {}
+    
+    return proxima
+
+
+async def _executar(
+    base_url: str,
+    proxima: Callable,
+    requisicoes: int,
+    concorrencia: int,
+    aquecimento: int
+) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    """Dispara as requisições com no máximo `concorrencia` em andamento"""
+    import httpx
+    
+    latencias: Dict[str, List[float]] = {}
+    erros: Dict[str, int] = {}
+    fila = [proxima() for _ in range(aquecimento + requisicoes)]
+    limites = httpx.Limits(max_connections=concorrencia, max_keepalive_connections=concorrencia)
+    
+    async with httpx.AsyncClient(base_url=base_url, limits=limites, timeout=30) as client:
+        for tipo, caminho, params in fila[:aquecimento]:
+            await client.get(caminho, params=params)
+        
+        pendentes = iter(fila[aquecimento:])
+        
+        async def trabalhador():
+            for tipo, caminho, params in pendentes:
+                inicio = time.perf_counter()
+                try:
+                    resposta = await client.get(caminho, params=params)
+                    # 422 é a resposta esperada para campos inexistentes
+                    ok = resposta.status_code == 200 or (tipo == 'validacao_invalida' and resposta.status_code == 422)
+                except httpx.HTTPError:
+                    ok = False
+                latencias.setdefault(tipo, []).append(time.perf_counter() - inicio)
+                if not ok:
+                    erros[tipo] = erros.get(tipo, 0) + 1
+        
+        inicio = time.perf_counter()
+        await asyncio.gather(*(trabalhador() for _ in range(concorrencia)))
+        duracao = time.perf_counter() - inicio
+    
+    return latencias, erros, duracao
+
+
+def _percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+def resumir(latencias: List[float], duracao: float) -> Dict[str, float]:
+    """Estatísticas de latência (ms) e vazão (req/s) de um conjunto de medições"""
+    return {
+        'requisicoes': len(latencias),
+        'vazao_rps': round(len(latencias) / duracao, 1) if duracao else 0.0,
+        'media_ms': round(statistics.fmean(latencias) * 1000, 3),
+        'p50_ms': round(_percentil(latencias, 50) * 1000, 3),
+        'p90_ms': round(_percentil(latencias, 90) * 1000, 3),
+        'p99_ms': round(_percentil(latencias, 99) * 1000, 3),
+        'max_ms': round(max(latencias) * 1000, 3),
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def executar_teste_carga(
+    app: str = "sintetica",
+    escala: int = 1,
+    requisicoes: int = 5000,
+    concorrencia: int = 32,
+    aquecimento: int = 200,
+    semente: int = 0,
+    workers: int = 1
+) -> Dict[str, Any]:
+    """
+    Executa o teste de carga completo.
+    
+    Args:
+        app: 'sintetica' (API REST com dados sintéticos) ou 'real' (api/index.py)
+        escala: Escala dos dados sintéticos
+        requisicoes: Total de requisições medidas
+        concorrencia: Requisições simultâneas
+        aquecimento: Requisições descartadas antes da medição
+        semente: Semente da mistura de requisições
+        workers: Processos do uvicorn
+    
+    Returns:
+        Dicionário com parâmetros, ambiente, totais e estatísticas por rota
+    """
+    dados = _dados_cliente(app, escala)
+    porta = _porta_livre()
+    servidor = iniciar_servidor(app, escala, porta, workers)
+    try:
+        latencias, erros, duracao = asyncio.run(_executar(
+            f"http://127.0.0.1:{porta}", gerador_requisicoes(dados, semente),
+            requisicoes, concorrencia, aquecimento
+        ))
+    finally:
+        servidor.terminate()
+        try:
+            servidor.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            servidor.kill()
+    
+    todas = [valor for valores in latencias.values() for valor in valores]
+    return {
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'ambiente': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'parametros': {
+            'app': app,
+            'escala': escala if app != "real" else None,
+            'requisicoes': requisicoes,
+            'concorrencia': concorrencia,
+            'aquecimento': aquecimento,
+            'semente': semente,
+            'workers': workers,
+        },
+        'duracao_s': round(duracao, 3),
+        'erros': sum(erros.values()),
+        'total': resumir(todas, duracao),
+        'rotas': {
+            tipo: {**resumir(valores, duracao), 'erros': erros.get(tipo, 0)}
+            for tipo, valores in sorted(latencias.items())
+        },
+    }
+
+
+def comparar(atual: Dict[str, Any], base: Dict[str, Any], tolerancia: float) -> List[str]:
+    """
+    Compara duas execuções.
+    
+    Args:
+        atual: Resultado desta execução
+        base: Resultado de referência
+        tolerancia: Piora relativa aceita (0.2 = 20%)
+    
+    Returns:
+        Descrição das regressões encontradas (vazia se nenhuma)
+    """
+    regressoes = []
+    for nome, metricas in [('total', atual['total'])] + list(atual['rotas'].items()):
+        referencia = base['total'] if nome == 'total' else base.get('rotas', {}).get(nome)
+        if not referencia:
+            continue
+        if metricas['p99_ms'] > referencia['p99_ms'] * (1 + tolerancia):
+            regressoes.append(f"{nome}: p99 {referencia['p99_ms']}ms -> {metricas['p99_ms']}ms")
+        if metricas['vazao_rps'] < referencia['vazao_rps'] * (1 - tolerancia):
+            regressoes.append(f"{nome}: vazão {referencia['vazao_rps']} -> {metricas['vazao_rps']} req/s")
+    return regressoes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga local da API do LG-AI")
+    parser.add_argument("--app", choices=("sintetica", "real"), default="sintetica")
+    parser.add_argument("--escala", type=int, default=1, help="Escala dos dados sintéticos (1 = planilhas reais)")
+    parser.add_argument("--requisicoes", type=int, default=5000)
+    parser.add_argument("--concorrencia", type=int, default=32)
+    parser.add_argument("--aquecimento", type=int, default=200)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="Processos do uvicorn")
+    parser.add_argument("--saida", type=Path, default=SAIDA_PADRAO, help="Arquivo JSON do resultado")
+    parser.add_argument("--comparar", type=Path, help="Resultado anterior para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Piora relativa aceita na comparação")
+    args = parser.parse_args(argv)
+    
+    # Lido antes de rodar: --comparar e --saida podem ser o mesmo arquivo
+    base = json.loads(args.comparar.read_text(encoding='utf-8')) if args.comparar else None
+    
+    resultado = executar_teste_carga(
+        args.app, args.escala, args.requisicoes, args.concorrencia, args.aquecimento, args.semente, args.workers
+    )
+    
+    args.saida.parent.mkdir(parents=True, exist_ok=True)
+    args.saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding='utf-8')
+    
+    total = resultado['total']
+    print(
+        f"{total['requisicoes']} requisições em {resultado['duracao_s']}s: "
+        f"{total['vazao_rps']} req/s, p50 {total['p50_ms']}ms, p99 {total['p99_ms']}ms, "
+        f"{resultado['erros']} erros"
+    )
+    for tipo, metricas in resultado['rotas'].items():
+        print(f"  {tipo:<20} p50 {metricas['p50_ms']:>8}ms  p99 {metricas['p99_ms']:>8}ms  ({metricas['requisicoes']})")
+    print(f"Resultado gravado em {args.saida}")
+    
+    if base is not None:
+        regressoes = comparar(resultado, base, args.tolerancia)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao}")
+        if regressoes:
+            return 1
+    return 1 if resultado['erros'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
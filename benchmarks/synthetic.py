@@ -0,0 +1,153 @@
+"""
+Dados sintéticos para benchmarks e testes de carga.
+
+Gera tabelas com a mesma forma das planilhas reais (9 canais, símbolos
+✓/✗/vazio, redes com acentos e comentários de formato por campo) em escala
+configurável: ``escala=1`` equivale ao tamanho das planilhas reais e
+``escala=100`` tem 100× mais campos e redes. A geração é determinística
+(semente fixa), então resultados de execuções diferentes são comparáveis.
+"""
+import random
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from config import Config
+from src.data_loader import LoadedData
+from src.status_table import StatusTable
+
+# Tamanho das planilhas reais (escala 1)
+CAMPOS_BASE = 31
+REDES_BASE = 72
+
+# Canais como aparecem na planilha de campos
+CANAIS = tuple(dict.fromkeys(Config.MAPEAMENTO_CANAIS.values()))
+
+# Proporção de células obrigatórias / em branco (o restante é opcional)
+_PROPORCAO_OBRIGATORIO = 0.45
+_PROPORCAO_BRANCO = 0.15
+
+_PALAVRAS = (
+    'cnpj', 'cpf', 'nome', 'codigo', 'data', 'valor', 'quantidade', 'descricao',
+    'loja', 'vendedor', 'gerente', 'produto', 'nota', 'cupom', 'revenda', 'regional',
+)
+_NOMES_REDE = (
+    'MAGAZINE', 'CASAS', 'ELETRO', 'LOJAS', 'SÃO', 'JOÃO', 'CONSTRUÇÃO', 'DISTRIBUIDORA',
+    'AÇÃO', 'GAZIN', 'NOVO', 'MUNDO', 'CLIMA', 'AR', 'CENTRO', 'SUL',
+)
+_FORMATOS = (
+    'OBS: 14 dígitos, somente números.',
+    'OBS: 11 dígitos, somente números.',
+    'Data no formato DD/MM/AAAA',
+    'OBS: 100 caracteres (Letras e números).',
+    'Valor com duas casas decimais.',
+)
+
+
+def gerar_campos(escala: int = 1, semente: int = 0) -> List[str]:
+    """Nomes de campo normalizados e únicos (ex.: 'cpf_gerente_0012')"""
+    rng = random.Random(semente)
+    return [
+        f"{rng.choice(_PALAVRAS)}_{rng.choice(_PALAVRAS)}_{i:04d}"
+        for i in range(CAMPOS_BASE * escala)
+    ]
+
+
+def gerar_redes(escala: int = 1, semente: int = 0) -> Dict[str, str]:
+    """Mapa rede -> canal, com nomes acentuados como nas planilhas reais"""
+    rng = random.Random(semente + 1)
+    return {
+        f"{rng.choice(_NOMES_REDE)} {rng.choice(_NOMES_REDE)} {i:04d}": rng.choice(CANAIS)
+        for i in range(REDES_BASE * escala)
+    }
+
+
+def _simbolo(rng: random.Random) -> str:
+    sorteio = rng.random()
+    if sorteio < _PROPORCAO_OBRIGATORIO:
+        return '✓'
+    if sorteio < _PROPORCAO_OBRIGATORIO + _PROPORCAO_BRANCO:
+        return '✗'
+    return ''
+
+
+def gerar_colunas(campos: List[str], semente: int = 0) -> Dict[str, List[str]]:
+    """Colunas da planilha de campos: canal -> símbolos na ordem dos campos"""
+    rng = random.Random(semente + 2)
+    return {canal: [_simbolo(rng) for _ in campos] for canal in CANAIS}
+
+
+def gerar_comentarios(campos: List[str], semente: int = 0) -> Dict[str, str]:
+    """Comentários de formato para ~80% dos campos"""
+    rng = random.Random(semente + 3)
+    return {campo: rng.choice(_FORMATOS) for campo in campos if rng.random() < 0.8}
+
+
+def gerar_dados(escala: int = 1, semente: int = 0) -> LoadedData:
+    """
+    Dados sintéticos prontos para publicar em um DataLoader.
+    
+    Args:
+        escala: Multiplicador do número de campos e redes das planilhas reais
+        semente: Semente do gerador (mesma semente, mesmos dados)
+    
+    Returns:
+        LoadedData com versao identificando escala e semente
+    """
+    campos = gerar_campos(escala, semente)
+    return LoadedData(
+        comentarios=gerar_comentarios(campos, semente),
+        mapa_rede_canal=gerar_redes(escala, semente),
+        status_table=StatusTable.from_columns(campos, gerar_colunas(campos, semente)),
+        versao=f"sintetico-{escala}x-{semente}",
+    )
+
+
+def gerar_planilhas(diretorio: Path, escala: int = 1, semente: int = 0) -> Tuple[Path, Path, Path]:
+    """
+    Grava as três planilhas de origem (redes, campos e modelo) em .xlsx.
+    
+    Args:
+        diretorio: Diretório de destino
+        escala: Multiplicador do número de campos e redes
+        semente: Semente do gerador
+    
+    Returns:
+        Caminhos (redes, campos, modelo), na ordem de Config.REDES_FILE,
+        Config.CAMPOS_FILE e Config.MODELO_FILE
+    """
+    from openpyxl import Workbook
+    from openpyxl.comments import Comment
+    
+    diretorio.mkdir(parents=True, exist_ok=True)
+    campos = gerar_campos(escala, semente)
+    redes = gerar_redes(escala, semente)
+    colunas = gerar_colunas(campos, semente)
+    comentarios = gerar_comentarios(campos, semente)
+    
+    redes_file = diretorio / "Redes_Codigo_Canal.xlsx"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(['Rede', 'Código de Rede', 'Canal'])
+    for i, (rede, canal) in enumerate(redes.items()):
+        ws.append([rede, f"R{i:06d}", canal])
+    wb.save(redes_file)
+    
+    campos_file = diretorio / "Campos_por_Canal.xlsx"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(['CAMPO', *CANAIS])
+    for i, campo in enumerate(campos):
+        ws.append([campo, *(colunas[canal][i] or None for canal in CANAIS)])
+    wb.save(campos_file)
+    
+    # Comentários exigem o modo normal do openpyxl
+    modelo_file = diretorio / "Modelo_Arquivo_Vendas.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    for n, campo in enumerate(campos, start=1):
+        cell = ws.cell(row=1, column=n, value=campo)
+        if campo in comentarios:
+            cell.comment = Comment(comentarios[campo], "benchmark")
+    wb.save(modelo_file)
+    
+    return redes_file, campos_file, modelo_file
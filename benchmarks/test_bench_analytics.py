@@ -0,0 +1,36 @@
+"""Registro de consultas e estatísticas de uso"""
+import pytest
+
+from src.analytics import Analytics
+
+EVENTOS = 10_000
+
+
+@pytest.fixture
+def analytics(tmp_path):
+    a = Analytics(log_file=tmp_path / "analytics.jsonl", queue_size=1_000_000)
+    yield a
+    a.close()
+
+
+@pytest.fixture
+def analytics_com_eventos(analytics):
+    for i in range(EVENTOS):
+        analytics.log_query(f"REDE {i % 50}", f"CAMPO_{i % 30}", "obrigatorio", "VAREJO")
+    assert analytics.flush(timeout=30)
+    return analytics
+
+
+class TestAnalytics:
+    def test_log_query(self, benchmark, analytics):
+        """Custo no caminho da requisição (apenas enfileira o evento)"""
+        benchmark(analytics.log_query, "MAGAZINE LUIZA", "DATA_VENDA", "obrigatorio", "VAREJO")
+    
+    def test_get_stats(self, benchmark, analytics_com_eventos):
+        stats = benchmark(analytics_com_eventos.get_stats)
+        assert stats['total_queries'] >= EVENTOS
+    
+    def test_get_stats_recalculado(self, benchmark, analytics_com_eventos):
+        """Reprocessamento completo do log"""
+        stats = benchmark.pedantic(analytics_com_eventos.get_stats, kwargs={'recalcular': True}, rounds=5)
+        assert stats['total_queries'] >= EVENTOS
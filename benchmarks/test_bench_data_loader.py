@@ -0,0 +1,28 @@
+"""Carga dos dados: planilhas, snapshot e arquivo compartilhado"""
+from src.data_loader import DataLoader
+
+
+def _carregar(use_snapshot=True, shared_file=None):
+    loader = DataLoader(shared_file=shared_file)
+    loader.load_all(use_snapshot=use_snapshot)
+    return loader
+
+
+class TestLoadAll:
+    def test_planilhas(self, benchmark, planilhas):
+        """Leitura e processamento das planilhas (pandas/openpyxl)"""
+        loader = benchmark.pedantic(_carregar, kwargs={'use_snapshot': False}, rounds=3, iterations=1)
+        assert loader.get_lista_redes()
+    
+    def test_snapshot(self, benchmark, planilhas):
+        """Partida com snapshot atualizado"""
+        _carregar()  # grava o snapshot
+        loader = benchmark.pedantic(_carregar, rounds=10, iterations=1)
+        assert loader.get_lista_redes()
+    
+    def test_compartilhado(self, benchmark, planilhas):
+        """Mapeamento do arquivo compartilhado (modo multi-worker)"""
+        arquivo = planilhas / "dados.bin"
+        _carregar().save_shared(arquivo)
+        loader = benchmark.pedantic(_carregar, kwargs={'shared_file': arquivo}, rounds=10, iterations=1)
+        assert loader.get_lista_redes()
@@ -0,0 +1,60 @@
+"""Caminho quente de uma consulta: validação, formato e HTML"""
+import itertools
+import random
+
+import pytest
+
+from src.utils import ValidationError
+
+
+@pytest.fixture
+def consultas(dados):
+    """Pares (rede, campo) válidos, em ordem aleatória fixa"""
+    rng = random.Random(0)
+    redes = sorted(dados.mapa_rede_canal)
+    campos = [c.upper() for c in dados.status_table.campos]
+    return itertools.cycle([(rng.choice(redes), rng.choice(campos)) for _ in range(1000)])
+
+
+class TestValidator:
+    def test_validar_campo(self, benchmark, validator, consultas):
+        resultado = benchmark(lambda: validator.validar_campo(*next(consultas)))
+        assert resultado['status'] in ('obrigatorio', 'opcional', 'branco')
+    
+    def test_validar_campo_inexistente(self, benchmark, validator, consultas):
+        """Campo desconhecido: inclui o cálculo das sugestões"""
+        def _validar():
+            rede, campo = next(consultas)
+            try:
+                validator.validar_campo(rede, campo[:-2] + "XX")
+            except ValidationError as e:
+                return e
+        
+        assert isinstance(benchmark(_validar), ValidationError)
+    
+    def test_get_formato(self, benchmark, validator, dados):
+        campos = itertools.cycle(dados.status_table.campos)
+        benchmark(lambda: validator._get_formato(next(campos)))
+    
+    def test_relatorio_rede(self, benchmark, validator, dados):
+        redes = itertools.cycle(sorted(dados.mapa_rede_canal))
+        relatorio = benchmark(lambda: validator.relatorio_rede(next(redes)))
+        assert len(relatorio['campos']) == len(dados.status_table.campo_index)
+
+
+class TestFormatter:
+    def test_format_response(self, benchmark, formatter, validator, consultas):
+        resultados = [validator.validar_campo(*next(consultas)) for _ in range(100)]
+        ciclo = itertools.cycle(resultados)
+        assert benchmark(lambda: formatter.format_response(next(ciclo)))
+    
+    def test_render_cached(self, benchmark, formatter, validator, consultas):
+        """Consulta repetida: resposta HTML já em cache"""
+        pares = [next(consultas) for _ in range(100)]
+        ciclo = itertools.cycle(pares)
+        
+        def _consultar():
+            rede, campo = next(ciclo)
+            return formatter.render_cached(('bench', rede, campo), lambda: validator.validar_campo(rede, campo))
+        
+        assert benchmark(_consultar)[1]
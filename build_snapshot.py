@@ -0,0 +1,80 @@
+"""
+Gera (ou verifica) o snapshot dos dados das planilhas.
+
+Deve ser executado na implantação para que a aplicação inicie sem
+processar os arquivos Excel:
+    python build_snapshot.py                    # gera o snapshot
+    python build_snapshot.py --check            # retorna 1 se ausente/desatualizado
+    python build_snapshot.py --shared           # gera o arquivo mapeado pelos workers
+    python build_snapshot.py --shared --check
+    python build_snapshot.py --static           # gera os derivados AVIF/WebP das imagens
+
+No modo multi-worker (LG_AI_SHARED_DATA=1) basta executar novamente com
+--shared quando as planilhas mudarem: a troca do arquivo é atômica e cada
+worker passa a mapear a nova versão na próxima verificação.
+
+Com --static, as imagens de public/ e pwa/ são codificadas em
+Config.STATIC_BUILD_DIR (ou --output), para que a inicialização em
+serverless não precise gerá-las.
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from config import Config
+from src import shared_data, snapshot
+from src.static_assets import PUBLIC, PWA
+from src.data_loader import DataLoader
+from src.utils import InvalidDataError
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Snapshot dos dados das planilhas do LG-AI")
+    parser.add_argument('--check', action='store_true', help="Apenas verifica se o snapshot está atualizado")
+    parser.add_argument('--shared', action='store_true', help="Arquivo compartilhado (memory-mapped) para múltiplos workers")
+    parser.add_argument('--static', action='store_true', help="Gera os derivados AVIF/WebP dos arquivos estáticos")
+    parser.add_argument('--output', type=Path, help="Caminho do arquivo gerado")
+    args = parser.parse_args(argv)
+    
+    if args.static:
+        destino = args.output or Config.STATIC_BUILD_DIR
+        for assets in (PUBLIC, PWA):
+            assets.preparar(derivados=True, destino=destino)
+        print(f"Derivados estáticos gerados: {destino}")
+        return 0
+    
+    output = args.output or (Config.SHARED_DATA_FILE if args.shared else Config.SNAPSHOT_FILE)
+    
+    if args.check:
+        if not _atualizado(output, args.shared):
+            print(f"Snapshot ausente ou desatualizado: {output}")
+            return 1
+        print(f"Snapshot atualizado: {output}")
+        return 0
+    
+    loader = DataLoader()
+    loader.load_all(use_snapshot=False)
+    if args.shared:
+        loader.save_shared(output)
+    else:
+        loader.save_snapshot(output)
+    print(f"Snapshot gerado: {output}")
+    return 0
+
+
+def _atualizado(path: Path, shared: bool) -> bool:
+    """Verifica se o arquivo existe e corresponde às planilhas atuais"""
+    fontes = DataLoader.get_source_files()
+    if not shared:
+        return snapshot.load_snapshot(path, fontes) is not None
+    
+    try:
+        _, fontes_salvas = shared_data.load_shared(path)
+    except (OSError, InvalidDataError):
+        return False
+    return snapshot.is_fresh(fontes_salvas, fontes)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pathlib import Path
 from typing import Dict
 
@@ -17,6 +19,14 @@ class Config:
     MODELO_FILE = DATA_DIR / "Modelo_Arquivo_Vendas.xlsx"
     MANUAL_FILE = DATA_DIR / "Manual_Upload_de_Arquivos_Facilitador.pdf"
     
+    # Snapshot dos dados processados (gerado com `python build_snapshot.py`)
+    SNAPSHOT_FILE = Path(os.getenv("LG_AI_SNAPSHOT_FILE", str(DATA_DIR / ".snapshot" / "dados.pkl")))
+    
+    # Modo multi-worker: todos os workers mapeiam o mesmo arquivo de dados
+    # (gerado com `python build_snapshot.py --shared`) em vez de ler as planilhas
+    SHARED_DATA = os.getenv("LG_AI_SHARED_DATA", "0") == "1"
+    SHARED_DATA_FILE = Path(os.getenv("LG_AI_SHARED_DATA_FILE", str(DATA_DIR / ".snapshot" / "dados.bin")))
+    
     # Assets
     FAVICON_FILE = ASSETS_DIR / "favicon.png"
     
@@ -40,9 +50,119 @@ class Config:
         "nome_subgerente": "nome_sub_gerente",
     }
     
+    # Recarga automática das planilhas (verificação por stat a cada N segundos)
+    AUTO_RELOAD = os.getenv("LG_AI_AUTO_RELOAD", "1") == "1"
+    RELOAD_INTERVAL_S = float(os.getenv("LG_AI_RELOAD_INTERVAL_S", "5"))
+    
+    # Validação de arquivos de vendas
+    EXTENSOES_ARQUIVO_VENDAS = (".xlsx", ".csv")
+    MAX_VIOLACOES_RELATORIO = 1000
+    CSV_AMOSTRA_BYTES = 64 * 1024
+    # Progresso enviado à interface a cada N linhas do arquivo
+    ARQUIVO_PROGRESSO_LINHAS = 5000
+    
+    # Relatório de erros do arquivo (gravado em streaming em EXPORT_DIR/erros):
+    # violações listadas por campo e no total, e validade dos arquivos gerados
+    RELATORIO_ERROS_MAX_POR_CAMPO = 1000
+    RELATORIO_ERROS_MAX_LINHAS = 100_000
+    RELATORIO_ERROS_TTL_S = 24 * 3600
+    
+    # Respostas HTML renderizadas mantidas em memória (redes × campos)
+    RESPONSE_CACHE_SIZE = 4096
+    
+    # Carregar dados na inicialização do servidor em vez da primeira consulta
+    EAGER_LOAD = os.getenv("LG_AI_EAGER_LOAD", "0") == "1"
+    
+    # Orçamento de tempo para importar api/index.py (partida a frio)
+    IMPORT_BUDGET_S = 1.5
+    
+    # Arquivos estáticos: cache imutável das URLs versionadas (?v=<hash>),
+    # qualidade e diretório dos derivados AVIF/WebP das imagens
+    STATIC_MAX_AGE_S = 365 * 24 * 3600
+    STATIC_QUALIDADE_IMAGEM = 75
+    STATIC_CACHE_DIR = Path(os.getenv("LG_AI_STATIC_CACHE_DIR", str(Path(tempfile.gettempdir()) / "lg-ai-static")))
+    # Derivados gerados na implantação (`python build_snapshot.py --static`),
+    # consultados antes de STATIC_CACHE_DIR
+    STATIC_BUILD_DIR = Path(os.getenv("LG_AI_STATIC_BUILD_DIR", str(DATA_DIR / ".snapshot" / "static")))
+    
+    # Relatórios exportados e modelos por canal (cache por versão dos dados);
+    # arquivos sem uso há mais de EXPORT_TTL_S são apagados
+    EXPORT_DIR = Path(os.getenv("LG_AI_EXPORT_DIR", str(Path(tempfile.gettempdir()) / "lg-ai-exports")))
+    EXPORT_TTL_S = 24 * 3600
+    
+    # Fila do Gradio. A consulta de campo é async e só faz buscas em memória,
+    # então roda no event loop sem limite de concorrência (0 = sem limite);
+    # os demais eventos (arquivos, relatórios) rodam no pool de threads com
+    # GRADIO_CONCURRENCY_PADRAO execuções simultâneas por evento
+    GRADIO_CONCURRENCY_CONSULTA = int(os.getenv("LG_AI_GRADIO_CONCURRENCY_CONSULTA", "0")) or None
+    GRADIO_CONCURRENCY_PADRAO = int(os.getenv("LG_AI_GRADIO_CONCURRENCY_PADRAO", "4"))
+    GRADIO_QUEUE_MAX_SIZE = int(os.getenv("LG_AI_GRADIO_QUEUE_MAX_SIZE", "5000")) or None
+    GRADIO_MAX_THREADS = int(os.getenv("LG_AI_GRADIO_MAX_THREADS", "40"))
+    
+    # Quantidade de opções exibidas pelo typeahead dos dropdowns
+    TYPEAHEAD_LIMITE = 20
+    
+    # API REST
+    API_MAX_LOTE = 500
+    
+    # Métricas no formato Prometheus (/metrics) e limites dos histogramas
+    # de latência, em segundos
+    METRICS_ENABLED = os.getenv("LG_AI_METRICS", "1") == "1"
+    METRICS_BUCKETS_S = (
+        0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+    )
+    
+    # Analytics (gravação em lotes por thread dedicada)
+    ANALYTICS_BATCH_SIZE = 200
+    ANALYTICS_FLUSH_INTERVAL_S = 1.0
+    ANALYTICS_QUEUE_SIZE = 10000
+    ANALYTICS_PUT_TIMEOUT_S = 0.05
+    # Espera máxima de flush/close pela thread de gravação (não trava o encerramento)
+    ANALYTICS_FLUSH_TIMEOUT_S = 10.0
+    ANALYTICS_CHECKPOINT_INTERVAL_S = 30.0
+    
+    # Rotação do log de analytics (por tamanho e por dia) e retenção dos segmentos
+    ANALYTICS_MAX_BYTES = 10 * 1024 * 1024
+    ANALYTICS_COMPRESSION = os.getenv("LG_AI_ANALYTICS_COMPRESSION", "gzip")  # gzip | zstd | none
+    ANALYTICS_RETENTION_DAYS = 90
+    ANALYTICS_MAX_SEGMENTS = 500
+    
+    # Compactação dos segmentos em Parquet (requer pyarrow)
+    ANALYTICS_COMPACTION_INTERVAL_S = 300.0
+    
+    # Tracing das consultas (desligado por padrão): fração das consultas
+    # rastreadas e duração mínima para gravar o trace em TRACE_DIR
+    TRACE_ENABLED = os.getenv("LG_AI_TRACE", "0") == "1"
+    TRACE_SAMPLE_RATE = float(os.getenv("LG_AI_TRACE_SAMPLE_RATE", "1.0"))
+    TRACE_LIMIAR_MS = float(os.getenv("LG_AI_TRACE_LIMIAR_MS", "0"))
+    TRACE_DIR = Path(os.getenv("LG_AI_TRACE_DIR", str(Path(tempfile.gettempdir()) / "lg-ai-traces")))
+    
+    # Profiler por amostragem (desligado por padrão): pilhas de todas as
+    # threads a cada PROFILE_INTERVAL_MS, gravadas em formato "collapsed"
+    # (flamegraph.pl, speedscope) em PROFILE_DIR
+    PROFILE_ENABLED = os.getenv("LG_AI_PROFILE", "0") == "1"
+    PROFILE_INTERVAL_MS = float(os.getenv("LG_AI_PROFILE_INTERVAL_MS", "5"))
+    PROFILE_FLUSH_INTERVAL_S = 30.0
+    PROFILE_DIR = Path(os.getenv("LG_AI_PROFILE_DIR", str(Path(tempfile.gettempdir()) / "lg-ai-profiles")))
+    
     # Configurações de logging
     LOG_LEVEL = "INFO"
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     
+    # Gravação dos logs em uma thread dedicada (a requisição só enfileira).
+    # Com LG_AI_LOG_ASYNC=0 os logs são gravados na própria chamada, inclusive
+    # no event loop do handler async da interface: use apenas para depuração
+    LOG_ASYNC = os.getenv("LG_AI_LOG_ASYNC", "1") == "1"
+    
+    # Fração das mensagens INFO/DEBUG mantidas por logger, para os de alto
+    # volume. Ex.: LG_AI_LOG_SAMPLING="src.validator=0.1,src.rest_api=0.5"
+    LOG_SAMPLING: Dict[str, float] = {
+        nome.strip(): float(taxa)
+        for nome, _, taxa in (
+            item.partition("=") for item in os.getenv("LG_AI_LOG_SAMPLING", "").split(",") if item.strip()
+        )
+    }
+    
     # URLs
     MANUAL_URL = "https://huggingface.co/spaces/ThomasMF7/ia-clube-lg/resolve/main/Manual_Upload_de_Arquivos_Facilitador.pdf"
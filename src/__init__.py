@@ -6,10 +6,7 @@ Módulos principais para validação de campos de vendas
 __version__ = "2.0.0"
 __author__ = "Thomas MF"
 
-from .data_loader import DataLoader
-from .validator import Validator
-from .formatter import ResponseFormatter
-from .logger import setup_logger
+from importlib import import_module
 
 __all__ = [
     "DataLoader",
@@ -17,3 +14,18 @@ __all__ = [
     "ResponseFormatter",
     "setup_logger"
 ]
+
+# Exportações importadas sob demanda: importar o pacote (ex.: para as rotas
+# estáticas da API) não deve carregar pandas/openpyxl
+_LAZY_EXPORTS = {
+    "DataLoader": ".data_loader",
+    "Validator": ".validator",
+    "ResponseFormatter": ".formatter",
+    "setup_logger": ".logger",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
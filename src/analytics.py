@@ -1,76 +1,679 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
+import atexit
+import gzip
+import io
 import json
+import os
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict
+from typing import TYPE_CHECKING, Any, IO, Iterator, List, Dict, Optional, Tuple
 from collections import Counter
 
+from config import Config
 from .logger import setup_logger
+from .metrics import ANALYTICS_EVENTOS, ANALYTICS_GRAVACAO
+from .tracing import span
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .analytics_store import ColumnarStore
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None  # type: ignore[assignment]
 
 logger = setup_logger(__name__)
 
 
+class _Flush:
+    """Marcador enfileirado para forçar a gravação do lote pendente"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+
+
+# Marcador de encerramento da thread de gravação
+_STOP = object()
+
+
+class UsageStats:
+    """Contadores agregados de uso (total, por rede, por campo e por resultado)"""
+    
+    def __init__(self):
+        self.total = 0
+        self.redes: Counter = Counter()
+        self.campos: Counter = Counter()
+        self.resultados: Counter = Counter()
+    
+    def add(self, event: Dict[str, Any]) -> None:
+        """Contabiliza um evento"""
+        self.total += 1
+        self.redes[event['rede']] += 1
+        self.campos[event['campo']] += 1
+        self.resultados[event['resultado']] += 1
+    
+    def copy(self) -> "UsageStats":
+        """Cópia independente dos contadores"""
+        stats = UsageStats()
+        stats.total = self.total
+        stats.redes = self.redes.copy()
+        stats.campos = self.campos.copy()
+        stats.resultados = self.resultados.copy()
+        return stats
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            'redes': dict(self.redes),
+            'campos': dict(self.campos),
+            'resultados': dict(self.resultados)
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UsageStats":
+        stats = cls()
+        stats.total = data['total']
+        stats.redes = Counter(data['redes'])
+        stats.campos = Counter(data['campos'])
+        stats.resultados = Counter(data['resultados'])
+        return stats
+
+
 class Analytics:
     """Rastreia e analisa uso da aplicação"""
     
-    def __init__(self, log_file: Path = Path("analytics.jsonl")):
+    def __init__(
+        self,
+        log_file: Path = Path("analytics.jsonl"),
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        checkpoint_file: Optional[Path] = None,
+        store_dir: Optional[Path] = None
+    ):
         self.log_file = log_file
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_file = checkpoint_file or log_file.with_name(f"{log_file.stem}.stats.json")
+        self.store_dir = store_dir or log_file.with_name(f"{log_file.stem}_parquet")
+        self._store: Optional["ColumnarStore"] = None
+        self._compactor: Optional[threading.Thread] = None
+        
+        self.batch_size = batch_size or Config.ANALYTICS_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.ANALYTICS_FLUSH_INTERVAL_S
+        self.dropped = 0
+        
+        # Contadores do que já está em disco (mantidos pela thread de gravação)
+        # e contadores ao vivo (incluem eventos ainda na fila)
+        self._persisted, self._offset = self._recover_stats()
+        self._segment_day = self._read_segment_day()
+        self._stats = self._persisted.copy()
+        self._stats_lock = threading.Lock()
+        self._last_checkpoint = time.monotonic()
+        # Rotação (renomear, comprimir e aplicar retenção) exclui a localização
+        # e abertura dos segmentos pela compactação; a leitura é feita fora dele
+        self.rotation_lock = threading.Lock()
+        
+        # Eventos são gravados em lotes por uma única thread
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size or Config.ANALYTICS_QUEUE_SIZE)
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="lg-ai-analytics", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
     
-    def log_query(self, rede: str, campo: str, resultado: str) -> None:
+    def log_query(
+        self,
+        rede: str,
+        campo: str,
+        resultado: str,
+        canal: Optional[str] = None,
+        bloquear: bool = True
+    ) -> None:
         """
         Registra uma consulta.
         
+        Apenas enfileira o evento; a gravação em disco acontece em lotes na
+        thread de gravação. Com a fila cheia, aguarda até
+        Config.ANALYTICS_PUT_TIMEOUT_S e então descarta o evento.
+        
         Args:
             rede: Nome da rede consultada
             campo: Campo consultado
             resultado: Resultado da validação
+            canal: Canal da rede, quando conhecido
+            bloquear: False descarta o evento na hora se a fila estiver cheia
+                (para chamadas no event loop, que não pode esperar)
         """
         event = {
             'timestamp': datetime.now().isoformat(),
             'rede': rede,
             'campo': campo,
-            'resultado': resultado
+            'resultado': resultado,
+            'canal': canal
         }
         
+        if self._closed:
+            logger.warning("Analytics encerrado, query não registrada")
+            return
+        
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(event, ensure_ascii=False) + '\n')
-            logger.debug(f"Query registrada: {rede} - {campo}")
-        except Exception as e:
-            logger.error(f"Erro ao registrar query: {e}")
+            with span("analytics.enfileirar"):
+                self._queue.put(event, block=bloquear, timeout=Config.ANALYTICS_PUT_TIMEOUT_S)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+                descartados = self.dropped
+            ANALYTICS_EVENTOS.inc('descartado')
+            logger.warning("Fila de analytics cheia, query descartada (%s no total)", descartados)
+            return
+        
+        with self._stats_lock:
+            self._stats.add(event)
     
-    def get_stats(self) -> Dict[str, any]:
+    def flush(self, timeout: Optional[float] = None) -> bool:
         """
-        Obtém estatísticas de uso.
+        Grava imediatamente os eventos pendentes.
+        
+        Args:
+            timeout: Tempo máximo de espera em segundos, incluindo a espera
+                por vaga na fila (padrão: Config.ANALYTICS_FLUSH_TIMEOUT_S)
         
         Returns:
-            Dicionário com estatísticas
+            True se os eventos foram gravados dentro do prazo
         """
-        if not self.log_file.exists():
-            return {
-                'total_queries': 0,
-                'top_redes': [],
-                'top_campos': []
-            }
+        if self._closed or not self._writer.is_alive():
+            return True
         
+        if timeout is None:
+            timeout = Config.ANALYTICS_FLUSH_TIMEOUT_S
+        limite = time.monotonic() + timeout
+        marcador = _Flush()
         try:
-            queries = []
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    queries.append(json.loads(line))
+            self._queue.put(marcador, timeout=timeout)
+        except queue.Full:
+            logger.warning("Fila de analytics cheia, flush não concluído em %ss", timeout)
+            return False
+        return marcador.done.wait(max(0.0, limite - time.monotonic()))
+    
+    def close(self) -> None:
+        """Grava os eventos pendentes e encerra a thread de gravação"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        
+        timeout = Config.ANALYTICS_FLUSH_TIMEOUT_S
+        limite = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Thread de gravação do analytics parada; eventos pendentes descartados")
+            return
+        self._writer.join(max(0.0, limite - time.monotonic()))
+        if self._writer.is_alive():
+            logger.warning("Thread de gravação do analytics não terminou em %ss", timeout)
+    
+    def _run(self) -> None:
+        """Loop da thread de gravação: acumula eventos e grava por tamanho ou tempo"""
+        batch: List[Dict[str, str]] = []
+        deadline = None
+        
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
             
-            redes = [q['rede'] for q in queries]
-            campos = [q['campo'] for q in queries]
+            if item is None or item is _STOP or isinstance(item, _Flush):
+                self._write_batch(batch)
+                batch = []
+                deadline = None
+                if item is _STOP:
+                    self._save_checkpoint()
+                    return
+                if isinstance(item, _Flush):
+                    item.done.set()
+                continue
             
-            return {
-                'total_queries': len(queries),
-                'top_redes': Counter(redes).most_common(5),
-                'top_campos': Counter(campos).most_common(5)
-            }
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch)
+                batch = []
+                deadline = None
+    
+    def _write_batch(self, batch: List[Dict[str, str]]) -> None:
+        """
+        Grava um lote de eventos com uma única abertura do arquivo.
+        
+        Args:
+            batch: Eventos a gravar
+        """
+        if not batch:
+            return
+        
+        inicio = time.perf_counter()
+        try:
+            dados = ''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in batch).encode('utf-8')
+            self._maybe_rotate(len(dados))
+            with open(self.log_file, 'ab') as f:
+                f.write(dados)
+                self._offset = f.tell()
+            if self._segment_day is None:
+                self._segment_day = date.today()
+            logger.debug("%s queries registradas", len(batch))
         except Exception as e:
-            logger.error(f"Erro ao obter estatísticas: {e}")
-            return {
-                'total_queries': 0,
-                'top_redes': [],
-                'top_campos': []
-            }
+            logger.error("Erro ao registrar %s queries: %s", len(batch), e)
+            ANALYTICS_EVENTOS.inc('erro', valor=len(batch))
+            return
+        finally:
+            ANALYTICS_GRAVACAO.observe(time.perf_counter() - inicio)
+        
+        ANALYTICS_EVENTOS.inc('gravado', valor=len(batch))
+        for event in batch:
+            self._persisted.add(event)
+        
+        if time.monotonic() - self._last_checkpoint >= Config.ANALYTICS_CHECKPOINT_INTERVAL_S:
+            self._save_checkpoint()
+    
+    def _maybe_rotate(self, pending_bytes: int) -> None:
+        """
+        Rotaciona o log ativo se ultrapassar o tamanho máximo ou mudar o dia.
+        
+        Args:
+            pending_bytes: Tamanho do lote prestes a ser gravado
+        """
+        if self._offset == 0:
+            return
+        
+        excede_tamanho = self._offset + pending_bytes > Config.ANALYTICS_MAX_BYTES
+        virou_dia = self._segment_day is not None and self._segment_day != date.today()
+        if excede_tamanho or virou_dia:
+            self.rotate()
+    
+    def rotate(self) -> Optional[Path]:
+        """
+        Fecha o segmento ativo: renomeia, comprime e aplica a retenção.
+        
+        Deve ser chamado apenas pela thread de gravação (ou com ela parada).
+        
+        Returns:
+            Caminho do segmento arquivado, ou None se o log estava vazio
+        """
+        with self.rotation_lock:
+            return self._rotate()
+    
+    def _rotate(self) -> Optional[Path]:
+        if not self.log_file.exists() or self.log_file.stat().st_size == 0:
+            return None
+        
+        carimbo = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        destino = self.log_file.with_name(f"{self.log_file.stem}.{carimbo}{self.log_file.suffix}")
+        sequencia = 1
+        while destino.exists() or self._compressed_path(destino).exists():
+            destino = self.log_file.with_name(
+                f"{self.log_file.stem}.{carimbo}-{sequencia}{self.log_file.suffix}"
+            )
+            sequencia += 1
+        
+        os.replace(self.log_file, destino)
+        self._offset = 0
+        self._segment_day = None
+        # Checkpoint antes de comprimir: a partir daqui o log ativo recomeça do zero
+        self._save_checkpoint()
+        logger.info("Log de analytics rotacionado para %s", destino.name)
+        
+        for segmento in self.list_segments():
+            if segmento.suffix == self.log_file.suffix:
+                self._compress_segment(segmento)
+        self._apply_retention()
+        
+        arquivado = self._compressed_path(destino)
+        return arquivado if arquivado.exists() else destino
+    
+    def list_segments(self) -> List[Path]:
+        """
+        Lista os segmentos arquivados, do mais antigo para o mais recente.
+        
+        Returns:
+            Caminhos dos segmentos (comprimidos ou não)
+        """
+        padrao = f"{self.log_file.stem}.*{self.log_file.suffix}*"
+        return sorted(
+            p for p in self.log_file.parent.glob(padrao)
+            if p != self.log_file and not p.name.endswith('.tmp')
+        )
+    
+    def iter_events(self) -> Iterator[Dict[str, str]]:
+        """
+        Percorre todos os eventos (segmentos arquivados e log ativo) em streaming.
+        
+        Segmentos comprimidos são descomprimidos em memória, linha a linha,
+        sem gerar arquivos temporários.
+        
+        Yields:
+            Eventos na ordem em que foram gravados
+        """
+        for path in self.list_segments() + [self.log_file]:
+            yield from self.iter_segment(path)
+    
+    def iter_segment(self, path: Path) -> Iterator[Dict[str, str]]:
+        """
+        Percorre os eventos de um único segmento (ou do log ativo) em streaming.
+        
+        Args:
+            path: Segmento arquivado ou log ativo
+        
+        Yields:
+            Eventos do segmento
+        """
+        yield from self.open_segment(path)
+    
+    def open_segment(self, path: Path) -> Iterator[Dict[str, str]]:
+        """
+        Abre o segmento na hora e devolve seus eventos em streaming.
+        
+        Ao contrário de iter_segment, o arquivo já está aberto no retorno: a
+        leitura continua válida mesmo que a rotação renomeie, comprima ou
+        apague o segmento depois (permite abrir com rotation_lock e ler fora dele).
+        
+        Args:
+            path: Segmento arquivado ou log ativo
+        
+        Returns:
+            Iterador dos eventos do segmento (vazio se ele não existir)
+        """
+        try:
+            f = self._open_segment(path)
+        except FileNotFoundError:
+            return iter(())
+        except OSError as e:
+            logger.error("Erro ao ler segmento %s: %s", path.name, e)
+            return iter(())
+        return self._iter_lines(f, path.name)
+    
+    @staticmethod
+    def _iter_lines(f: IO[str], nome: str) -> Iterator[Dict[str, str]]:
+        """Eventos de um segmento já aberto (fecha o arquivo ao terminar)"""
+        try:
+            with f:
+                for line in f:
+                    if not line.endswith('\n'):
+                        break
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        logger.warning("Linha inválida em %s ignorada", nome)
+        except OSError as e:
+            logger.error("Erro ao ler segmento %s: %s", nome, e)
+    
+    def _compressed_path(self, path: Path) -> Path:
+        """Caminho do segmento após a compressão configurada"""
+        compressao = self._compression()
+        if compressao == 'gzip':
+            return path.with_name(path.name + '.gz')
+        if compressao == 'zstd':
+            return path.with_name(path.name + '.zst')
+        return path
+    
+    @staticmethod
+    def _compression() -> str:
+        """Algoritmo de compressão efetivo ('zstd' exige o pacote zstandard)"""
+        compressao = Config.ANALYTICS_COMPRESSION
+        if compressao == 'zstd' and zstandard is None:
+            return 'gzip'
+        return compressao
+    
+    def _compress_segment(self, path: Path) -> None:
+        """Comprime um segmento em streaming e remove o original"""
+        destino = self._compressed_path(path)
+        if destino == path:
+            return
+        
+        tmp = destino.with_name(destino.name + '.tmp')
+        try:
+            with open(path, 'rb') as origem:
+                if destino.suffix == '.zst':
+                    with open(tmp, 'wb') as saida:
+                        zstandard.ZstdCompressor().copy_stream(origem, saida)
+                else:
+                    with gzip.open(tmp, 'wb') as saida:
+                        while True:
+                            bloco = origem.read(1024 * 1024)
+                            if not bloco:
+                                break
+                            saida.write(bloco)
+            os.replace(tmp, destino)
+            path.unlink()
+        except Exception as e:
+            logger.error("Erro ao comprimir %s: %s", path.name, e)
+            if tmp.exists():
+                tmp.unlink()
+    
+    @staticmethod
+    def _open_segment(path: Path) -> IO[str]:
+        """Abre um segmento para leitura de texto conforme a extensão"""
+        if path.suffix == '.gz':
+            return gzip.open(path, 'rt', encoding='utf-8')
+        if path.suffix == '.zst':
+            if zstandard is None:
+                raise OSError("Pacote 'zstandard' necessário para ler segmentos .zst")
+            leitor = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+            return io.TextIOWrapper(leitor, encoding='utf-8')
+        return open(path, 'r', encoding='utf-8')
+    
+    def _apply_retention(self) -> None:
+        """Remove segmentos mais antigos que a retenção ou além do limite de quantidade"""
+        segmentos = self.list_segments()
+        limite = datetime.now() - timedelta(days=Config.ANALYTICS_RETENTION_DAYS)
+        excedentes = max(0, len(segmentos) - Config.ANALYTICS_MAX_SEGMENTS)
+        
+        for i, segmento in enumerate(segmentos):
+            if i < excedentes or datetime.fromtimestamp(segmento.stat().st_mtime) < limite:
+                try:
+                    segmento.unlink()
+                    logger.info("Segmento de analytics removido pela retenção: %s", segmento.name)
+                except OSError as e:
+                    logger.error("Erro ao remover segmento %s: %s", segmento.name, e)
+    
+    def _read_segment_day(self) -> Optional[date]:
+        """Dia do primeiro evento do log ativo (None se vazio)"""
+        if not self.log_file.exists() or self.log_file.stat().st_size == 0:
+            return None
+        try:
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                return datetime.fromisoformat(json.loads(f.readline())['timestamp']).date()
+        except Exception:
+            return date.fromtimestamp(self.log_file.stat().st_mtime)
+    
+    def _save_checkpoint(self) -> None:
+        """Grava os contadores persistidos e a posição do log correspondente"""
+        checkpoint = {'offset': self._offset, 'stats': self._persisted.to_dict()}
+        tmp = self.checkpoint_file.with_name(f"{self.checkpoint_file.name}.tmp")
+        
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(checkpoint, f, ensure_ascii=False)
+            os.replace(tmp, self.checkpoint_file)
+            self._last_checkpoint = time.monotonic()
+        except Exception as e:
+            logger.error("Erro ao gravar checkpoint de estatísticas: %s", e)
+    
+    def _recover_stats(self) -> Tuple[UsageStats, int]:
+        """
+        Recupera os contadores do checkpoint e reprocessa apenas o trecho do
+        log gravado depois dele.
+        
+        Returns:
+            Tupla (contadores, posição final do log)
+        """
+        if self.checkpoint_file.exists():
+            try:
+                checkpoint = json.loads(self.checkpoint_file.read_text(encoding='utf-8'))
+                stats, offset = UsageStats.from_dict(checkpoint['stats']), checkpoint['offset']
+                return self._replay_tail(stats, offset)
+            except Exception as e:
+                logger.warning("Checkpoint de estatísticas inválido, recalculando: %s", e)
+        
+        # Sem checkpoint: agrega todos os segmentos disponíveis
+        stats = UsageStats()
+        for event in self.iter_events():
+            stats.add(event)
+        offset = self.log_file.stat().st_size if self.log_file.exists() else 0
+        logger.info("Estatísticas recalculadas a partir dos logs: %s eventos", stats.total)
+        return stats, offset
+    
+    def _replay_tail(self, stats: UsageStats, offset: int) -> Tuple[UsageStats, int]:
+        """
+        Reprocessa o log ativo a partir da posição do checkpoint.
+        
+        Args:
+            stats: Contadores do checkpoint
+            offset: Posição do log ativo coberta pelo checkpoint
+        
+        Returns:
+            Tupla (contadores atualizados, posição final do log)
+        """
+        if not self.log_file.exists():
+            return stats, 0
+        
+        if self.log_file.stat().st_size < offset:
+            # Log truncado ou rotacionado depois do checkpoint
+            logger.warning("Log de analytics menor que o checkpoint, relendo log ativo inteiro")
+            offset = 0
+        
+        replay = 0
+        with open(self.log_file, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Linha incompleta (gravação interrompida)
+                    break
+                offset += len(line)
+                try:
+                    stats.add(json.loads(line))
+                    replay += 1
+                except Exception:
+                    logger.warning("Linha inválida no log de analytics ignorada")
+        
+        if replay:
+            logger.info("Estatísticas recuperadas: %s eventos reprocessados após o checkpoint", replay)
+        return stats, offset
+    
+    def get_stats(self, recalcular: bool = False) -> Dict[str, Any]:
+        """
+        Obtém estatísticas de uso.
+        
+        Por padrão lê apenas os contadores em memória, sem reprocessar o log.
+        
+        Args:
+            recalcular: Agrega os eventos de todos os segmentos retidos em
+                streaming, em vez de usar os contadores acumulados
+        
+        Returns:
+            Dicionário com estatísticas
+        """
+        if recalcular:
+            self.flush()
+            stats = UsageStats()
+            for event in self.iter_events():
+                stats.add(event)
+            return self._format_stats(stats)
+        
+        with self._stats_lock:
+            return self._format_stats(self._stats)
+    
+    @property
+    def store(self) -> "ColumnarStore":
+        """Armazenamento colunar (criado sob demanda; requer pyarrow)"""
+        if self._store is None:
+            from .analytics_store import ColumnarStore
+            self._store = ColumnarStore(self.store_dir)
+        return self._store
+    
+    def compact(self) -> int:
+        """
+        Compacta os segmentos rotacionados em arquivos Parquet.
+        
+        Returns:
+            Quantidade de segmentos compactados
+        """
+        return self.store.compact(self)
+    
+    def start_compaction(self, interval: Optional[float] = None) -> bool:
+        """
+        Inicia thread que compacta os segmentos periodicamente.
+        
+        Args:
+            interval: Intervalo em segundos (padrão: Config.ANALYTICS_COMPACTION_INTERVAL_S)
+        
+        Returns:
+            False se o pyarrow não estiver instalado
+        """
+        try:
+            self.store
+        except ImportError as e:
+            logger.warning("Compactação de analytics desativada: %s", e)
+            return False
+        
+        if self._compactor and self._compactor.is_alive():
+            return True
+        
+        interval = interval or Config.ANALYTICS_COMPACTION_INTERVAL_S
+        
+        def _loop():
+            while not self._closed:
+                try:
+                    self.compact()
+                except Exception as e:
+                    logger.error("Erro na compactação de analytics: %s", e)
+                time.sleep(interval)
+        
+        self._compactor = threading.Thread(target=_loop, name="lg-ai-analytics-compact", daemon=True)
+        self._compactor.start()
+        return True
+    
+    def query(
+        self,
+        inicio: datetime,
+        fim: datetime,
+        group_by: List[str],
+        top_k: Optional[int] = None,
+        filtros: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Relatório agregado por intervalo de tempo (ver ColumnarStore.query).
+        
+        Args:
+            inicio: Início do intervalo (inclusivo)
+            fim: Fim do intervalo (exclusivo)
+            group_by: Colunas de agrupamento ('rede', 'campo', 'resultado', 'canal', 'data', 'hora')
+            top_k: Maiores totais dentro de cada grupo das demais colunas
+            filtros: Igualdades adicionais, ex.: {'canal': 'VAREJO'}
+        
+        Returns:
+            Linhas com as colunas agrupadas e 'total'
+        """
+        self.flush()
+        return self.store.query(self, inicio, fim, group_by, top_k=top_k, filtros=filtros)
+    
+    def top_campos_por_rede(self, dias: int = 7, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Campos mais consultados de cada rede nos últimos dias"""
+        fim = datetime.now()
+        return self.query(fim - timedelta(days=dias), fim, ['rede', 'campo'], top_k=top_k)
+    
+    def status_por_canal_por_hora(self, inicio: datetime, fim: datetime) -> List[Dict[str, Any]]:
+        """Distribuição de resultados por canal e hora"""
+        return self.query(inicio, fim, ['hora', 'canal', 'resultado'])
+    
+    @staticmethod
+    def _format_stats(stats: UsageStats) -> Dict[str, Any]:
+        return {
+            'total_queries': stats.total,
+            'top_redes': stats.redes.most_common(5),
+            'top_campos': stats.campos.most_common(5),
+            'por_resultado': dict(stats.resultados)
+        }
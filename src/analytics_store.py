@@ -0,0 +1,290 @@
+"""
+Armazenamento colunar (Parquet) dos eventos de analytics.
+
+Segmentos já rotacionados do log jsonl são compactados em arquivos Parquet
+particionados por dia (``data=AAAA-MM-DD``). As consultas filtram primeiro
+pela partição e lêem apenas as colunas necessárias; eventos ainda não
+compactados (segmentos recentes e log ativo) são somados em memória.
+
+O manifesto guarda o nome base de cada segmento compactado, sem a extensão
+de compressão: um segmento lido como ``X.jsonl`` e comprimido depois para
+``X.jsonl.gz`` continua reconhecido. Partições mais antigas que
+Config.ANALYTICS_RETENTION_DAYS são removidas a cada compactação.
+
+Requer o pacote opcional ``pyarrow``.
+"""
+import json
+import os
+import shutil
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+except ImportError:  # pragma: no cover - dependência opcional
+    pa = None
+
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Colunas aceitas em group_by/filtros ('hora' é derivada do timestamp)
+COLUNAS_AGRUPAVEIS = ('rede', 'campo', 'resultado', 'canal', 'data', 'hora')
+
+# Eventos convertidos por vez ao gerar os arquivos Parquet
+LOTE_COMPACTACAO = 100_000
+
+
+# Extensões de compressão dos segmentos rotacionados (ver Analytics._compressed_path)
+_EXTENSOES_COMPRESSAO = ('.gz', '.zst')
+
+
+def chave_segmento(segmento: Path) -> str:
+    """Nome do segmento sem a extensão de compressão (igual antes e depois de comprimir)"""
+    nome = segmento.name
+    for extensao in _EXTENSOES_COMPRESSAO:
+        if nome.endswith(extensao):
+            return nome[:-len(extensao)]
+    return nome
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Armazenamento colunar requer o pacote 'pyarrow' (pip install pyarrow)")
+
+
+def _schema() -> "pa.Schema":
+    return pa.schema([
+        ('timestamp', pa.timestamp('us')),
+        ('rede', pa.string()),
+        ('campo', pa.string()),
+        ('resultado', pa.string()),
+        ('canal', pa.string()),
+        ('data', pa.date32()),
+    ])
+
+
+def _partitioning() -> "ds.Partitioning":
+    return ds.partitioning(pa.schema([('data', pa.date32())]), flavor='hive')
+
+
+def _to_table(events: Iterable[Dict[str, Any]]) -> "pa.Table":
+    """Converte eventos do log em tabela Arrow"""
+    colunas: Dict[str, list] = {nome: [] for nome in _schema().names}
+    for event in events:
+        try:
+            timestamp = datetime.fromisoformat(event['timestamp'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        colunas['timestamp'].append(timestamp)
+        colunas['data'].append(timestamp.date())
+        for nome in ('rede', 'campo', 'resultado', 'canal'):
+            colunas[nome].append(event.get(nome))
+    return pa.table(colunas, schema=_schema())
+
+
+class ColumnarStore:
+    """Compactação e consultas sobre os eventos de analytics em Parquet"""
+    
+    def __init__(self, root: Path):
+        _require_pyarrow()
+        self.root = root
+        self.manifest_file = root / "_manifest.json"
+        self._lock = threading.Lock()
+    
+    def compacted_segments(self) -> List[str]:
+        """Chaves (ver chave_segmento) dos segmentos já compactados"""
+        if not self.manifest_file.exists():
+            return []
+        segmentos = json.loads(self.manifest_file.read_text(encoding='utf-8'))['segmentos']
+        # Manifestos antigos guardavam o nome com a extensão de compressão
+        return sorted({chave_segmento(Path(nome)) for nome in segmentos})
+    
+    def compact(self, analytics) -> int:
+        """
+        Compacta os segmentos rotacionados ainda não convertidos e aplica a retenção.
+        
+        O analytics.rotation_lock é mantido só para localizar e abrir cada
+        segmento; a conversão acontece fora dele, sem bloquear a thread de
+        gravação. O arquivo já aberto continua legível se a rotação o
+        renomear, comprimir ou apagar durante a conversão.
+        
+        Args:
+            analytics: Instância de Analytics dona dos segmentos
+        
+        Returns:
+            Quantidade de segmentos compactados
+        """
+        with self._lock:
+            compactados = set(self.compacted_segments())
+            pendentes = {chave_segmento(s) for s in analytics.list_segments()} - compactados
+            
+            total = 0
+            for chave in sorted(pendentes):
+                with analytics.rotation_lock:
+                    # Caminho atual: o segmento pode ter sido comprimido desde a listagem
+                    segmento = next(
+                        (s for s in analytics.list_segments() if chave_segmento(s) == chave), None
+                    )
+                    if segmento is None:
+                        continue
+                    eventos = analytics.open_segment(segmento)
+                self._write_segment(segmento, eventos)
+                compactados.add(chave)
+                self._save_manifest(sorted(compactados))
+                total += 1
+                logger.info("Segmento %s compactado em Parquet", segmento.name)
+            
+            self._apply_retention(analytics, compactados)
+            return total
+    
+    def _apply_retention(self, analytics, compactados: set) -> None:
+        """
+        Remove partições mais antigas que Config.ANALYTICS_RETENTION_DAYS e tira do
+        manifesto os segmentos que a retenção do log já apagou.
+        """
+        limite = date.today() - timedelta(days=Config.ANALYTICS_RETENTION_DAYS)
+        if self.root.exists():
+            for particao in self.root.glob('data=*'):
+                try:
+                    dia = date.fromisoformat(particao.name.split('=', 1)[1])
+                except ValueError:
+                    continue
+                if dia < limite:
+                    shutil.rmtree(particao, ignore_errors=True)
+                    logger.info("Partição de analytics removida pela retenção: %s", particao.name)
+        
+        existentes = {chave_segmento(s) for s in analytics.list_segments()}
+        if compactados - existentes:
+            compactados &= existentes
+            self._save_manifest(sorted(compactados))
+    
+    def _write_segment(self, segmento: Path, eventos: Iterable[Dict[str, Any]]) -> None:
+        """Converte os eventos de um segmento em arquivos Parquet particionados por dia"""
+        # Nome base fixo por segmento: recompactar sobrescreve em vez de duplicar
+        base = segmento.name.split('.jsonl')[0]
+        lote: List[Dict[str, Any]] = []
+        parte = 0
+        
+        def _gravar():
+            nonlocal parte
+            ds.write_dataset(
+                _to_table(lote),
+                self.root,
+                format='parquet',
+                partitioning=_partitioning(),
+                basename_template=f"{base}-{parte}-{{i}}.parquet",
+                existing_data_behavior='overwrite_or_ignore',
+            )
+            parte += 1
+            lote.clear()
+        
+        for event in eventos:
+            lote.append(event)
+            if len(lote) >= LOTE_COMPACTACAO:
+                _gravar()
+        if lote:
+            _gravar()
+    
+    def _save_manifest(self, segmentos: List[str]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_file.with_name(self.manifest_file.name + '.tmp')
+        tmp.write_text(json.dumps({'segmentos': segmentos}), encoding='utf-8')
+        os.replace(tmp, self.manifest_file)
+    
+    def query(
+        self,
+        analytics,
+        inicio: datetime,
+        fim: datetime,
+        group_by: Sequence[str],
+        top_k: Optional[int] = None,
+        filtros: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Conta eventos no intervalo [inicio, fim) agrupados pelas colunas pedidas.
+        
+        Args:
+            analytics: Instância de Analytics (para os eventos não compactados)
+            inicio: Início do intervalo (inclusivo)
+            fim: Fim do intervalo (exclusivo)
+            group_by: Colunas de agrupamento (ver COLUNAS_AGRUPAVEIS)
+            top_k: Mantém os k maiores totais dentro de cada grupo formado
+                pelas demais colunas (ex.: top campos por rede)
+            filtros: Igualdades adicionais, ex.: {'rede': 'MAGAZINE LUIZA'}
+        
+        Returns:
+            Lista de dicionários com as colunas agrupadas e 'total', em ordem
+            decrescente de total
+        """
+        filtros = filtros or {}
+        invalidas = (set(group_by) | set(filtros)) - set(COLUNAS_AGRUPAVEIS)
+        if invalidas:
+            raise ValueError(f"Colunas inválidas: {sorted(invalidas)}")
+        
+        filtro = (
+            (ds.field('data') >= inicio.date()) & (ds.field('data') <= fim.date())
+            & (ds.field('timestamp') >= pa.scalar(inicio, pa.timestamp('us')))
+            & (ds.field('timestamp') < pa.scalar(fim, pa.timestamp('us')))
+        )
+        for coluna, valor in filtros.items():
+            if coluna != 'hora':
+                filtro = filtro & (ds.field(coluna) == valor)
+        
+        # Apenas as colunas realmente usadas são lidas dos arquivos
+        colunas = sorted(set(group_by) - {'hora'})
+        if 'hora' in group_by or 'hora' in filtros:
+            colunas.append('timestamp')
+        if not colunas:
+            # Só a contagem interessa: a coluna de partição não é lida do arquivo
+            colunas = ['data']
+        
+        tabelas = [self._pending_table(analytics).filter(filtro).select(colunas)]
+        if self.manifest_file.exists():
+            dataset = ds.dataset(self.root, format='parquet', partitioning=_partitioning(), schema=_schema())
+            tabelas.append(dataset.to_table(columns=colunas, filter=filtro))
+        tabela = pa.concat_tables(tabelas)
+        
+        if 'hora' in group_by or 'hora' in filtros:
+            tabela = tabela.append_column(
+                'hora', pc.floor_temporal(tabela['timestamp'], unit='hour')
+            )
+            if 'hora' in filtros:
+                tabela = tabela.filter(pc.equal(tabela['hora'], pa.scalar(filtros['hora'], pa.timestamp('us'))))
+        
+        if not group_by:
+            return [{'total': tabela.num_rows}]
+        
+        agregado = tabela.group_by(list(group_by)).aggregate([([], 'count_all')])
+        linhas = [
+            {**{c: linha[c] for c in group_by}, 'total': linha['count_all']}
+            for linha in agregado.to_pylist()
+        ]
+        linhas.sort(key=lambda linha: -linha['total'])
+        
+        if top_k is not None:
+            por_grupo: Dict[tuple, int] = {}
+            selecionadas = []
+            for linha in linhas:
+                chave = tuple(linha[c] for c in group_by[:-1])
+                if por_grupo.get(chave, 0) < top_k:
+                    por_grupo[chave] = por_grupo.get(chave, 0) + 1
+                    selecionadas.append(linha)
+            linhas = selecionadas
+        
+        return linhas
+    
+    def _pending_table(self, analytics) -> "pa.Table":
+        """Eventos ainda não compactados (segmentos recentes e log ativo)"""
+        # Com a rotação parada os segmentos são apenas abertos; a leitura dos
+        # arquivos abertos acontece fora do lock, sem bloquear a thread de gravação
+        with analytics.rotation_lock:
+            compactados = set(self.compacted_segments())
+            pendentes = [s for s in analytics.list_segments() if chave_segmento(s) not in compactados]
+            abertos = [analytics.open_segment(path) for path in pendentes + [analytics.log_file]]
+        return _to_table(event for eventos in abertos for event in eventos)
@@ -0,0 +1,87 @@
+"""
+Dados de validação para o cliente (service worker do PWA).
+
+Resumo compacto da tabela de status (redes, canais, campos e formatos) que
+o service worker guarda em cache para responder /v1/validacao sem ir ao
+servidor, inclusive offline. O JSON é montado e comprimido uma única vez
+por versão dos dados; o cliente revalida pelo ETag e só baixa de novo
+quando as planilhas mudam.
+"""
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from .data_loader import LoadedData
+from .static_assets import Asset, criar_asset
+
+# Incrementar sempre que o formato do JSON mudar (lido por src/pwa/sw.js)
+CLIENT_DATA_FORMAT = 1
+
+# (dados, asset) da última versão publicada
+_cache: Optional[Tuple[LoadedData, Asset]] = None
+_lock = threading.Lock()
+
+
+def montar_dados_cliente(dados: LoadedData) -> Dict[str, Any]:
+    """
+    Monta o resumo usado pelo service worker.
+    
+    Args:
+        dados: Versão dos dados
+    
+    Returns:
+        Dicionário com versao, canais, campos (normalizados), status (uma
+        string por canal com um dígito por campo: 0 obrigatório, 1 opcional,
+        2 em branco), redes (rede -> canal) e formatos (campo -> comentário)
+    """
+    tabela = dados.status_table
+    campos = list(tabela.campo_index)
+    
+    status = {}
+    for canal, col in tabela.canal_index.items():
+        linha = tabela.matrix[col]
+        status[canal] = "".join(str(linha[i]) for i in tabela.campo_index.values())
+    
+    formatos = {}
+    for campo in campos:
+        formato = dados.get_formato(campo)
+        if formato:
+            formatos[campo] = formato
+    
+    return {
+        'formato': CLIENT_DATA_FORMAT,
+        'versao': dados.versao,
+        'canais': list(tabela.canal_index),
+        'campos': campos,
+        'status': status,
+        'redes': {
+            rede: canal for rede, canal in dados.canal_por_rede.items()
+            if canal in tabela.canal_index
+        },
+        'formatos': formatos,
+    }
+
+
+def dados_cliente_asset(dados: LoadedData) -> Asset:
+    """
+    JSON do resumo já serializado e comprimido, reaproveitado enquanto a
+    versão dos dados não mudar.
+    
+    Args:
+        dados: Versão atual dos dados
+    
+    Returns:
+        Asset com ETag pelo conteúdo e variantes brotli/gzip
+    """
+    global _cache
+    item = _cache
+    if item is not None and item[0] is dados:
+        return item[1]
+    
+    with _lock:
+        if _cache is None or _cache[0] is not dados:
+            conteudo = json.dumps(
+                montar_dados_cliente(dados), ensure_ascii=False, separators=(',', ':')
+            ).encode('utf-8')
+            _cache = (dados, criar_asset('dados.json', conteudo, 'application/json'))
+        return _cache[1]
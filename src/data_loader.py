@@ -1,119 +1,455 @@
-import pandas as pd
-from openpyxl import load_workbook
-from functools import lru_cache
-from typing import Dict, List
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 
 from config import Config
-from .utils import validate_file_exists, normalize_campo, InvalidDataError
+from .utils import validate_file_exists, DataNotLoadedError, InvalidDataError
+from .status_table import StatusTable
+from .search_index import SearchIndex
+from . import snapshot
 from .logger import setup_logger
+from .metrics import CARGA
 
 logger = setup_logger(__name__)
 
 
+@dataclass(frozen=True, eq=False)
+class LoadedData:
+    """
+    Conjunto imutável de dados carregados das planilhas.
+    
+    Uma recarga cria uma nova instância e a publica com uma única atribuição,
+    então quem lê ``DataLoader.data`` uma vez por requisição nunca vê dados
+    de duas versões misturados.
+    
+    Contém apenas estruturas simples (dicionários, tuplas e bytes): nada do
+    pandas, que só é usado para ler as planilhas (ver sheet_parser).
+    """
+    comentarios: Dict[str, str]
+    mapa_rede_canal: Dict[str, str]
+    status_table: StatusTable
+    versao: str = ""
+    canal_por_rede: Dict[str, str] = field(init=False, repr=False)
+    formato_por_campo: Dict[str, str] = field(init=False, repr=False)
+    campos_por_formato: Dict[str, Tuple[str, ...]] = field(init=False, repr=False)
+    busca_redes: SearchIndex = field(init=False, repr=False)
+    busca_campos: SearchIndex = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        inicio = time.perf_counter()
+        
+        # Canal já mapeado de cada rede (substitui o antigo lru_cache)
+        canal_por_rede = {}
+        for rede, canal in self.mapa_rede_canal.items():
+            canal_original = str(canal).strip().upper()
+            canal_por_rede[rede] = sys.intern(Config.MAPEAMENTO_CANAIS.get(canal_original, canal_original))
+        object.__setattr__(self, 'canal_por_rede', canal_por_rede)
+        
+        formato_por_campo = self._build_formato_index(self.comentarios)
+        object.__setattr__(self, 'formato_por_campo', formato_por_campo)
+        
+        # Índice reverso: comentário -> campos da tabela que o compartilham
+        campos_por_formato: Dict[str, List[str]] = {}
+        for campo in dict.fromkeys(self.status_table.campos):
+            formato = formato_por_campo.get(campo)
+            if formato is not None:
+                campos_por_formato.setdefault(formato, []).append(campo)
+        object.__setattr__(
+            self, 'campos_por_formato', {f: tuple(c) for f, c in campos_por_formato.items()}
+        )
+        
+        # Busca aproximada (typeahead e sugestões), nos mesmos textos das listas
+        object.__setattr__(self, 'busca_redes', SearchIndex(sorted(self.mapa_rede_canal)))
+        object.__setattr__(self, 'busca_campos', SearchIndex(c.upper() for c in self.status_table.campos))
+        CARGA.observe(time.perf_counter() - inicio, 'indices')
+    
+    @staticmethod
+    def _build_formato_index(comentarios: Dict[str, str]) -> Dict[str, str]:
+        """
+        Indexa os comentários pela chave canônica do campo.
+        
+        Chaves com "__" são unificadas com "_" (a primeira coluna da planilha
+        prevalece), a chave original continua valendo quando não houver
+        versão unificada e os sinônimos de Config.SINONIMOS_COMENTARIOS
+        apontam para o comentário do campo de destino.
+        
+        Args:
+            comentarios: Comentários do modelo (coluna -> texto)
+        
+        Returns:
+            Dicionário campo normalizado -> comentário
+        """
+        indice: Dict[str, str] = {}
+        for chave, texto in comentarios.items():
+            indice.setdefault(chave.replace("__", "_"), texto)
+        for chave, texto in comentarios.items():
+            indice.setdefault(chave, texto)
+        
+        for sinonimo, destino in Config.SINONIMOS_COMENTARIOS.items():
+            if destino in indice:
+                indice[sinonimo] = indice[destino]
+            else:
+                indice.pop(sinonimo, None)
+        
+        return indice
+    
+    def get_canal(self, rede: str) -> str:
+        """Obtém o canal mapeado de uma rede ("" se não existir)"""
+        return self.canal_por_rede.get(rede, "")
+    
+    def get_formato(self, campo_norm: str) -> Optional[str]:
+        """Obtém o comentário de formato de um campo normalizado (None se não houver)"""
+        return self.formato_por_campo.get(campo_norm)
+    
+    def get_campos_por_formato(self, formato: str) -> Tuple[str, ...]:
+        """Obtém os campos da tabela que compartilham o mesmo comentário de formato"""
+        return self.campos_por_formato.get(formato, ())
+
+
 class DataLoader:
     """Carrega e gerencia dados das planilhas Excel"""
     
-    def __init__(self):
-        self.df_redes: pd.DataFrame = None
-        self.df_campos: pd.DataFrame = None
-        self.comentarios: Dict[str, str] = {}
-        self.mapa_rede_canal: Dict[str, str] = {}
+    def __init__(self, shared_file: Optional[Path] = None):
+        """
+        Args:
+            shared_file: Arquivo de dados compartilhado a mapear em vez de ler
+                as planilhas (padrão: Config.SHARED_DATA_FILE se
+                Config.SHARED_DATA estiver ativo)
+        """
+        if shared_file is None and Config.SHARED_DATA:
+            shared_file = Config.SHARED_DATA_FILE
+        self.shared_file = shared_file
+        
+        self._data: Optional[LoadedData] = None
+        self._fontes: Dict[str, Dict[str, Any]] = {}
+        self._shared_id: Optional[Tuple[int, int, int]] = None
         self._loaded = False
+        self._reload_lock = threading.Lock()
+        self._reload_listeners: List[Callable[[LoadedData], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._watcher_stop = threading.Event()
     
-    def load_all(self) -> None:
-        """Carrega todos os dados necessários"""
+    @property
+    def data(self) -> Optional[LoadedData]:
+        """Versão atual dos dados (ler uma vez e reutilizar durante a requisição)"""
+        return self._data
+    
+    def require_data(self) -> LoadedData:
+        """
+        Versão atual dos dados, garantindo que já foram carregados.
+        
+        Returns:
+            Dados publicados por load_all/set_data
+        
+        Raises:
+            DataNotLoadedError: Se nenhum dado foi carregado ainda
+        """
+        dados = self._data
+        if dados is None:
+            raise DataNotLoadedError("Dados das planilhas ainda não foram carregados")
+        return dados
+    
+    @property
+    def comentarios(self) -> Dict[str, str]:
+        return self._data.comentarios if self._data else {}
+    
+    @property
+    def mapa_rede_canal(self) -> Dict[str, str]:
+        return self._data.mapa_rede_canal if self._data else {}
+    
+    @property
+    def status_table(self) -> Optional[StatusTable]:
+        return self._data.status_table if self._data else None
+    
+    @staticmethod
+    def get_source_files() -> List[Path]:
+        """Retorna as planilhas de origem dos dados"""
+        return [Config.REDES_FILE, Config.CAMPOS_FILE, Config.MODELO_FILE]
+    
+    def load_all(self, use_snapshot: bool = True) -> None:
+        """
+        Carrega todos os dados necessários.
+        
+        No modo compartilhado o arquivo de dados é apenas mapeado em memória;
+        se ele não existir, os dados são carregados normalmente.
+        
+        Args:
+            use_snapshot: Usa dados pré-processados (arquivo compartilhado ou
+                snapshot em Config.SNAPSHOT_FILE atualizado) e regrava o
+                snapshot após processar as planilhas
+        """
         if self._loaded:
             logger.info("Dados já carregados, usando cache")
             return
         
         logger.info("Iniciando carregamento de dados...")
         
-        try:
-            self._validate_files()
-            self.df_redes = self._load_redes()
-            self.df_campos = self._load_and_normalize_campos()
-            self.comentarios = self._load_comentarios()
-            self.mapa_rede_canal = self._create_rede_canal_map()
+        with self._reload_lock, CARGA.time('total'):
+            if use_snapshot and self.shared_file is not None:
+                try:
+                    with CARGA.time('compartilhado'):
+                        self._load_shared()
+                    logger.info("Dados mapeados de %s", self.shared_file)
+                    return
+                except (OSError, InvalidDataError) as e:
+                    logger.warning("Arquivo de dados compartilhado indisponível, lendo planilhas: %s", e)
+            
+            try:
+                self._validate_files()
+                
+                if use_snapshot:
+                    with CARGA.time('snapshot'):
+                        carregado = self._load_snapshot(Config.SNAPSHOT_FILE)
+                    if carregado:
+                        logger.info("Dados carregados do snapshot")
+                        return
+                
+                with CARGA.time('planilhas'):
+                    fontes = snapshot.fingerprint(self.get_source_files())
+                    self.set_data(self._parse_sources(snapshot.versao(fontes)))
+                self._fontes = fontes
+                logger.info("Dados carregados com sucesso")
             
-            self._loaded = True
-            logger.info("Dados carregados com sucesso")
+            except Exception as e:
+                logger.error("Erro ao carregar dados: %s", e)
+                raise
             
-        except Exception as e:
-            logger.error(f"Erro ao carregar dados: {e}")
-            raise
+            if use_snapshot:
+                with CARGA.time('gravar_snapshot'):
+                    self._try_save_snapshot()
     
-    def _validate_files(self) -> None:
-        """Valida existência de todos os arquivos necessários"""
-        files_to_check = [
-            Config.REDES_FILE,
-            Config.CAMPOS_FILE,
-            Config.MODELO_FILE,
-            Config.MANUAL_FILE
-        ]
+    def reload(self, force: bool = False) -> bool:
+        """
+        Recarrega as planilhas se alguma delas mudou.
         
-        for filepath in files_to_check:
-            validate_file_exists(filepath)
-            logger.debug(f"Arquivo validado: {filepath.name}")
+        Os novos dados são montados sem afetar os atuais e publicados de uma
+        só vez; em caso de erro os dados atuais continuam valendo.
+        
+        No modo compartilhado verifica apenas se um novo arquivo de dados foi
+        publicado e, nesse caso, passa a mapeá-lo.
+        
+        Args:
+            force: Recarrega mesmo sem alteração nas planilhas
+        
+        Returns:
+            True se os dados foram recarregados
+        """
+        with self._reload_lock:
+            if self._shared_id is not None:
+                return self._reload_shared(force)
+            
+            if not force and self._loaded and not self._sources_changed():
+                return False
+            
+            logger.info("Recarregando planilhas...")
+            try:
+                self._validate_files()
+                with CARGA.time('recarga'):
+                    fontes = snapshot.fingerprint(self.get_source_files())
+                    dados = self._parse_sources(snapshot.versao(fontes))
+            except Exception as e:
+                logger.error("Erro ao recarregar dados, mantendo versão atual: %s", e)
+                return False
+            
+            self.set_data(dados)
+            self._fontes = fontes
+            self._try_save_snapshot()
+            logger.info("Dados recarregados (versão %s)", dados.versao[:12])
+            return True
+    
+    def set_data(self, dados: LoadedData) -> None:
+        """
+        Publica uma nova versão dos dados e limpa os caches derivados.
+        
+        Args:
+            dados: Dados completos já montados
+        """
+        self._data = dados
+        self._loaded = True
+        
+        for listener in list(self._reload_listeners):
+            try:
+                listener(dados)
+            except Exception as e:
+                logger.error("Erro ao notificar recarga de dados: %s", e)
     
-    def _load_redes(self) -> pd.DataFrame:
-        """Carrega planilha de redes"""
-        logger.info(f"Carregando redes de {Config.REDES_FILE.name}")
-        df = pd.read_excel(Config.REDES_FILE)
+    def add_reload_listener(self, listener: Callable[[LoadedData], None]) -> None:
+        """
+        Registra callback chamado sempre que novos dados forem publicados.
         
-        # Validação
-        required_columns = ['Rede', 'Canal']
-        missing = set(required_columns) - set(df.columns)
-        if missing:
-            raise InvalidDataError(f"Colunas faltando em Redes: {missing}")
+        Args:
+            listener: Função que recebe a nova versão dos dados
+        """
+        self._reload_listeners.append(listener)
+    
+    def start_auto_reload(self, interval: Optional[float] = None) -> None:
+        """
+        Inicia thread que verifica as planilhas periodicamente.
         
-        if df['Rede'].isna().any():
-            raise InvalidDataError("Existem redes com valores nulos")
+        Args:
+            interval: Intervalo em segundos (padrão: Config.RELOAD_INTERVAL_S)
+        """
+        if self._watcher and self._watcher.is_alive():
+            return
         
-        logger.info(f"Carregadas {len(df)} redes")
-        return df
+        interval = interval or Config.RELOAD_INTERVAL_S
+        self._watcher_stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="lg-ai-reload", daemon=True
+        )
+        self._watcher.start()
+        logger.info("Recarga automática ativada (a cada %ss)", interval)
+    
+    def stop_auto_reload(self) -> None:
+        """Para a thread de recarga automática"""
+        self._watcher_stop.set()
+        if self._watcher:
+            self._watcher.join()
+            self._watcher = None
     
-    def _load_and_normalize_campos(self) -> pd.DataFrame:
-        """Carrega e normaliza planilha de campos"""
-        logger.info(f"Carregando campos de {Config.CAMPOS_FILE.name}")
-        df = pd.read_excel(Config.CAMPOS_FILE)
+    def _watch(self, interval: float) -> None:
+        """Loop da thread de recarga automática"""
+        while not self._watcher_stop.wait(interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error("Erro na verificação de planilhas: %s", e)
+    
+    def _sources_changed(self) -> bool:
+        """Verifica (via stat, barato) se alguma planilha mudou desde a carga"""
+        try:
+            return not snapshot.is_fresh(self._fontes, self.get_source_files())
+        except OSError:
+            # Arquivo sendo substituído; tenta de novo na próxima verificação
+            return False
+    
+    def _parse_sources(self, versao: str = "") -> LoadedData:
+        """Processa as planilhas e monta uma nova versão dos dados"""
+        # pandas/openpyxl só são importados quando não há snapshot atualizado
+        from .sheet_parser import parse_sources
+        return parse_sources(versao)
+    
+    def _load_shared(self) -> None:
+        """
+        Mapeia o arquivo de dados compartilhado e publica seus dados.
+        
+        Raises:
+            OSError: Se o arquivo não existir ou não puder ser lido
+            InvalidDataError: Se o arquivo estiver corrompido
+        """
+        from . import shared_data
+        
+        if self.shared_file is None:
+            raise OSError("Arquivo de dados compartilhado não configurado")
+        shared_id = shared_data.assinatura(self.shared_file)
+        dados, fontes = shared_data.load_shared(self.shared_file)
+        
+        self.set_data(dados)
+        self._fontes = fontes
+        self._shared_id = shared_id
+    
+    def _reload_shared(self, force: bool) -> bool:
+        """Passa a mapear o arquivo compartilhado se uma nova versão foi publicada"""
+        from . import shared_data
+        
+        if self.shared_file is None:
+            return False
+        try:
+            if not force and shared_data.assinatura(self.shared_file) == self._shared_id:
+                return False
+            self._load_shared()
+        except (OSError, InvalidDataError) as e:
+            # Ex.: arquivo sendo substituído; tenta de novo na próxima verificação
+            logger.warning("Erro ao recarregar dados compartilhados, mantendo versão atual: %s", e)
+            return False
+        
+        logger.info("Dados compartilhados recarregados (versão %s)", self.require_data().versao[:12])
+        return True
+    
+    def _load_snapshot(self, path: Path) -> bool:
+        """
+        Restaura os dados a partir do snapshot.
         
-        # Validação
-        if 'CAMPO' not in df.columns:
-            raise InvalidDataError("Coluna 'CAMPO' não encontrada")
+        Args:
+            path: Caminho do snapshot
+        
+        Returns:
+            True se o snapshot estava atualizado e foi aplicado
+        """
+        conteudo = snapshot.load_snapshot(path, self.get_source_files())
+        if conteudo is None:
+            return False
         
-        if df['CAMPO'].isna().any():
-            raise InvalidDataError("Existem campos com valores nulos")
+        dados, fontes = conteudo
+        self.set_data(dados)
+        self._fontes = fontes
+        return True
+    
+    def save_snapshot(self, path: Optional[Path] = None) -> Path:
+        """
+        Grava os dados carregados em um snapshot.
+        
+        Args:
+            path: Caminho do snapshot (padrão: Config.SNAPSHOT_FILE)
         
-        # Normalização
-        df['CAMPO_NORMALIZADO'] = df['CAMPO'].apply(normalize_campo)
+        Returns:
+            Caminho do snapshot gravado
         
-        logger.info(f"Carregados {len(df)} campos")
-        logger.debug(f"Campos normalizados: {df['CAMPO_NORMALIZADO'].tolist()[:5]}...")
+        Raises:
+            InvalidDataError: Se os dados ainda não foram carregados das planilhas
+        """
+        if not self._loaded or not self._fontes:
+            raise InvalidDataError("Dados precisam ser carregados das planilhas antes do snapshot")
         
-        return df
+        path = path or Config.SNAPSHOT_FILE
+        snapshot.save_snapshot(path, self._data, self._fontes)
+        return path
     
-    def _load_comentarios(self) -> Dict[str, str]:
-        """Extrai comentários do modelo Excel"""
-        logger.info(f"Extraindo comentários de {Config.MODELO_FILE.name}")
-        comentarios = {}
+    def save_shared(self, path: Optional[Path] = None) -> Path:
+        """
+        Grava os dados carregados no arquivo compartilhado entre workers.
+        
+        Args:
+            path: Caminho do arquivo (padrão: Config.SHARED_DATA_FILE)
+        
+        Returns:
+            Caminho do arquivo gravado
         
-        wb = load_workbook(Config.MODELO_FILE, data_only=True)
-        ws = wb.active
+        Raises:
+            InvalidDataError: Se os dados ainda não foram carregados
+        """
+        from . import shared_data
         
-        for cell in ws[1]:
-            if cell.comment and cell.value:
-                key = cell.value.strip().lower()
-                comentarios[key] = cell.comment.text.strip()
+        if not self._loaded or not self._fontes:
+            raise InvalidDataError("Dados precisam ser carregados antes de gerar o arquivo compartilhado")
         
-        logger.info(f"Extraídos {len(comentarios)} comentários")
-        return comentarios
+        path = path or Config.SHARED_DATA_FILE
+        shared_data.save_shared(path, self.require_data(), self._fontes)
+        return path
     
-    def _create_rede_canal_map(self) -> Dict[str, str]:
-        """Cria mapeamento de rede para canal"""
-        mapa = dict(zip(self.df_redes['Rede'], self.df_redes['Canal']))
-        logger.debug(f"Criado mapa com {len(mapa)} redes")
-        return mapa
+    def _try_save_snapshot(self) -> None:
+        """Grava o snapshot, apenas registrando falhas"""
+        try:
+            self.save_snapshot(Config.SNAPSHOT_FILE)
+        except OSError as e:
+            # Ex.: sistema de arquivos somente leitura no serverless
+            logger.warning("Não foi possível gravar o snapshot: %s", e)
+    
+    def _validate_files(self) -> None:
+        """Valida existência de todos os arquivos necessários"""
+        files_to_check = [
+            Config.REDES_FILE,
+            Config.CAMPOS_FILE,
+            Config.MODELO_FILE,
+            Config.MANUAL_FILE
+        ]
+        
+        for filepath in files_to_check:
+            validate_file_exists(filepath)
+            logger.debug("Arquivo validado: %s", filepath.name)
     
     def get_lista_redes(self) -> List[str]:
         """Retorna lista ordenada de redes"""
@@ -121,12 +457,19 @@ class DataLoader:
     
     def get_lista_campos(self) -> List[str]:
         """Retorna lista de campos normalizados em uppercase"""
-        return self.df_campos['CAMPO_NORMALIZADO'].str.upper().tolist()
+        return [campo.upper() for campo in self.require_data().status_table.campos]
+    
+    def buscar_redes(self, consulta: str, limite: int = 10) -> List[str]:
+        """Redes mais relevantes para o texto digitado (prefixo, acentos e erros de digitação)"""
+        return self._data.busca_redes.search(consulta, limite) if self._data else []
+    
+    def buscar_campos(self, consulta: str, limite: int = 10) -> List[str]:
+        """Campos (em uppercase) mais relevantes para o texto digitado"""
+        return self._data.busca_campos.search(consulta, limite) if self._data else []
     
-    @lru_cache(maxsize=128)
     def get_canal_for_rede(self, rede: str) -> str:
         """
-        Obtém canal para uma rede (com cache).
+        Obtém canal para uma rede (pré-calculado a cada carga dos dados).
         
         Args:
             rede: Nome da rede
@@ -134,5 +477,4 @@ class DataLoader:
         Returns:
             Nome do canal
         """
-        canal_original = self.mapa_rede_canal.get(rede, "").strip().upper()
-        return Config.MAPEAMENTO_CANAIS.get(canal_original, canal_original)
+        return self._data.get_canal(rede) if self._data else ""
@@ -0,0 +1,211 @@
+"""
+Relatório de erros de um arquivo de vendas, gravado em streaming.
+
+Cada violação encontrada pelo FileValidator é escrita no arquivo assim que
+aparece (CSV com o módulo csv, Excel com o modo write-only do openpyxl),
+então a memória usada não depende do tamanho do arquivo validado. O
+relatório lista no máximo ``max_por_campo`` violações de cada campo e
+``max_linhas`` no total; o resumo ao final traz as contagens completas por
+campo, inclusive das violações que não foram listadas.
+"""
+import csv
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Formatos aceitos para o relatório de erros
+FORMATOS_RELATORIO_ERROS = ('csv', 'xlsx')
+
+CABECALHO_ERROS = ('LINHA', 'CAMPO', 'ERRO', 'VALOR', 'DETALHE')
+CABECALHO_RESUMO = ('CAMPO', 'VIOLAÇÕES', 'LISTADAS NO RELATÓRIO')
+
+# Mesmo separador da exportação do relatório de campos (Excel em português)
+SEPARADOR_CSV = ';'
+
+# Tipos de violação por linha
+VIOLACAO_OBRIGATORIO_VAZIO = 'obrigatorio_vazio'
+VIOLACAO_BRANCO_PREENCHIDO = 'branco_preenchido'
+VIOLACAO_FORMATO_INVALIDO = 'formato_invalido'
+
+DESCRICOES_VIOLACAO = {
+    VIOLACAO_OBRIGATORIO_VAZIO: "obrigatório não preenchido",
+    VIOLACAO_BRANCO_PREENCHIDO: "deve ficar em branco",
+    VIOLACAO_FORMATO_INVALIDO: "formato inválido",
+}
+
+
+class RelatorioErros:
+    """Grava as violações de um arquivo linha a linha, com limite por campo"""
+    
+    def __init__(
+        self,
+        destino: Path,
+        max_por_campo: Optional[int] = None,
+        max_linhas: Optional[int] = None
+    ):
+        """
+        Args:
+            destino: Arquivo de saída (.csv ou .xlsx)
+            max_por_campo: Violações listadas por campo
+                (padrão: Config.RELATORIO_ERROS_MAX_POR_CAMPO)
+            max_linhas: Violações listadas no total
+                (padrão: Config.RELATORIO_ERROS_MAX_LINHAS)
+        
+        Raises:
+            ValueError: Se a extensão do destino não for suportada
+        """
+        self.destino = Path(destino)
+        self.formato = self.destino.suffix.lower().lstrip('.')
+        if self.formato not in FORMATOS_RELATORIO_ERROS:
+            raise ValueError(f"Formato de relatório não suportado: {self.formato}")
+        
+        self.max_por_campo = max_por_campo or Config.RELATORIO_ERROS_MAX_POR_CAMPO
+        self.max_linhas = max_linhas or Config.RELATORIO_ERROS_MAX_LINHAS
+        self.totais: Dict[str, int] = {}
+        self.listadas: Dict[str, int] = {}
+        self.linhas_gravadas = 0
+        self._fechado = False
+        
+        self.destino.parent.mkdir(parents=True, exist_ok=True)
+        if self.formato == 'csv':
+            self._arquivo = open(self.destino, 'w', encoding='utf-8-sig', newline='')
+            self._writer = csv.writer(self._arquivo, delimiter=SEPARADOR_CSV)
+            self._writer.writerow(CABECALHO_ERROS)
+        else:
+            from openpyxl import Workbook
+            
+            self._workbook = Workbook(write_only=True)
+            # Resumo como primeira aba; preenchido ao fechar
+            self._aba_resumo = self._workbook.create_sheet(title="Resumo")
+            self._aba_erros = self._workbook.create_sheet(title="Erros")
+            self._aba_erros.append(CABECALHO_ERROS)
+    
+    @property
+    def truncado(self) -> bool:
+        """Indica se alguma violação ficou fora da listagem"""
+        return self.linhas_gravadas < sum(self.totais.values())
+    
+    def adicionar(
+        self, linha: int, campo: str, erro: str, valor: Any = None, detalhe: Optional[str] = None
+    ) -> bool:
+        """
+        Registra uma violação.
+        
+        Args:
+            linha: Número da linha no arquivo validado
+            campo: Campo normalizado
+            erro: Descrição do tipo de violação
+            valor: Valor encontrado na célula
+            detalhe: Motivo específico (ex.: regra de formato)
+        
+        Returns:
+            True se a violação foi listada no relatório, False se apenas contada
+        """
+        self.totais[campo] = self.totais.get(campo, 0) + 1
+        listadas = self.listadas.get(campo, 0)
+        if listadas >= self.max_por_campo or self.linhas_gravadas >= self.max_linhas:
+            return False
+        
+        self.listadas[campo] = listadas + 1
+        self.linhas_gravadas += 1
+        registro = (linha, campo.upper(), erro, "" if valor is None else valor, detalhe or "")
+        if self.formato == 'csv':
+            self._writer.writerow(registro)
+        else:
+            self._aba_erros.append(registro)
+        return True
+    
+    def fechar(self, colunas_faltando: Sequence[str] = ()) -> Path:
+        """
+        Grava o resumo e fecha o arquivo.
+        
+        Args:
+            colunas_faltando: Colunas obrigatórias ausentes no arquivo
+        
+        Returns:
+            Caminho do relatório
+        """
+        if self._fechado:
+            return self.destino
+        self._fechado = True
+        
+        resumo = [
+            (campo.upper(), total, self.listadas.get(campo, 0))
+            for campo, total in sorted(self.totais.items(), key=lambda x: (-x[1], x[0]))
+        ]
+        faltando = [(campo.upper(), "coluna obrigatória ausente", "") for campo in colunas_faltando]
+        linhas: List[Sequence[Any]] = [*resumo, *faltando]
+        
+        if self.formato == 'csv':
+            # CSV tem uma única tabela: o resumo vem depois das violações
+            self._writer.writerow(())
+            self._writer.writerow(CABECALHO_RESUMO)
+            self._writer.writerows(linhas)
+            self._arquivo.close()
+        else:
+            self._aba_resumo.append(CABECALHO_RESUMO)
+            for linha in linhas:
+                self._aba_resumo.append(linha)
+            self._workbook.save(self.destino)
+        
+        logger.info(
+            "Relatório de erros gravado em %s (%s de %s violações listadas)",
+            self.destino, self.linhas_gravadas, sum(self.totais.values())
+        )
+        return self.destino
+    
+    def descartar(self) -> None:
+        """Fecha e apaga o relatório (ex.: validação interrompida por erro)"""
+        if not self._fechado:
+            self._fechado = True
+            if self.formato == 'csv':
+                self._arquivo.close()
+            else:
+                # Gravar é a forma pública de liberar os temporários do write-only
+                self._workbook.save(self.destino)
+        self.destino.unlink(missing_ok=True)
+
+
+def destino_relatorio_erros(arquivo: str, formato: str) -> Path:
+    """
+    Caminho para um novo relatório de erros, em um diretório exclusivo.
+    
+    Relatórios mais antigos que Config.RELATORIO_ERROS_TTL_S são apagados.
+    
+    Args:
+        arquivo: Nome do arquivo validado
+        formato: 'csv' ou 'xlsx'
+    
+    Returns:
+        Caminho do relatório (ainda não criado)
+    
+    Raises:
+        ValueError: Se o formato não for suportado
+    """
+    if formato not in FORMATOS_RELATORIO_ERROS:
+        raise ValueError(f"Formato de relatório não suportado: {formato}")
+    
+    base = Config.EXPORT_DIR / "erros"
+    base.mkdir(parents=True, exist_ok=True)
+    _limpar_antigos(base)
+    
+    nome = re.sub(r'[^A-Za-z0-9]+', '_', Path(arquivo).stem).strip('_') or 'arquivo'
+    return Path(tempfile.mkdtemp(dir=base)) / f"erros_{nome}.{formato}"
+
+
+def _limpar_antigos(base: Path) -> None:
+    limite = time.time() - Config.RELATORIO_ERROS_TTL_S
+    for item in base.iterdir():
+        try:
+            if item.is_dir() and item.stat().st_mtime < limite:
+                shutil.rmtree(item, ignore_errors=True)
+        except OSError:
+            continue
@@ -0,0 +1,367 @@
+import codecs
+import csv
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Generator, Iterator, List, Optional, Sequence, Tuple
+
+from config import Config
+from .validator import Validator
+from .error_report import (
+    DESCRICOES_VIOLACAO, VIOLACAO_BRANCO_PREENCHIDO, VIOLACAO_FORMATO_INVALIDO, VIOLACAO_OBRIGATORIO_VAZIO,
+    RelatorioErros
+)
+from .format_rules import regras_por_campo
+from .status_table import STATUS_NOMES, StatusTable
+from .utils import normalize_campo, ValidationError
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Linhas do arquivo e fração já lida (recebe o número da linha atual)
+_Leitura = Tuple[Generator[Sequence[Any], None, None], Callable[[int], Optional[float]]]
+
+# Bytes inválidos em UTF-8 no meio do arquivo (ex.: CSV montado a partir de
+# fontes diferentes) são lidos como latin-1, em vez de interromper a leitura
+_ERROS_UTF8 = 'lg_latin1'
+
+
+def _latin1_fallback(erro: UnicodeError) -> Tuple[str, int]:
+    if not isinstance(erro, UnicodeDecodeError):
+        raise erro
+    return erro.object[erro.start:erro.end].decode('latin-1'), erro.end
+
+
+codecs.register_error(_ERROS_UTF8, _latin1_fallback)
+
+
+@dataclass(frozen=True)
+class Progresso:
+    """Andamento da validação de um arquivo"""
+    linhas: int
+    violacoes: int
+    fracao: Optional[float] = None
+    relatorio: Optional[Dict[str, Any]] = None
+
+
+def _celula_vazia(valor: Any) -> bool:
+    """Indica se o valor de uma célula deve ser tratado como vazio"""
+    if valor is None:
+        return True
+    if isinstance(valor, str):
+        return not valor.strip()
+    return False
+
+
+class FileValidator:
+    """Valida arquivos de vendas completos contra a tabela de campos de uma rede"""
+    
+    def __init__(self, validator: Validator, max_violacoes: int = Config.MAX_VIOLACOES_RELATORIO):
+        self.validator = validator
+        self.max_violacoes = max_violacoes
+        
+        # Colunas do modelo usam o nome do comentário (ex.: data_venda -> data)
+        self._sinonimos_reversos = {v: k for k, v in Config.SINONIMOS_COMENTARIOS.items()}
+    
+    def validar_arquivo(
+        self, rede: str, caminho: Path, relatorio_erros: Optional[Path] = None
+    ) -> Dict[str, Any]:
+        """
+        Valida um arquivo de vendas (.xlsx ou .csv) linha a linha.
+        
+        As linhas são lidas em streaming, então o consumo de memória não depende
+        do tamanho do arquivo. Apenas as primeiras ``max_violacoes`` violações são
+        guardadas; as demais entram somente nas contagens. Além da
+        obrigatoriedade, valores preenchidos são conferidos com a regra de
+        formato do comentário do campo (ver format_rules).
+        
+        Args:
+            rede: Nome da rede
+            caminho: Caminho do arquivo enviado
+            relatorio_erros: Arquivo .csv ou .xlsx onde gravar, durante a
+                leitura, as violações de cada linha (ver RelatorioErros)
+        
+        Returns:
+            Dicionário com o relatório:
+            {
+                'rede': str,
+                'canal': str,
+                'arquivo': str,
+                'total_linhas': int,
+                'colunas_obrigatorias_faltando': [{'campo': str, 'formato': str | None}],
+                'colunas_branco_preenchidas': [str],
+                'colunas_desconhecidas': [str],
+                'violacoes_por_campo': {campo: int},
+                'violacoes': [{'linha': int, 'campo': str, 'tipo': str, 'valor': Any,
+                               'motivo': str | None}],
+                'total_violacoes': int,
+                'violacoes_truncadas': bool,
+                'relatorio_erros': str | None,
+                'valido': bool
+            }
+        
+        Raises:
+            ValidationError: Se rede, formato ou cabeçalho do arquivo forem inválidos
+        """
+        relatorio: Dict[str, Any] = {}
+        for progresso in self.iter_validacao(rede, caminho, relatorio_erros):
+            if progresso.relatorio is not None:
+                relatorio = progresso.relatorio
+        return relatorio
+    
+    def iter_validacao(
+        self,
+        rede: str,
+        caminho: Path,
+        relatorio_erros: Optional[Path] = None,
+        intervalo: Optional[int] = None
+    ) -> Iterator[Progresso]:
+        """
+        Valida o arquivo informando o andamento (para barras de progresso).
+        
+        Args:
+            rede: Nome da rede
+            caminho: Caminho do arquivo enviado
+            relatorio_erros: Arquivo do relatório de erros (opcional)
+            intervalo: Linhas entre atualizações (padrão: Config.ARQUIVO_PROGRESSO_LINHAS)
+        
+        Yields:
+            Progresso a cada ``intervalo`` linhas; o último traz o relatório
+            completo, como retornado por validar_arquivo
+        
+        Raises:
+            ValidationError: Se rede, formato ou cabeçalho do arquivo forem inválidos
+        """
+        intervalo = intervalo or Config.ARQUIVO_PROGRESSO_LINHAS
+        if not rede:
+            raise ValidationError("Rede é obrigatória")
+        if not caminho:
+            raise ValidationError("Nenhum arquivo enviado")
+        
+        caminho = Path(caminho)
+        
+        # Mesma versão dos dados durante todo o arquivo, mesmo com recarga no meio
+        dados = self.validator.data_loader.require_data()
+        canal = self.validator.get_canal(rede, dados)
+        
+        tabela = dados.status_table
+        linha_status = tabela.matrix[tabela.canal_index[canal]]
+        
+        logger.info("Validando arquivo '%s' para rede '%s' (Canal: %s)", caminho.name, rede, canal)
+        
+        linhas, fracao = self._iter_linhas(caminho)
+        erros: Optional[RelatorioErros] = None
+        violacoes: List[Dict[str, Any]] = []
+        violacoes_por_campo: Dict[str, int] = {}
+        total_linhas = 0
+        total_violacoes = 0
+        
+        try:
+            cabecalho = next(linhas, None)
+            if not cabecalho or all(_celula_vazia(c) for c in cabecalho):
+                raise ValidationError("Arquivo sem cabeçalho")
+            
+            colunas, desconhecidas = self._mapear_colunas(cabecalho, tabela)
+            presentes = {campo for _, campo in colunas}
+            regras = regras_por_campo(dados, presentes)
+            
+            # Colunas que serão verificadas em cada linha: (posição, campo, status, regra);
+            # opcionais só entram se tiverem regra de formato
+            verificadas = [
+                (pos, campo, STATUS_NOMES[linha_status[tabela.campo_index[campo]]], regras.get(campo))
+                for pos, campo in colunas
+            ]
+            verificadas = [v for v in verificadas if v[2] != 'opcional' or v[3] is not None]
+            
+            erros = RelatorioErros(relatorio_erros) if relatorio_erros else None
+            
+            for numero, valores in enumerate(linhas, start=2):
+                if all(_celula_vazia(v) for v in valores):
+                    continue
+                total_linhas += 1
+                
+                for pos, campo, status, regra in verificadas:
+                    valor = valores[pos] if pos < len(valores) else None
+                    motivo = None
+                    
+                    if _celula_vazia(valor):
+                        if status != 'obrigatorio':
+                            continue
+                        tipo = VIOLACAO_OBRIGATORIO_VAZIO
+                    elif status == 'branco':
+                        tipo = VIOLACAO_BRANCO_PREENCHIDO
+                    elif regra is not None:
+                        motivo = regra.validar(valor)
+                        if motivo is None:
+                            continue
+                        tipo = VIOLACAO_FORMATO_INVALIDO
+                    else:
+                        continue
+                    
+                    total_violacoes += 1
+                    violacoes_por_campo[campo] = violacoes_por_campo.get(campo, 0) + 1
+                    if len(violacoes) < self.max_violacoes:
+                        violacoes.append({
+                            'linha': numero, 'campo': campo, 'tipo': tipo, 'valor': valor, 'motivo': motivo
+                        })
+                    if erros is not None:
+                        erros.adicionar(numero, campo, DESCRICOES_VIOLACAO[tipo], valor, motivo)
+                
+                if total_linhas % intervalo == 0:
+                    yield Progresso(total_linhas, total_violacoes, fracao(numero))
+        except BaseException:
+            # Inclui GeneratorExit: a interface pode abandonar a validação no meio;
+            # fecha o arquivo também quando o cabeçalho ou a configuração falham
+            linhas.close()
+            if erros is not None:
+                erros.descartar()
+            raise
+        
+        faltando: List[Dict[str, Any]] = [
+            {'campo': campo, 'formato': self.validator._get_formato(campo, dados)}
+            for campo, codigo in zip(tabela.campos, linha_status)
+            if STATUS_NOMES[codigo] == 'obrigatorio' and campo not in presentes
+        ]
+        branco_preenchidas = [
+            campo for _, campo, status, _ in verificadas
+            if status == 'branco' and violacoes_por_campo.get(campo)
+        ]
+        
+        if erros is not None:
+            erros.fechar([c['campo'] for c in faltando])
+        
+        logger.info(
+            "Arquivo validado: %s linhas, %s violações, %s colunas obrigatórias faltando",
+            total_linhas, total_violacoes, len(faltando)
+        )
+        
+        relatorio = {
+            'rede': rede,
+            'canal': canal,
+            'arquivo': caminho.name,
+            'total_linhas': total_linhas,
+            'colunas_obrigatorias_faltando': faltando,
+            'colunas_branco_preenchidas': branco_preenchidas,
+            'colunas_desconhecidas': desconhecidas,
+            'violacoes_por_campo': violacoes_por_campo,
+            'violacoes': violacoes,
+            'total_violacoes': total_violacoes,
+            'violacoes_truncadas': total_violacoes > len(violacoes),
+            'relatorio_erros': str(erros.destino) if erros is not None else None,
+            'valido': not faltando and total_violacoes == 0
+        }
+        yield Progresso(total_linhas, total_violacoes, 1.0, relatorio)
+    
+    def _mapear_colunas(
+        self, cabecalho: Sequence[Any], tabela: StatusTable
+    ) -> Tuple[List[Tuple[int, str]], List[str]]:
+        """
+        Associa as colunas do arquivo aos campos da tabela.
+        
+        Args:
+            cabecalho: Valores da primeira linha do arquivo
+            tabela: Tabela de status em uso
+        
+        Returns:
+            Tupla (lista de (posição, campo normalizado), colunas desconhecidas)
+        """
+        campo_index = tabela.campo_index
+        colunas = []
+        desconhecidas = []
+        
+        for pos, nome in enumerate(cabecalho):
+            if _celula_vazia(nome):
+                continue
+            campo = normalize_campo(str(nome))
+            if campo not in campo_index:
+                campo = self._sinonimos_reversos.get(campo, campo)
+            if campo in campo_index:
+                colunas.append((pos, campo))
+            else:
+                desconhecidas.append(str(nome).strip())
+        
+        return colunas, desconhecidas
+    
+    def _iter_linhas(self, caminho: Path) -> _Leitura:
+        """
+        Abre o arquivo de acordo com a extensão.
+        
+        Returns:
+            Tupla (linhas do arquivo com o cabeçalho, função que recebe o
+            número da linha atual e retorna a fração já lida ou None)
+        """
+        extensao = caminho.suffix.lower()
+        if extensao == '.xlsx':
+            return self._iter_linhas_xlsx(caminho)
+        if extensao == '.csv':
+            return self._iter_linhas_csv(caminho)
+        raise ValidationError(
+            f"Formato de arquivo não suportado: '{extensao}' "
+            f"(use {', '.join(Config.EXTENSOES_ARQUIVO_VENDAS)})"
+        )
+    
+    @staticmethod
+    def _iter_linhas_xlsx(caminho: Path) -> _Leitura:
+        """Lê a primeira aba em modo read-only, sem carregar a planilha inteira"""
+        total: List[int] = []
+        
+        def linhas() -> Generator[Sequence[Any], None, None]:
+            # Aberto só na primeira leitura: um gerador nunca iniciado não segura o arquivo
+            try:
+                from openpyxl import load_workbook
+                wb = load_workbook(caminho, read_only=True, data_only=True)
+            except Exception as e:
+                raise ValidationError(f"Não foi possível ler o arquivo Excel: {e}")
+            
+            try:
+                ws = wb.active
+                # Dimensão declarada no arquivo; ausente em alguns geradores de planilha
+                if isinstance(ws.max_row, int) and ws.max_row > 0:
+                    total.append(ws.max_row)
+                yield from ws.iter_rows(values_only=True)
+            finally:
+                wb.close()
+        
+        return linhas(), lambda numero: min(1.0, numero / total[0]) if total else None
+    
+    @staticmethod
+    def _iter_linhas_csv(caminho: Path) -> _Leitura:
+        """Lê o CSV em streaming, detectando encoding e delimitador pela amostra inicial"""
+        try:
+            tamanho = caminho.stat().st_size or 1
+        except OSError as e:
+            raise ValidationError(f"Não foi possível ler o arquivo CSV: {e}")
+        abertos: List[BinaryIO] = []
+        
+        def linhas() -> Generator[Sequence[Any], None, None]:
+            # Aberto só na primeira leitura: um gerador nunca iniciado não segura o arquivo
+            with open(caminho, 'rb') as bruto:
+                abertos.append(bruto)
+                amostra = bruto.read(Config.CSV_AMOSTRA_BYTES)
+                bruto.seek(0)
+                
+                encoding = _detectar_encoding(amostra)
+                try:
+                    dialeto = csv.Sniffer().sniff(amostra.decode(encoding, errors='ignore'), delimiters=';,\t|')
+                except csv.Error:
+                    dialeto = csv.excel
+                
+                # A amostra decide o encoding, mas o resto do arquivo pode conter bytes
+                # em latin-1: esses são convertidos em vez de abortar a validação
+                texto = io.TextIOWrapper(bruto, encoding=encoding, errors=_ERROS_UTF8, newline='')
+                try:
+                    yield from csv.reader(texto, dialeto)
+                except (csv.Error, UnicodeError) as e:
+                    raise ValidationError(f"Não foi possível ler o arquivo CSV: {e}")
+        
+        # Posição no arquivo binário (o texto não informa posição durante a iteração)
+        return linhas(), lambda numero: min(1.0, abertos[0].tell() / tamanho) if abertos else None
+
+
+def _detectar_encoding(amostra: bytes) -> str:
+    """Retorna 'utf-8-sig' se a amostra for UTF-8 válido, senão 'latin-1'"""
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(amostra, final=False)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'latin-1'
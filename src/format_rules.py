@@ -0,0 +1,158 @@
+"""
+Regras de formato dos campos, extraídas dos comentários do modelo.
+
+Os comentários das colunas da planilha modelo (DataLoader.comentarios)
+seguem o padrão "CAMPO: <N> dígitos|caracteres (<tipo>)", por exemplo::
+    
+    CPF_VENDEDOR: 11 dígitos (Somente números).
+    NOME_VENDEDOR: 60 caracteres (Somente letras).
+    VALOR_UNITARIO: 8 dígitos (Formato decimal).
+    DATA_VENDA: 8 dígitos (DDMMAAAA).
+
+Cada comentário vira uma RegraFormato usada na validação célula a célula
+dos arquivos de vendas. Comentários fora do padrão não geram regra (a
+coluna é verificada apenas quanto à obrigatoriedade). O tamanho é tratado
+como máximo: zeros à esquerda se perdem em células numéricas do Excel.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional
+
+from .data_loader import LoadedData
+
+# Tipos de regra
+TIPO_NUMEROS = 'numeros'
+TIPO_LETRAS = 'letras'
+TIPO_ALFANUMERICO = 'alfanumerico'
+TIPO_DECIMAL = 'decimal'
+TIPO_DATA = 'data'
+
+_PADRAO_REGRA = re.compile(r'(\d+)\s*(d[ií]gitos?|caracteres?)\s*\(([^)]*)\)', re.IGNORECASE)
+
+_NUMEROS = re.compile(r'\d+', re.ASCII)
+_DIGITO = re.compile(r'\d')
+_DECIMAL = re.compile(r'-?(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d+)?|-?\d+(?:\.\d+)?', re.ASCII)
+
+
+def _tipo(unidade: str, descricao: str) -> str:
+    """Tipo da regra a partir do texto entre parênteses"""
+    descricao = descricao.lower()
+    if 'ddmmaaaa' in descricao.replace('/', ''):
+        return TIPO_DATA
+    if 'decimal' in descricao:
+        return TIPO_DECIMAL
+    if 'letra' in descricao and 'número' not in descricao and 'numero' not in descricao:
+        return TIPO_LETRAS
+    if 'somente números' in descricao or 'somente numeros' in descricao:
+        return TIPO_NUMEROS
+    return TIPO_NUMEROS if unidade.lower().startswith('d') else TIPO_ALFANUMERICO
+
+
+def _texto(valor: Any) -> str:
+    """Valor da célula como texto (números inteiros do Excel sem '.0')"""
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor).strip()
+
+
+@dataclass(frozen=True)
+class RegraFormato:
+    """Formato esperado para os valores de um campo"""
+    tipo: str
+    tamanho: int
+    descricao: str
+    
+    def validar(self, valor: Any) -> Optional[str]:
+        """
+        Verifica um valor preenchido.
+        
+        Args:
+            valor: Valor da célula (texto do CSV ou valor tipado do Excel)
+        
+        Returns:
+            Motivo da falha, ou None se o valor está no formato
+        """
+        if self.tipo == TIPO_DATA:
+            return self._validar_data(valor)
+        
+        texto = _texto(valor)
+        
+        if self.tipo == TIPO_NUMEROS:
+            if isinstance(valor, float) and not valor.is_integer():
+                return "deve conter somente números"
+            if not _NUMEROS.fullmatch(texto):
+                return "deve conter somente números"
+            if len(texto) > self.tamanho:
+                return f"máximo de {self.tamanho} dígitos"
+            return None
+        
+        if self.tipo == TIPO_DECIMAL:
+            if not isinstance(valor, (int, float)) and not _DECIMAL.fullmatch(texto):
+                return "valor decimal inválido (ex.: 1.000,00)"
+            if sum(c.isdigit() for c in texto) > self.tamanho:
+                return f"máximo de {self.tamanho} dígitos"
+            return None
+        
+        if self.tipo == TIPO_LETRAS and _DIGITO.search(texto):
+            return "deve conter somente letras"
+        if len(texto) > self.tamanho:
+            return f"máximo de {self.tamanho} caracteres"
+        return None
+    
+    def _validar_data(self, valor: Any) -> Optional[str]:
+        if isinstance(valor, (datetime, date)):
+            return None
+        texto = _texto(valor)
+        # Datas digitadas como número perdem o zero à esquerda (01022025 -> 1022025)
+        if isinstance(valor, (int, float)):
+            texto = texto.zfill(self.tamanho)
+        try:
+            if len(texto) == 8 and _NUMEROS.fullmatch(texto):
+                datetime.strptime(texto, '%d%m%Y')
+                return None
+        except ValueError:
+            pass
+        return "data inválida (use DDMMAAAA)"
+
+
+def parse_regra(comentario: Optional[str]) -> Optional[RegraFormato]:
+    """
+    Extrai a regra de formato de um comentário do modelo.
+    
+    Args:
+        comentario: Texto do comentário da coluna
+    
+    Returns:
+        RegraFormato, ou None se o comentário não seguir o padrão
+    """
+    if not comentario:
+        return None
+    encontrado = _PADRAO_REGRA.search(comentario)
+    if not encontrado:
+        return None
+    tamanho, unidade, descricao = encontrado.groups()
+    return RegraFormato(
+        tipo=_tipo(unidade, descricao),
+        tamanho=int(tamanho),
+        descricao=comentario.split('\n', 1)[0].strip()
+    )
+
+
+def regras_por_campo(dados: LoadedData, campos: Iterable[str]) -> Dict[str, RegraFormato]:
+    """
+    Regras de formato dos campos informados.
+    
+    Args:
+        dados: Versão dos dados (comentários já associados aos campos)
+        campos: Campos normalizados
+    
+    Returns:
+        Dicionário campo -> regra, só com os campos que têm regra
+    """
+    regras = {}
+    for campo in campos:
+        regra = parse_regra(dados.get_formato(campo))
+        if regra is not None:
+            regras[campo] = regra
+    return regras
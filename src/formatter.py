@@ -1,12 +1,82 @@
-from typing import Dict
+import html
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
 from config import Config
+from .error_report import DESCRICOES_VIOLACAO
+from .metrics import FORMATACAO, RESPOSTAS_CACHE
+from .tracing import span
 
 
 class ResponseFormatter:
     """Formata respostas para exibição na interface"""
     
+    def __init__(self, cache_size: Optional[int] = None):
+        """
+        Args:
+            cache_size: Máximo de respostas renderizadas mantidas em cache
+                (padrão: Config.RESPONSE_CACHE_SIZE; 0 desativa o cache)
+        """
+        self.cache_size = Config.RESPONSE_CACHE_SIZE if cache_size is None else cache_size
+        self._cache: "OrderedDict[Hashable, Tuple[Dict[str, Any], str]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    def render_cached(
+        self,
+        chave: Hashable,
+        validar: Callable[[], Dict[str, Any]],
+        formatar: Optional[Callable[[Dict[str, Any]], str]] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Obtém resultado e HTML de uma consulta, reaproveitando respostas já renderizadas.
+        
+        O espaço de respostas é finito (redes × campos), então após a primeira
+        consulta de cada par o caminho quente é uma única busca no dicionário.
+        Erros de validação não são armazenados.
+        
+        Args:
+            chave: Identifica a consulta, ex.: (versão dos dados, rede, campo)
+            validar: Função que produz o resultado da validação em caso de falta
+            formatar: Função que renderiza o resultado (padrão: format_response)
+        
+        Returns:
+            Tupla (resultado da validação, HTML formatado). O resultado é
+            compartilhado entre chamadas e não deve ser modificado.
+        
+        Raises:
+            ValidationError: Propagado de validar()
+        """
+        with self._cache_lock:
+            item = self._cache.get(chave)
+            if item is not None:
+                self._cache.move_to_end(chave)
+                RESPOSTAS_CACHE.inc('acerto')
+                return item
+        
+        RESPOSTAS_CACHE.inc('falta')
+        with span("validator"):
+            resultado = validar()
+        inicio = time.perf_counter()
+        with span("formatter.render"):
+            item = (resultado, (formatar or self.format_response)(resultado))
+        FORMATACAO.observe(time.perf_counter() - inicio)
+        
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._cache[chave] = item
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        
+        return item
+    
+    def clear_cache(self, *_) -> None:
+        """Descarta as respostas em cache (usado como listener de recarga dos dados)"""
+        with self._cache_lock:
+            self._cache.clear()
+    
     @staticmethod
-    def format_response(resultado: Dict[str, any]) -> str:
+    def format_response(resultado: Dict[str, Any]) -> str:
         """
         Formata resultado da validação em HTML.
         
@@ -53,6 +123,141 @@ class ResponseFormatter:
         </div>
         """
     
+    @staticmethod
+    def format_relatorio_arquivo(relatorio: Dict[str, Any], max_linhas: int = 50) -> str:
+        """
+        Formata relatório de validação de arquivo em HTML.
+        
+        Args:
+            relatorio: Dicionário retornado por FileValidator.validar_arquivo
+            max_linhas: Quantidade máxima de violações listadas
+        
+        Returns:
+            HTML formatado
+        """
+        if relatorio['valido']:
+            status_html = "<span style='color:#00cc66'><b>Arquivo válido 🟢</b></span>"
+        else:
+            status_html = "<span style='color:#ff4d4d'><b>Arquivo com problemas 🔴</b></span>"
+        
+        blocos = []
+        
+        faltando = relatorio['colunas_obrigatorias_faltando']
+        if faltando:
+            itens = "".join(
+                f"<li>{c['campo'].upper()}" + (f" — <i>{html.escape(c['formato'])}</i>" if c['formato'] else "") + "</li>"
+                for c in faltando
+            )
+            blocos.append(f"<b>❗ Colunas obrigatórias faltando:</b><ul>{itens}</ul>")
+        
+        preenchidas = relatorio['colunas_branco_preenchidas']
+        if preenchidas:
+            itens = "".join(f"<li>{c.upper()}</li>" for c in preenchidas)
+            blocos.append(f"<b>⚪ Colunas que devem ficar em branco, mas possuem valores:</b><ul>{itens}</ul>")
+        
+        desconhecidas = relatorio['colunas_desconhecidas']
+        if desconhecidas:
+            itens = ", ".join(html.escape(c) for c in desconhecidas)
+            blocos.append(f"<b>❔ Colunas não reconhecidas (ignoradas):</b> {itens}")
+        
+        if relatorio['violacoes_por_campo']:
+            itens = "".join(
+                f"<li>{campo.upper()}: {total} linha(s)</li>"
+                for campo, total in sorted(relatorio['violacoes_por_campo'].items(), key=lambda x: -x[1])
+            )
+            blocos.append(f"<b>📋 Violações por campo:</b><ul>{itens}</ul>")
+        
+        violacoes = relatorio['violacoes'][:max_linhas]
+        if violacoes:
+            itens = "".join(
+                f"<li>Linha {v['linha']} — {v['campo'].upper()}: {DESCRICOES_VIOLACAO.get(v['tipo'], v['tipo'])}"
+                + (f", {html.escape(v['motivo'])}" if v.get('motivo') else "")
+                + (f" (valor: {html.escape(str(v['valor']))})" if v['valor'] is not None else "")
+                + "</li>"
+                for v in violacoes
+            )
+            restante = relatorio['total_violacoes'] - len(violacoes)
+            if restante > 0:
+                complemento = " (lista completa no relatório de erros)" if relatorio.get('relatorio_erros') else ""
+                itens += f"<li><i>... e mais {restante} violação(ões){complemento}</i></li>"
+            blocos.append(f"<b>🔎 Violações por linha:</b><ul>{itens}</ul>")
+        
+        detalhes = "".join(
+            f"<div class='resposta-bloco' style='margin-top:15px'>{bloco}</div>" for bloco in blocos
+        )
+        
+        return f"""
+        <div class='resposta-ia'>
+            <b>📊 Resultado da validação do arquivo:</b><br>
+            <b>📄 Arquivo:</b> {html.escape(relatorio['arquivo'])}<br>
+            <b>🏢 Rede:</b> {relatorio['rede']}<br>
+            <b>🧭 Canal:</b> {relatorio['canal']}<br>
+            <b>🧾 Linhas analisadas:</b> {relatorio['total_linhas']}<br>
+            <b>🔒 Status:</b> {status_html}<br>
+            {detalhes}
+        </div>
+        """
+    
+    @staticmethod
+    def format_progresso_arquivo(linhas: int, violacoes: int, fracao: Optional[float] = None) -> str:
+        """
+        Formata o andamento da validação de um arquivo em HTML.
+        
+        Args:
+            linhas: Linhas já analisadas
+            violacoes: Violações encontradas até agora
+            fracao: Fração do arquivo já lida (None se desconhecida)
+        
+        Returns:
+            HTML formatado
+        """
+        percentual = f" ({fracao:.0%})" if fracao is not None else ""
+        return f"""
+        <div class='resposta-ia'>
+            <b>⏳ Validando arquivo{percentual}...</b><br>
+            <b>🧾 Linhas analisadas:</b> {linhas}<br>
+            <b>🔎 Violações encontradas:</b> {violacoes}
+        </div>
+        """
+    
+    @staticmethod
+    def format_relatorio_rede(relatorio: Dict[str, Any]) -> str:
+        """
+        Formata o relatório de todos os campos de uma rede em HTML.
+        
+        Args:
+            relatorio: Dicionário retornado por Validator.relatorio_rede
+        
+        Returns:
+            HTML formatado, com os campos agrupados por status
+        """
+        grupos = (
+            ('obrigatorio', "<span style='color:#ff4d4d'><b>Obrigatórios 🔴</b></span>"),
+            ('opcional', "<span style='color:#00cc66'><b>Opcionais 🟢</b></span>"),
+            ('branco', "<span style='color:#aaa'><b>Devem ficar em branco ⚪</b></span>"),
+        )
+        
+        blocos = []
+        for status, titulo in grupos:
+            itens = "".join(
+                f"<li>{c['campo']}" + (f" — <i>{html.escape(c['formato'])}</i>" if c['formato'] else "") + "</li>"
+                for c in relatorio['campos'] if c['status'] == status
+            )
+            if itens:
+                blocos.append(
+                    f"<div class='resposta-bloco' style='margin-top:15px'>"
+                    f"{titulo} ({relatorio['totais'][status]})<ul>{itens}</ul></div>"
+                )
+        
+        return f"""
+        <div class='resposta-ia'>
+            <b>📋 Campos da rede:</b><br>
+            <b>🏢 Rede:</b> {relatorio['rede']}<br>
+            <b>🧭 Canal:</b> {relatorio['canal']}<br>
+            {"".join(blocos)}
+        </div>
+        """
+    
     @staticmethod
     def format_error(error_message: str) -> str:
         """
@@ -1,22 +1,173 @@
+"""
+Configuração de logging da aplicação.
+
+Os handlers (console e arquivos) são criados uma única vez e compartilhados
+por todos os loggers configurados com setup_logger. No modo assíncrono
+(Config.LOG_ASYNC) os loggers recebem apenas um QueueHandler: a requisição
+só enfileira o registro e uma única thread (QueueListener) formata e grava
+as mensagens. Use formatação preguiçosa (``logger.info("... %s", valor)``):
+a mensagem só é montada na thread de gravação e apenas se o registro passar
+pelo nível e pela amostragem.
+"""
+import atexit
+import copy
+import itertools
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
 from config import Config
 
+_lock = threading.Lock()
+_formatter: Optional[logging.Formatter] = None
+_console: Optional[logging.Handler] = None
+_arquivos: Dict[Path, logging.Handler] = {}
+
+# Modo assíncrono: fila, thread de gravação e um QueueHandler por destino
+_fila: queue.SimpleQueue = queue.SimpleQueue()
+_listener: Optional[logging.handlers.QueueListener] = None
+_atexit_registrado = False
+_queue_handlers: Dict[Tuple[logging.Handler, ...], "_QueueHandler"] = {}
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Mantém apenas uma fração das mensagens abaixo de WARNING.
+    
+    A amostragem é determinística (uma a cada N mensagens), então a proporção
+    é exata mesmo com pouco volume. WARNING e acima passam sempre.
+    """
+    
+    def __init__(self, taxa: float):
+        super().__init__()
+        self.taxa = taxa
+        self._intervalo = max(1, round(1 / taxa)) if taxa > 0 else 0
+        self._contador = itertools.count()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        if not self._intervalo:
+            return False
+        return next(self._contador) % self._intervalo == 0
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Enfileira o registro sem formatá-lo.
+    
+    O QueueHandler padrão monta a mensagem na thread que chamou o logger;
+    aqui só a exceção (que referencia frames da pilha) é convertida em texto
+    antes de enfileirar. Os destinos seguem junto com o registro.
+    """
+    
+    def __init__(self, fila: queue.SimpleQueue, destinos: Tuple[logging.Handler, ...]):
+        super().__init__(fila)
+        self.destinos = destinos
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = _get_formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.lg_destinos = self.destinos
+        return record
+
+
+class _Roteador(logging.Handler):
+    """Entrega cada registro da fila aos handlers do logger de origem"""
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        for handler in record.__dict__.pop('lg_destinos', ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+    
+    def emit(self, record: logging.LogRecord) -> None:  # pragma: no cover
+        self.handle(record)
+
+
+def _get_formatter() -> logging.Formatter:
+    global _formatter
+    if _formatter is None:
+        _formatter = logging.Formatter(Config.LOG_FORMAT, datefmt='%Y-%m-%d %H:%M:%S')
+    return _formatter
+
+
+def _get_console() -> logging.Handler:
+    global _console
+    if _console is None:
+        _console = logging.StreamHandler(sys.stdout)
+        _console.setFormatter(_get_formatter())
+    return _console
+
+
+def _get_arquivo(log_file: Path) -> logging.Handler:
+    caminho = Path(log_file).resolve()
+    if caminho not in _arquivos:
+        handler = logging.FileHandler(caminho, encoding='utf-8')
+        handler.setFormatter(_get_formatter())
+        _arquivos[caminho] = handler
+    return _arquivos[caminho]
+
+
+def _get_queue_handler(destinos: Tuple[logging.Handler, ...]) -> "_QueueHandler":
+    """QueueHandler dos destinos, iniciando a thread de gravação se necessário"""
+    global _listener, _atexit_registrado
+    if _listener is None:
+        _listener = logging.handlers.QueueListener(_fila, _Roteador())
+        _listener.start()
+        if not _atexit_registrado:
+            atexit.register(stop_logging)
+            _atexit_registrado = True
+    if destinos not in _queue_handlers:
+        _queue_handlers[destinos] = _QueueHandler(_fila, destinos)
+    return _queue_handlers[destinos]
+
+
+def _eh_nosso(handler: logging.Handler) -> bool:
+    return (
+        handler is _console
+        or handler in _arquivos.values()
+        or handler in _queue_handlers.values()
+    )
+
+
+def stop_logging() -> None:
+    """
+    Grava as mensagens pendentes e encerra a thread de gravação.
+    
+    Registrado em atexit; a thread é reiniciada pelo próximo setup_logger.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
 
 def setup_logger(
     name: str = "lg_ai",
     level: Optional[str] = None,
-    log_file: Optional[Path] = None
+    log_file: Optional[Path] = None,
+    amostragem: Optional[float] = None
 ) -> logging.Logger:
     """
     Configura logger estruturado para a aplicação.
     
+    Pode ser chamado mais de uma vez para o mesmo nome: os handlers são
+    compartilhados e nunca duplicados.
+    
     Args:
         name: Nome do logger
         level: Nível de log (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Caminho opcional para arquivo de log
+        amostragem: Fração (0 a 1) das mensagens abaixo de WARNING mantidas;
+            padrão: Config.LOG_SAMPLING[name] ou todas
     
     Returns:
         Logger configurado
@@ -24,29 +175,25 @@ def setup_logger(
     logger = logging.getLogger(name)
     
     # Define nível
-    log_level = level or Config.LOG_LEVEL
-    logger.setLevel(getattr(logging, log_level))
-    
-    # Remove handlers existentes
-    logger.handlers.clear()
-    
-    # Formatter
-    formatter = logging.Formatter(
-        Config.LOG_FORMAT,
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    log_level = getattr(logging, level or Config.LOG_LEVEL)
+    logger.setLevel(log_level)
     
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, log_level))
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler (opcional)
-    if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(getattr(logging, log_level))
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+    with _lock:
+        # Handlers compartilhados não têm nível próprio: o filtro é o nível
+        # de cada logger
+        destinos = (_get_console(),) + ((_get_arquivo(log_file),) if log_file else ())
+        handlers = [_get_queue_handler(destinos)] if Config.LOG_ASYNC else list(destinos)
+        
+        # Substitui apenas os handlers configurados aqui antes
+        for handler in [h for h in logger.handlers if _eh_nosso(h)]:
+            logger.removeHandler(handler)
+        for handler in handlers:
+            logger.addHandler(handler)
+        
+        for filtro in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+            logger.removeFilter(filtro)
+        taxa = Config.LOG_SAMPLING.get(name) if amostragem is None else amostragem
+        if taxa is not None and taxa < 1:
+            logger.addFilter(SamplingFilter(taxa))
     
     return logger
@@ -0,0 +1,259 @@
+"""
+Métricas de latência e volume no formato de texto do Prometheus.
+
+Contadores e histogramas usados nos caminhos quentes (validação,
+formatação, carga dos dados e gravação do analytics). Cada thread acumula
+os valores em um dicionário próprio, então registrar uma observação não
+usa lock: custa uma busca no dicionário da thread, um bisect nos limites
+dos buckets e duas somas. Os dicionários de todas as threads só são
+somados quando /metrics é lido.
+
+Uso nos caminhos quentes::
+    
+    inicio = time.perf_counter()
+    ...
+    VALIDACAO.observe(time.perf_counter() - inicio, status, canal)
+"""
+import contextlib
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from config import Config
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_metricas: List["_Metrica"] = []
+_metricas_lock = threading.Lock()
+
+
+class _Metrica:
+    """Base das métricas: nome, rótulos e valores separados por thread"""
+    
+    tipo = ""
+    
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()
+        with _metricas_lock:
+            _metricas.append(self)
+    
+    def _novo_shard(self) -> dict:
+        """Cria o dicionário de valores da thread atual (no primeiro uso)"""
+        valores: dict = {}
+        self._local.valores = valores
+        # Mantido após o fim da thread: os valores acumulados continuam valendo
+        with self._lock:
+            self._shards.append(valores)
+        return valores
+    
+    def _series(self) -> Iterable[Tuple[Tuple[str, ...], Any]]:
+        """Pares (rótulos, valores) de todas as threads, sem somar"""
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # Cópias atômicas no CPython: a thread dona pode continuar gravando
+            for rotulos, valores in list(shard.items()):
+                yield rotulos, valores if isinstance(valores, float) else list(valores)
+    
+    def _rotulos_texto(self, valores: Tuple[str, ...], extra: str = "") -> str:
+        pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(self.rotulos, valores)]
+        if extra:
+            pares.append(extra)
+        return "{" + ",".join(pares) + "}" if pares else ""
+    
+    def reset(self) -> None:
+        """Zera os valores de todas as threads"""
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+    
+    def render(self) -> List[str]:  # pragma: no cover - implementado nas subclasses
+        raise NotImplementedError
+
+
+class Counter(_Metrica):
+    """Contador crescente, opcionalmente separado por rótulos"""
+    
+    tipo = "counter"
+    
+    def inc(self, *rotulos: str, valor: float = 1.0) -> None:
+        """
+        Soma ao contador.
+        
+        Args:
+            *rotulos: Valores dos rótulos, na ordem declarada
+            valor: Quantidade a somar
+        """
+        try:
+            shard = self._local.valores
+        except AttributeError:
+            shard = self._novo_shard()
+        shard[rotulos] = shard.get(rotulos, 0.0) + valor
+    
+    def valor(self, *rotulos: str) -> float:
+        """Total atual da série (soma de todas as threads)"""
+        return float(sum(v for r, v in self._series() if r == rotulos))
+    
+    def render(self) -> List[str]:
+        totais: Dict[Tuple[str, ...], float] = {}
+        for rotulos, valor in self._series():
+            totais[rotulos] = totais.get(rotulos, 0.0) + valor
+        return [
+            f"{self.nome}{self._rotulos_texto(rotulos)} {_numero(valor)}"
+            for rotulos, valor in sorted(totais.items())
+        ]
+
+
+class Histogram(_Metrica):
+    """
+    Histograma de latência (ou tamanho) com buckets fixos.
+    
+    Cada série guarda a contagem por bucket (não acumulada) e a soma dos
+    valores; os buckets acumulados do Prometheus são montados na leitura.
+    """
+    
+    tipo = "histogram"
+    
+    def __init__(
+        self,
+        nome: str,
+        ajuda: str,
+        rotulos: Sequence[str] = (),
+        buckets: Sequence[float] = ()
+    ):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(sorted(buckets or Config.METRICS_BUCKETS_S))
+        # Posições: um contador por bucket, o bucket +Inf e a soma
+        self._tamanho = len(self.buckets) + 2
+    
+    def observe(self, valor: float, *rotulos: str) -> None:
+        """
+        Registra uma observação.
+        
+        Args:
+            valor: Valor observado (segundos, para latências)
+            *rotulos: Valores dos rótulos, na ordem declarada
+        """
+        # Caminho quente: sem lock e sem chamadas além do bisect
+        try:
+            serie = self._local.valores[rotulos]
+        except (AttributeError, KeyError):
+            serie = self._nova_serie(rotulos)
+        serie[bisect_left(self.buckets, valor)] += 1
+        serie[-1] += valor
+    
+    def _nova_serie(self, rotulos: Tuple[str, ...]) -> list:
+        try:
+            shard = self._local.valores
+        except AttributeError:
+            shard = self._novo_shard()
+        serie = shard[rotulos] = [0] * (self._tamanho - 1) + [0.0]
+        return serie
+    
+    @contextlib.contextmanager
+    def time(self, *rotulos: str) -> Iterator[None]:
+        """
+        Mede a duração do bloco (inclusive quando ele levanta exceção).
+        
+        Para etapas longas; nos caminhos quentes prefira observe() com
+        time.perf_counter(), que evita o custo do gerenciador de contexto.
+        
+        Args:
+            *rotulos: Valores dos rótulos, na ordem declarada
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - inicio, *rotulos)
+    
+    def contagem(self, *rotulos: str) -> int:
+        """Número de observações da série (soma de todas as threads)"""
+        return sum(sum(v[:-1]) for r, v in self._series() if r == rotulos)
+    
+    def render(self) -> List[str]:
+        totais: Dict[Tuple[str, ...], list] = {}
+        for rotulos, valores in self._series():
+            atual = totais.setdefault(rotulos, [0] * (self._tamanho - 1) + [0.0])
+            for i, v in enumerate(valores):
+                atual[i] += v
+        
+        linhas = []
+        for rotulos, valores in sorted(totais.items()):
+            acumulado = 0
+            for limite, quantidade in zip(self.buckets + (float("inf"),), valores):
+                acumulado += quantidade
+                le = 'le="%s"' % ("+Inf" if limite == float("inf") else _numero(limite))
+                linhas.append(f"{self.nome}_bucket{self._rotulos_texto(rotulos, le)} {acumulado}")
+            linhas.append(f"{self.nome}_sum{self._rotulos_texto(rotulos)} {_numero(valores[-1])}")
+            linhas.append(f"{self.nome}_count{self._rotulos_texto(rotulos)} {acumulado}")
+        return linhas
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if valor != int(valor) else str(int(valor))
+
+
+def render() -> str:
+    """
+    Todas as métricas registradas no formato de texto do Prometheus (0.0.4).
+    
+    Returns:
+        Texto pronto para a resposta de /metrics
+    """
+    with _metricas_lock:
+        metricas = list(_metricas)
+    
+    linhas = []
+    for metrica in metricas:
+        linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+        linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+        linhas.extend(metrica.render())
+    return "\n".join(linhas) + "\n"
+
+
+# Métricas da aplicação
+VALIDACAO = Histogram(
+    "lg_ai_validacao_segundos",
+    "Tempo de Validator.validar_campo por status (obrigatorio/opcional/branco/error) e canal",
+    ("status", "canal")
+)
+CONSULTAS = Histogram(
+    "lg_ai_consultas_segundos",
+    "Tempo total de uma consulta (interface e /v1/validacao), inclusive acertos do cache "
+    "de respostas, por status (obrigatorio/opcional/branco/error) e canal",
+    ("status", "canal")
+)
+FORMATACAO = Histogram(
+    "lg_ai_formatacao_segundos",
+    "Tempo de renderização do HTML de uma resposta (faltas no cache de respostas)"
+)
+RESPOSTAS_CACHE = Counter(
+    "lg_ai_respostas_cache_total",
+    "Consultas ao cache de respostas renderizadas por resultado (acerto/falta)",
+    ("resultado",)
+)
+CARGA = Histogram(
+    "lg_ai_carga_segundos",
+    "Tempo das etapas de carga dos dados (DataLoader.load_all e recargas)",
+    ("etapa",)
+)
+ANALYTICS_GRAVACAO = Histogram(
+    "lg_ai_analytics_gravacao_segundos",
+    "Tempo de gravação de um lote de eventos do analytics"
+)
+ANALYTICS_EVENTOS = Counter(
+    "lg_ai_analytics_eventos_total",
+    "Eventos do analytics por destino (gravado/descartado/erro)",
+    ("destino",)
+)
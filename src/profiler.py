@@ -0,0 +1,161 @@
+"""
+Profiler por amostragem com saída em pilhas "collapsed".
+
+Uma thread lê as pilhas de todas as outras threads (sys._current_frames) a
+cada Config.PROFILE_INTERVAL_MS e conta quantas vezes cada pilha apareceu.
+O arquivo gerado tem uma linha por pilha, do frame mais externo ao mais
+interno separados por ";", seguida da contagem::
+    
+    MainThread;run (app.py:10);validar_campo (validator.py:24) 42
+
+É o formato lido por flamegraph.pl, speedscope e inferno, todos usáveis
+offline. Ligado por Config.PROFILE_ENABLED; o custo fica na thread do
+profiler (o código amostrado não é instrumentado).
+"""
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Dict, List, Optional
+
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_profiler: Optional["SamplingProfiler"] = None
+_profiler_lock = threading.Lock()
+
+
+class SamplingProfiler:
+    """Amostra periodicamente as pilhas das threads e grava em formato collapsed"""
+    
+    def __init__(
+        self,
+        arquivo: Optional[Path] = None,
+        intervalo_ms: Optional[float] = None,
+        flush_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            arquivo: Arquivo de saída (padrão: Config.PROFILE_DIR/profile-<pid>.collapsed)
+            intervalo_ms: Intervalo entre amostras (padrão: Config.PROFILE_INTERVAL_MS)
+            flush_interval: Intervalo entre gravações do arquivo, em segundos
+                (padrão: Config.PROFILE_FLUSH_INTERVAL_S)
+        """
+        self.arquivo = arquivo or Config.PROFILE_DIR / f"profile-{os.getpid()}.collapsed"
+        self.intervalo = (intervalo_ms or Config.PROFILE_INTERVAL_MS) / 1000
+        self.flush_interval = flush_interval or Config.PROFILE_FLUSH_INTERVAL_S
+        self.amostras = 0
+        self._pilhas: Counter = Counter()
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Nomes de frame por código: evita formatar o mesmo texto a cada amostra
+        self._nomes: Dict[object, str] = {}
+    
+    def start(self) -> None:
+        """Inicia a thread de amostragem"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._run, name="lg-ai-profiler", daemon=True)
+        self._thread.start()
+        logger.info("Profiler ativado (a cada %sms, arquivo %s)", self.intervalo * 1000, self.arquivo)
+    
+    def stop(self) -> None:
+        """Para a amostragem e grava o arquivo"""
+        self._parar.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.salvar()
+    
+    def amostrar(self) -> None:
+        """Registra uma amostra das pilhas de todas as threads (exceto a atual)"""
+        proprio = threading.get_ident()
+        nomes_threads = {t.ident: t.name for t in threading.enumerate()}
+        pilhas: List[str] = []
+        
+        for ident, topo in sys._current_frames().items():
+            if ident == proprio:
+                continue
+            frames = []
+            frame: Optional[FrameType] = topo
+            while frame is not None:
+                frames.append(self._nome_frame(frame.f_code))
+                frame = frame.f_back
+            frames.append(nomes_threads.get(ident, f"thread-{ident}"))
+            pilhas.append(";".join(reversed(frames)))
+        
+        with self._lock:
+            self._pilhas.update(pilhas)
+            self.amostras += 1
+    
+    def collapsed(self) -> str:
+        """Contagens acumuladas no formato collapsed (uma pilha por linha)"""
+        with self._lock:
+            itens = sorted(self._pilhas.items())
+        return "".join(f"{pilha} {contagem}\n" for pilha, contagem in itens)
+    
+    def salvar(self) -> Path:
+        """
+        Grava as contagens acumuladas até agora.
+        
+        O arquivo é substituído de uma só vez, então pode ser lido a qualquer
+        momento com o profiler rodando.
+        
+        Returns:
+            Caminho do arquivo gravado
+        """
+        self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+        temporario = self.arquivo.with_name(f"{self.arquivo.name}.tmp")
+        temporario.write_text(self.collapsed(), encoding="utf-8")
+        os.replace(temporario, self.arquivo)
+        return self.arquivo
+    
+    def _nome_frame(self, codigo) -> str:
+        nome = self._nomes.get(codigo)
+        if nome is None:
+            nome = f"{codigo.co_name} ({Path(codigo.co_filename).name}:{codigo.co_firstlineno})"
+            # ";" separa frames e " " separa a contagem no formato collapsed
+            nome = self._nomes[codigo] = nome.replace(";", ":")
+        return nome
+    
+    def _run(self) -> None:
+        """Loop da thread: amostra a cada intervalo e grava periodicamente"""
+        proximo_flush = time.monotonic() + self.flush_interval
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.amostrar()
+                if time.monotonic() >= proximo_flush:
+                    self.salvar()
+                    proximo_flush = time.monotonic() + self.flush_interval
+            except Exception as e:
+                logger.error("Erro no profiler: %s", e)
+
+
+def iniciar_profiler() -> Optional[SamplingProfiler]:
+    """
+    Inicia o profiler do processo se Config.PROFILE_ENABLED estiver ligado.
+    
+    Chamadas seguintes reaproveitam o mesmo profiler. O arquivo é gravado
+    periodicamente e na saída do processo.
+    
+    Returns:
+        Profiler em execução, ou None se desativado
+    """
+    global _profiler
+    if not Config.PROFILE_ENABLED:
+        return None
+    
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = SamplingProfiler()
+            _profiler.start()
+            atexit.register(_profiler.stop)
+        return _profiler
@@ -1,13 +1,259 @@
+// Service worker do LG-AI: funciona offline e responde consultas de validação
+// a partir de uma cópia local da tabela de status (/v1/dados).
+//
+// Estratégias:
+// - navegação: rede primeiro, página em cache quando offline;
+// - arquivos estáticos: URLs versionadas (?v=, /assets/ do Gradio) são
+//   imutáveis (cache primeiro); as demais são servidas do cache e
+//   revalidadas em segundo plano;
+// - /v1/validacao: respondida localmente com os dados em cache; a cópia é
+//   revalidada pelo ETag em segundo plano e substituída quando a versão muda;
+// - demais requisições (fila do Gradio, API): sempre na rede.
+
+// Incrementar ao mudar este arquivo ou o formato dos dados: caches de
+// versões anteriores são apagados na ativação
+const VERSAO_SW = 'lg-ai-v2';
+const CACHE_SHELL = `${VERSAO_SW}-shell`;
+const CACHE_ESTATICOS = `${VERSAO_SW}-estaticos`;
+const CACHE_DADOS = `${VERSAO_SW}-dados`;
+
+const URL_DADOS = '/v1/dados';
+const FORMATO_DADOS = 1;  // src/client_data.py: CLIENT_DATA_FORMAT
+const SHELL = ['/', '/app-manifest.json', '/favicon.ico'];
+
+// Intervalo mínimo entre revalidações dos dados (ms)
+const INTERVALO_REVALIDACAO = 60 * 1000;
+
+const STATUS_TEXTO = {
+    obrigatorio: (campo, rede, canal) => `O campo ${campo} é OBRIGATÓRIO para a rede ${rede} (Canal: ${canal}).`,
+    branco: (campo, rede, canal) => `O campo ${campo} deve ficar em branco para a rede ${rede} (Canal: ${canal}).`,
+    opcional: (campo, rede, canal) => `O campo ${campo} é opcional para a rede ${rede} (Canal: ${canal}).`,
+};
+const STATUS_NOMES = ['obrigatorio', 'opcional', 'branco'];
+
+let dados = null;          // dados já preparados para consulta
+let ultimaRevalidacao = 0;
+
+
 self.addEventListener('install', (event) => {
-    self.skipWaiting();
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE_SHELL);
+        // Falha em um item não impede a instalação
+        await Promise.allSettled(SHELL.map((url) => cache.add(url)));
+        await atualizarDados();
+        await self.skipWaiting();
+    })());
 });
 
 self.addEventListener('activate', (event) => {
-    event.waitUntil(clients.claim());
+    event.waitUntil((async () => {
+        const nomes = await caches.keys();
+        await Promise.all(
+            nomes.filter((nome) => !nome.startsWith(`${VERSAO_SW}-`)).map((nome) => caches.delete(nome))
+        );
+        await self.clients.claim();
+    })());
 });
 
 self.addEventListener('fetch', (event) => {
-    // Estratégia simples: Apenas responde, permitindo cache do navegador padrão
-    // Para Gradio, evitar cache agressivo em APIs é importante
-    event.respondWith(fetch(event.request));
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== self.location.origin) {
+        return;
+    }
+
+    if (url.pathname === '/v1/validacao') {
+        event.respondWith(validar(event, url));
+    } else if (url.pathname === URL_DADOS) {
+        event.respondWith(respostaDados(event));
+    } else if (request.mode === 'navigate') {
+        event.respondWith(redePrimeiro(request));
+    } else if (imutavel(url)) {
+        event.respondWith(cachePrimeiro(request));
+    } else if (estatico(url)) {
+        event.respondWith(cacheERevalida(event, request));
+    }
+    // Demais requisições seguem direto para a rede
 });
+
+
+function imutavel(url) {
+    return url.searchParams.has('v') || url.pathname.startsWith('/assets/');
+}
+
+function estatico(url) {
+    return url.pathname.startsWith('/public/')
+        || url.pathname === '/favicon.ico'
+        || url.pathname === '/app-manifest.json';
+}
+
+async function redePrimeiro(request) {
+    const cache = await caches.open(CACHE_SHELL);
+    try {
+        const resposta = await fetch(request);
+        if (resposta.ok && new URL(request.url).pathname === '/') {
+            cache.put('/', resposta.clone());
+        }
+        return resposta;
+    } catch (erro) {
+        return (await cache.match('/')) || Response.error();
+    }
+}
+
+async function cachePrimeiro(request) {
+    const cache = await caches.open(CACHE_ESTATICOS);
+    const emCache = await cache.match(request);
+    if (emCache) {
+        return emCache;
+    }
+    const resposta = await fetch(request);
+    if (resposta.ok) {
+        cache.put(request, resposta.clone());
+    }
+    return resposta;
+}
+
+async function cacheERevalida(event, request) {
+    const cache = await caches.open(CACHE_ESTATICOS);
+    const emCache = (await cache.match(request)) || (await caches.match(request));
+    const atualizacao = fetch(request).then((resposta) => {
+        if (resposta.ok) {
+            cache.put(request, resposta.clone());
+        }
+        return resposta;
+    });
+    if (emCache) {
+        event.waitUntil(atualizacao.catch(() => null));
+        return emCache;
+    }
+    return atualizacao;
+}
+
+
+// ---------------------------------------------------------------------------
+// Dados de validação
+
+async function respostaDados(event) {
+    const cache = await caches.open(CACHE_DADOS);
+    const emCache = await cache.match(URL_DADOS);
+    if (emCache) {
+        event.waitUntil(revalidarDados());
+        return emCache;
+    }
+    await atualizarDados();
+    return (await cache.match(URL_DADOS)) || fetch(event.request);
+}
+
+// Baixa os dados apenas se a versão mudou (If-None-Match com o ETag em cache)
+async function atualizarDados() {
+    ultimaRevalidacao = Date.now();
+    const cache = await caches.open(CACHE_DADOS);
+    const emCache = await cache.match(URL_DADOS);
+    const headers = {};
+    if (emCache && emCache.headers.get('ETag')) {
+        headers['If-None-Match'] = emCache.headers.get('ETag');
+    }
+
+    try {
+        const resposta = await fetch(URL_DADOS, { headers, cache: 'no-store' });
+        if (resposta.status === 200) {
+            const novos = prepararDados(await resposta.clone().json());
+            if (novos) {
+                await cache.put(URL_DADOS, resposta);
+                dados = novos;
+            }
+        }
+    } catch (erro) {
+        // Offline: continua com a cópia em cache
+    }
+}
+
+function revalidarDados() {
+    if (Date.now() - ultimaRevalidacao < INTERVALO_REVALIDACAO) {
+        return Promise.resolve();
+    }
+    return atualizarDados();
+}
+
+function prepararDados(json) {
+    if (!json || json.formato !== FORMATO_DADOS) {
+        return null;
+    }
+    return {
+        versao: json.versao,
+        redes: new Map(Object.entries(json.redes)),
+        campos: new Map(json.campos.map((campo, i) => [campo, i])),
+        status: json.status,
+        formatos: json.formatos,
+    };
+}
+
+async function obterDados() {
+    if (!dados) {
+        const emCache = await caches.match(URL_DADOS);
+        if (emCache) {
+            dados = prepararDados(await emCache.json());
+        }
+    }
+    return dados;
+}
+
+// Mesmas regras de src/utils.py: normalize_campo
+function normalizarCampo(campo) {
+    return campo.trim().toLowerCase().replaceAll('__', '_').replaceAll('-', '_').replaceAll(' ', '_');
+}
+
+// Mesmo resultado de Validator.validar_campo; null quando a consulta precisa
+// do servidor (erros trazem sugestões calculadas lá)
+function validarLocal(d, redeInformada, campoInformado) {
+    if ((redeInformada || '').length > 100 || (campoInformado || '').length > 100) {
+        return null;
+    }
+    const rede = (redeInformada || '').trim();
+    const campo = (campoInformado || '').trim();
+    if (!rede || !campo) {
+        return null;
+    }
+
+    const canal = d.redes.get(rede);
+    const indice = d.campos.get(normalizarCampo(campo));
+    if (canal === undefined || indice === undefined || !d.status[canal]) {
+        return null;
+    }
+
+    const campoFormatado = campo.toUpperCase();
+    const status = STATUS_NOMES[Number(d.status[canal][indice])];
+    return {
+        status,
+        campo_formatado: campoFormatado,
+        rede,
+        canal,
+        status_texto: STATUS_TEXTO[status](campoFormatado, rede, canal),
+        formato: d.formatos[normalizarCampo(campo)] || null,
+    };
+}
+
+async function validar(event, url) {
+    const d = await obterDados();
+    const resultado = d && validarLocal(d, url.searchParams.get('rede'), url.searchParams.get('campo'));
+
+    if (!resultado) {
+        try {
+            return await fetch(event.request);
+        } catch (erro) {
+            return new Response(
+                JSON.stringify({ detail: 'Sem conexão: rede ou campo não encontrados nos dados salvos' }),
+                { status: 503, headers: { 'Content-Type': 'application/json' } }
+            );
+        }
+    }
+
+    event.waitUntil(revalidarDados());
+    return new Response(JSON.stringify(resultado), {
+        headers: {
+            'Content-Type': 'application/json',
+            'X-Dados-Versao': d.versao,
+            'X-Origem': 'service-worker',
+        },
+    });
+}
@@ -0,0 +1,170 @@
+"""
+Exportação do relatório de campos de uma rede (CSV e Excel).
+
+As linhas são geradas uma a uma: o CSV sai como um iterador de trechos
+(usado direto em respostas HTTP em streaming) e o Excel é gravado com o
+modo write-only do openpyxl, que não mantém a planilha em memória.
+Arquivos exportados ficam em cache por rede e versão dos dados e são
+apagados após Config.EXPORT_TTL_S sem uso.
+"""
+import csv
+import hashlib
+import io
+import os
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Formatos aceitos na exportação
+FORMATOS_EXPORTACAO = ('csv', 'xlsx')
+
+CABECALHO = ('CAMPO', 'STATUS', 'FORMATO')
+
+ROTULOS_STATUS = {
+    'obrigatorio': 'Obrigatório',
+    'opcional': 'Opcional',
+    'branco': 'Deve ficar em branco',
+}
+
+MEDIA_TYPE_XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Separador usado pelo Excel em português
+SEPARADOR_CSV = ';'
+
+
+def _linhas(relatorio: Dict[str, Any]) -> Iterator[tuple]:
+    """Linhas de dados do relatório, na ordem da planilha de campos"""
+    for item in relatorio['campos']:
+        yield item['campo'], ROTULOS_STATUS[item['status']], item['formato'] or ""
+
+
+def iter_csv(relatorio: Dict[str, Any]) -> Iterator[str]:
+    """
+    Gera o CSV do relatório linha a linha.
+    
+    Args:
+        relatorio: Dicionário retornado por Validator.relatorio_rede
+    
+    Yields:
+        Trechos de texto do CSV (o primeiro traz o BOM para o Excel
+        reconhecer UTF-8)
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=SEPARADOR_CSV)
+    
+    buffer.write('\ufeff')
+    writer.writerow(CABECALHO)
+    for linha in _linhas(relatorio):
+        writer.writerow(linha)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+def write_csv(relatorio: Dict[str, Any], destino: Path) -> None:
+    """Grava o CSV do relatório em disco, trecho a trecho"""
+    with open(destino, 'w', encoding='utf-8', newline='') as f:
+        for trecho in iter_csv(relatorio):
+            f.write(trecho)
+
+
+def write_xlsx(relatorio: Dict[str, Any], destino: Path) -> None:
+    """Grava o relatório em Excel com o openpyxl em modo write-only"""
+    from openpyxl import Workbook
+    
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Campos")
+    ws.append(CABECALHO)
+    for linha in _linhas(relatorio):
+        ws.append(linha)
+    wb.save(destino)
+
+
+def nome_arquivo(relatorio: Dict[str, Any], formato: str) -> str:
+    """
+    Nome do arquivo exportado, também usado como chave do cache.
+    
+    A parte legível da rede perde acentos e pontuação, então o nome leva
+    ainda um hash curto do nome original da rede e da versão completa dos
+    dados: redes como "CASA & CIA" e "CASA CIA" não compartilham arquivo.
+    """
+    rede = re.sub(r'[^A-Za-z0-9]+', '_', relatorio['rede']).strip('_') or 'rede'
+    versao = relatorio.get('versao') or 'atual'
+    chave = hashlib.sha256(f"{relatorio['rede']}\0{versao}".encode('utf-8')).hexdigest()[:8]
+    return f"campos_{rede}_{versao[:12]}_{chave}.{formato}"
+
+
+def exportar(relatorio: Dict[str, Any], formato: str) -> Path:
+    """
+    Exporta o relatório reaproveitando o arquivo já gerado para a mesma
+    rede e versão dos dados.
+    
+    Args:
+        relatorio: Dicionário retornado por Validator.relatorio_rede
+        formato: 'csv' ou 'xlsx'
+    
+    Returns:
+        Caminho do arquivo exportado
+    
+    Raises:
+        ValueError: Se o formato não for suportado
+    """
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato de exportação não suportado: {formato}")
+    
+    destino = Config.EXPORT_DIR / nome_arquivo(relatorio, formato)
+    try:
+        # Reaproveitado: a validade conta a partir do último uso
+        os.utime(destino)
+        return destino
+    except FileNotFoundError:
+        pass
+    
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    limpar_exportacoes(Config.EXPORT_DIR)
+    # Temporário único: exportações simultâneas da mesma rede não se atropelam
+    fd, nome_tmp = tempfile.mkstemp(dir=destino.parent, prefix=f"{destino.name}.", suffix='.tmp')
+    os.close(fd)
+    tmp = Path(nome_tmp)
+    try:
+        if formato == 'csv':
+            write_csv(relatorio, tmp)
+        else:
+            write_xlsx(relatorio, tmp)
+        os.replace(tmp, destino)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    
+    logger.info("Relatório exportado em %s", destino)
+    return destino
+
+
+def limpar_exportacoes(base: Path) -> None:
+    """
+    Apaga o que está sem uso há mais de Config.EXPORT_TTL_S: exportações de
+    campos (e temporários abandonados) e diretórios de modelos de versões
+    antigas dos dados (ver TemplateBuilder.salvar).
+    """
+    limite = time.time() - Config.EXPORT_TTL_S
+    for padrao in ('campos_*', 'modelos_*'):
+        for item in base.glob(padrao):
+            try:
+                if item.stat().st_mtime >= limite:
+                    continue
+                if item.is_dir():
+                    shutil.rmtree(item, ignore_errors=True)
+                else:
+                    item.unlink()
+            except OSError:
+                continue
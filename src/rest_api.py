@@ -0,0 +1,209 @@
+"""
+API REST (JSON) de validação de campos.
+
+Expõe o mesmo resultado de Validator.validar_campo usado pela interface
+Gradio, sem passar pela fila do Gradio nem pela renderização HTML.
+"""
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from config import Config
+from .client_data import dados_cliente_asset
+from .metrics import CONSULTAS
+from .report_export import MEDIA_TYPE_XLSX, exportar, iter_csv, nome_arquivo
+from .static_assets import responder_asset
+from .tracing import trace
+from .utils import ValidationError
+from .logger import setup_logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .analytics import Analytics
+    from .template_builder import TemplateBuilder
+    from .validator import Validator
+
+logger = setup_logger(__name__)
+
+
+class Consulta(BaseModel):
+    """Par rede/campo a validar"""
+    rede: str
+    campo: str
+
+
+class ResultadoValidacao(BaseModel):
+    """Resultado de Validator.validar_campo"""
+    status: str
+    campo_formatado: str
+    rede: str
+    canal: str
+    status_texto: str
+    formato: Optional[str] = None
+
+
+class LoteRequest(BaseModel):
+    """Várias consultas em uma única requisição"""
+    consultas: List[Consulta] = Field(..., max_length=Config.API_MAX_LOTE)
+
+
+class ItemLote(BaseModel):
+    """Resultado de uma consulta do lote: resultado ou mensagem de erro"""
+    rede: str
+    campo: str
+    resultado: Optional[ResultadoValidacao] = None
+    erro: Optional[str] = None
+    sugestoes: List[str] = []
+
+
+class LoteResponse(BaseModel):
+    """Resultados na mesma ordem das consultas"""
+    resultados: List[ItemLote]
+
+
+class CampoRelatorio(BaseModel):
+    """Status de um campo no relatório da rede"""
+    campo: str
+    status: str
+    formato: Optional[str] = None
+
+
+class RelatorioRede(BaseModel):
+    """Resultado de Validator.relatorio_rede"""
+    rede: str
+    canal: str
+    versao: str
+    campos: List[CampoRelatorio]
+    totais: Dict[str, int]
+
+
+class BuscaResponse(BaseModel):
+    """Termos encontrados em ordem de relevância"""
+    resultados: List[str]
+
+
+def create_router(
+    get_validator: Callable[[], "Validator"],
+    get_analytics: Optional[Callable[[], Optional["Analytics"]]] = None,
+    get_template_builder: Optional[Callable[[], "TemplateBuilder"]] = None
+) -> APIRouter:
+    """
+    Cria as rotas da API REST.
+    
+    Validator e Analytics são obtidos na primeira consulta, então montar as
+    rotas não carrega os dados das planilhas.
+    
+    Args:
+        get_validator: Função que retorna o Validator usado nas consultas
+        get_analytics: Função que retorna o Analytics para registrar as
+            consultas (opcional)
+        get_template_builder: Função que retorna o TemplateBuilder dos
+            modelos por canal (opcional; sem ele a rota /v1/modelo não existe)
+    
+    Returns:
+        APIRouter com as rotas /v1/validacao, /v1/validacao/lote,
+        /v1/relatorio, /v1/modelo, /v1/dados e /v1/busca/*
+    """
+    router = APIRouter(prefix="/v1", tags=["validacao"])
+    
+    def _validar(rede: str, campo: str) -> dict:
+        with trace("v1.validacao", rede=rede, campo=campo):
+            inicio = time.perf_counter()
+            try:
+                resultado = get_validator().validar_campo(rede, campo)
+            except ValidationError:
+                CONSULTAS.observe(time.perf_counter() - inicio, 'error', '')
+                raise
+            CONSULTAS.observe(time.perf_counter() - inicio, resultado['status'], resultado['canal'])
+            analytics = get_analytics() if get_analytics else None
+            if analytics is not None:
+                analytics.log_query(rede, campo, resultado['status'], resultado['canal'])
+            return resultado
+    
+    @router.get("/validacao", response_model=ResultadoValidacao)
+    def validar(rede: str, campo: str):
+        """Valida um campo para uma rede"""
+        try:
+            return _validar(rede, campo)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    
+    @router.post("/validacao/lote", response_model=LoteResponse)
+    def validar_lote(lote: LoteRequest):
+        """Valida vários pares rede/campo; erros são informados por item"""
+        resultados = []
+        for consulta in lote.consultas:
+            try:
+                resultado = _validar(consulta.rede, consulta.campo)
+                resultados.append({'rede': consulta.rede, 'campo': consulta.campo, 'resultado': resultado})
+            except ValidationError as e:
+                resultados.append({
+                    'rede': consulta.rede, 'campo': consulta.campo, 'erro': str(e), 'sugestoes': e.sugestoes
+                })
+        
+        logger.info("Lote de %s consultas processado", len(lote.consultas))
+        return {'resultados': resultados}
+    
+    @router.get("/relatorio", response_model=RelatorioRede)
+    def relatorio_rede(rede: str, formato: str = Query('json', pattern='^(json|csv|xlsx)$')):
+        """Status de todos os campos de uma rede (JSON, CSV em streaming ou Excel)"""
+        try:
+            relatorio = get_validator().relatorio_rede(rede)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        
+        if formato == 'csv':
+            nome = nome_arquivo(relatorio, 'csv')
+            return StreamingResponse(
+                iter_csv(relatorio),
+                media_type='text/csv; charset=utf-8',
+                headers={'Content-Disposition': f'attachment; filename="{nome}"'}
+            )
+        if formato == 'xlsx':
+            caminho = exportar(relatorio, 'xlsx')
+            return FileResponse(caminho, filename=caminho.name, media_type=MEDIA_TYPE_XLSX)
+        return relatorio
+    
+    @router.get("/busca/redes", response_model=BuscaResponse)
+    def buscar_redes(q: str = "", limite: int = Query(10, ge=1, le=100)):
+        """Redes por prefixo/semelhança (ignora acentos e maiúsculas)"""
+        return {'resultados': get_validator().data_loader.buscar_redes(q, limite)}
+    
+    @router.get("/busca/campos", response_model=BuscaResponse)
+    def buscar_campos(q: str = "", limite: int = Query(10, ge=1, le=100)):
+        """Campos por prefixo/semelhança (ignora acentos e maiúsculas)"""
+        return {'resultados': get_validator().data_loader.buscar_campos(q, limite)}
+    
+    @router.get("/dados", response_class=Response)
+    def dados_cliente(request: Request):
+        """Resumo da tabela de status para validação no cliente (service worker), com ETag"""
+        return responder_asset(request, dados_cliente_asset(get_validator().data_loader.require_data()))
+    
+    if get_template_builder is not None:
+        @router.get("/modelo", response_class=Response)
+        def modelo_canal(
+            canal: str = "",
+            rede: str = "",
+            if_none_match: Optional[str] = Header(None)
+        ):
+            """Modelo de planilha de vendas do canal (ou do canal da rede)"""
+            if not canal and not rede:
+                raise HTTPException(status_code=422, detail="Informe o canal ou a rede")
+            
+            builder = get_template_builder()
+            try:
+                canal = builder.resolver_canal(canal, rede)
+            except ValidationError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+            
+            conteudo, etag = builder.gerar(canal)
+            headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+            if if_none_match and etag in [t.strip() for t in if_none_match.split(',')]:
+                return Response(status_code=304, headers=headers)
+            
+            headers['Content-Disposition'] = f'attachment; filename="{builder.nome_arquivo(canal)}"'
+            return Response(conteudo, media_type=MEDIA_TYPE_XLSX, headers=headers)
+    
+    return router
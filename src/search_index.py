@@ -0,0 +1,144 @@
+"""
+Índice de busca aproximada para redes e campos.
+
+Montado uma vez a cada carga dos dados: termos são comparados sem acentos,
+sem diferença de maiúsculas e com "_"/"-" tratados como espaço. As
+consultas combinam prefixo (do termo inteiro ou de cada palavra) com
+similaridade por trigramas, o que tolera erros de digitação.
+"""
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Tamanho máximo dos prefixos indexados por palavra
+MAX_PREFIXO = 12
+
+# Similaridade mínima de trigramas para sugestões "você quis dizer"
+SIMILARIDADE_MINIMA = 0.3
+
+# Relevância mínima para um termo aparecer na busca
+RELEVANCIA_MINIMA_BUSCA = 0.2
+
+# Pesos do ranking
+_PESO_EXATO = 3.0
+_PESO_PREFIXO = 2.0
+_PESO_PREFIXO_PALAVRA = 1.0
+
+
+def fold(texto: str) -> str:
+    """
+    Normaliza texto para comparação.
+    
+    Args:
+        texto: Texto original
+    
+    Returns:
+        Texto sem acentos, em minúsculas e com separadores como espaço simples
+    
+    Examples:
+        >>> fold("Número__Cupom-Nota")
+        'numero cupom nota'
+    """
+    sem_acento = "".join(
+        c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c)
+    )
+    return " ".join(sem_acento.lower().replace("_", " ").replace("-", " ").split())
+
+
+def _trigramas(texto: str) -> Set[str]:
+    """Trigramas do texto já normalizado, com bordas marcadas"""
+    texto = f"  {texto} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class SearchIndex:
+    """Índice de prefixos e trigramas sobre uma lista fixa de termos"""
+    
+    __slots__ = ('termos', '_folded', '_trigramas', '_por_prefixo', '_por_trigrama')
+    
+    def __init__(self, termos: Iterable[str]):
+        # Termos repetidos aparecem uma única vez nos resultados
+        self.termos: Tuple[str, ...] = tuple(dict.fromkeys(termos))
+        self._folded: Tuple[str, ...] = tuple(fold(t) for t in self.termos)
+        self._trigramas: Tuple[Set[str], ...] = tuple(_trigramas(f) for f in self._folded)
+        
+        por_prefixo: Dict[str, Set[int]] = defaultdict(set)
+        por_trigrama: Dict[str, Set[int]] = defaultdict(set)
+        for i, folded in enumerate(self._folded):
+            for palavra in [folded] + folded.split():
+                for n in range(1, min(len(palavra), MAX_PREFIXO) + 1):
+                    por_prefixo[palavra[:n]].add(i)
+            for trigrama in self._trigramas[i]:
+                por_trigrama[trigrama].add(i)
+        
+        self._por_prefixo = dict(por_prefixo)
+        self._por_trigrama = dict(por_trigrama)
+    
+    def search(self, consulta: str, limite: int = 10) -> List[str]:
+        """
+        Busca termos por prefixo e similaridade.
+        
+        Args:
+            consulta: Texto digitado (acentos, maiúsculas e separadores são ignorados)
+            limite: Quantidade máxima de resultados
+        
+        Returns:
+            Termos originais em ordem de relevância; com consulta vazia, os
+            primeiros termos do índice
+        """
+        consulta = fold(consulta)
+        if not consulta:
+            return list(self.termos[:limite])
+        
+        pontos = self._pontuar(consulta)
+        ordem = sorted(
+            (i for i, p in pontos.items() if p >= RELEVANCIA_MINIMA_BUSCA),
+            key=lambda i: (-pontos[i], len(self._folded[i]), self._folded[i])
+        )
+        return [self.termos[i] for i in ordem[:limite]]
+    
+    def suggest(self, consulta: str, limite: int = 3, minimo: float = SIMILARIDADE_MINIMA) -> List[str]:
+        """
+        Sugestões para um termo não encontrado ("você quis dizer").
+        
+        Args:
+            consulta: Texto informado
+            limite: Quantidade máxima de sugestões
+            minimo: Similaridade mínima (0 a 1) para sugerir um termo
+        
+        Returns:
+            Termos mais parecidos, do mais para o menos relevante
+        """
+        consulta = fold(consulta)
+        if not consulta:
+            return []
+        
+        pontos = self._pontuar(consulta)
+        ordem = sorted(
+            (i for i, p in pontos.items() if p >= minimo),
+            key=lambda i: (-pontos[i], self._folded[i])
+        )
+        return [self.termos[i] for i in ordem[:limite]]
+    
+    def _pontuar(self, consulta: str) -> Dict[int, float]:
+        """Pontua os candidatos: prefixos somados à similaridade de trigramas"""
+        pontos: Dict[int, float] = defaultdict(float)
+        
+        trigramas = _trigramas(consulta)
+        for trigrama in trigramas:
+            for i in self._por_trigrama.get(trigrama, ()):
+                pontos[i] += 1
+        for i, comuns in pontos.items():
+            # Similaridade de Jaccard entre os conjuntos de trigramas
+            pontos[i] = comuns / (len(trigramas) + len(self._trigramas[i]) - comuns)
+        
+        prefixo = consulta[:MAX_PREFIXO]
+        for i in self._por_prefixo.get(prefixo, ()):
+            if self._folded[i] == consulta:
+                pontos[i] += _PESO_EXATO
+            elif self._folded[i].startswith(consulta):
+                pontos[i] += _PESO_PREFIXO
+            elif any(p.startswith(consulta) for p in self._folded[i].split()):
+                pontos[i] += _PESO_PREFIXO_PALAVRA
+        
+        return pontos
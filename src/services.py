@@ -0,0 +1,120 @@
+"""
+Serviços da aplicação criados sob demanda.
+
+Importar este módulo não carrega pandas/openpyxl nem lê as planilhas: tudo
+é montado na primeira chamada a get_services() (primeira validação ou
+aquecimento explícito via warm_up()), o que mantém baratas as partidas a
+frio em ambiente serverless para rotas que não precisam dos dados.
+"""
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from config import Config
+from .logger import setup_logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .analytics import Analytics
+    from .data_loader import DataLoader
+    from .file_validator import FileValidator
+    from .formatter import ResponseFormatter
+    from .template_builder import TemplateBuilder
+    from .validator import Validator
+
+logger = setup_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Services:
+    """Instâncias compartilhadas pela interface e pela API"""
+    data_loader: "DataLoader"
+    validator: "Validator"
+    file_validator: "FileValidator"
+    formatter: "ResponseFormatter"
+    analytics: "Analytics"
+    template_builder: "TemplateBuilder"
+
+
+_services: Optional[Services] = None
+_lock = threading.Lock()
+
+
+def get_services() -> Services:
+    """
+    Obtém os serviços, carregando os dados na primeira chamada.
+    
+    Returns:
+        Services já inicializados
+    """
+    global _services
+    if _services is not None:
+        return _services
+    
+    with _lock:
+        if _services is None:
+            _services = _create_services()
+    return _services
+
+
+async def get_services_async() -> Services:
+    """
+    Versão para handlers async: a primeira chamada (que lê as planilhas)
+    roda em uma thread para não bloquear o event loop.
+    
+    Returns:
+        Services já inicializados
+    """
+    if _services is not None:
+        return _services
+    return await asyncio.to_thread(get_services)
+
+
+def warm_up() -> None:
+    """Carrega dados e serviços antecipadamente (ex.: na inicialização do servidor)"""
+    get_services()
+
+
+def is_loaded() -> bool:
+    """Indica se os serviços já foram criados"""
+    return _services is not None
+
+
+def _create_services() -> Services:
+    from .analytics import Analytics
+    from .data_loader import DataLoader
+    from .file_validator import FileValidator
+    from .formatter import ResponseFormatter
+    from .template_builder import TemplateBuilder
+    from .validator import Validator
+    
+    logger.info("Iniciando aplicação LG-AI...")
+    analytics = Analytics()
+    analytics.start_compaction()
+    
+    data_loader = DataLoader()
+    data_loader.load_all()
+    
+    # Planilhas atualizadas passam a valer sem reiniciar o processo
+    if Config.AUTO_RELOAD:
+        data_loader.start_auto_reload()
+    
+    validator = Validator(data_loader)
+    formatter = ResponseFormatter()
+    
+    # Respostas renderizadas deixam de valer quando as planilhas são recarregadas
+    data_loader.add_reload_listener(formatter.clear_cache)
+    
+    logger.info(
+        "Aplicação iniciada: %s redes, %s campos",
+        len(data_loader.get_lista_redes()), len(data_loader.get_lista_campos())
+    )
+    
+    return Services(
+        data_loader=data_loader,
+        validator=validator,
+        file_validator=FileValidator(validator),
+        formatter=formatter,
+        analytics=analytics,
+        template_builder=TemplateBuilder(data_loader)
+    )
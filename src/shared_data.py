@@ -0,0 +1,145 @@
+"""
+Arquivo de dados compartilhado entre workers (memory-mapped).
+
+No modo multi-worker (Config.SHARED_DATA) os dados são gerados uma única vez
+por ``python build_snapshot.py --shared`` e cada worker apenas mapeia o
+arquivo em memória (somente leitura): a matriz de status é usada direto do
+mapeamento, sem cópia, e as páginas são compartilhadas pelo sistema
+operacional entre todos os processos. Os textos (redes, campos e
+comentários) ocupam poucos KB e são decodificados em cada worker.
+
+Layout do arquivo::
+
+    cabeçalho | metadados JSON | preenchimento | matriz (canais × campos)
+
+Publicar uma nova versão é gravar um arquivo temporário e trocá-lo com
+os.replace: workers que ainda usam a versão anterior continuam com o
+mapeamento antigo até recarregarem.
+"""
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from .data_loader import LoadedData
+from .status_table import StatusTable
+from .utils import InvalidDataError
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+MAGIC = b"LGAISHM\0"
+
+# Incrementar sempre que o layout do arquivo mudar
+SHARED_FORMAT_VERSION = 1
+
+# magic, versão, tamanho dos metadados, deslocamento e tamanho da matriz
+_HEADER = struct.Struct("<8sIIQQ")
+
+# Alinhamento da matriz dentro do arquivo
+_ALINHAMENTO = 64
+
+
+def assinatura(path: Path) -> Tuple[int, int, int]:
+    """
+    Identifica a versão publicada do arquivo (muda a cada os.replace).
+    
+    Args:
+        path: Caminho do arquivo compartilhado
+    
+    Returns:
+        Tupla (inode, tamanho, mtime_ns)
+    """
+    stat = path.stat()
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def save_shared(path: Path, dados: LoadedData, fontes: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Grava o arquivo compartilhado de forma atômica (arquivo temporário + rename).
+    
+    Args:
+        path: Caminho do arquivo
+        dados: Dados processados
+        fontes: Impressão digital das planilhas usadas para gerar os dados
+    """
+    tabela = dados.status_table
+    meta = json.dumps({
+        'versao': dados.versao,
+        'fontes': fontes,
+        'campos': list(tabela.campos),
+        'canais': list(tabela.canais),
+        'mapa_rede_canal': dados.mapa_rede_canal,
+        'comentarios': dados.comentarios,
+    }, ensure_ascii=False).encode('utf-8')
+    matrix = b"".join(bytes(linha) for linha in tabela.matrix)
+    
+    offset = -(-(_HEADER.size + len(meta)) // _ALINHAMENTO) * _ALINHAMENTO
+    cabecalho = _HEADER.pack(MAGIC, SHARED_FORMAT_VERSION, len(meta), offset, len(matrix))
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(cabecalho)
+            f.write(meta)
+            f.write(b"\0" * (offset - _HEADER.size - len(meta)))
+            f.write(matrix)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    
+    logger.info("Dados compartilhados gravados em %s", path)
+
+
+def load_shared(path: Path) -> Tuple[LoadedData, Dict[str, Dict[str, Any]]]:
+    """
+    Mapeia o arquivo compartilhado em memória.
+    
+    Args:
+        path: Caminho do arquivo
+    
+    Returns:
+        Tupla (dados, impressão digital das planilhas de origem). As linhas
+        da matriz de status são memoryviews sobre o mapeamento, que permanece
+        aberto enquanto os dados estiverem em uso.
+    
+    Raises:
+        InvalidDataError: Se o arquivo estiver corrompido ou em outro formato
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapeamento = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise InvalidDataError(f"Arquivo de dados compartilhado vazio: {path}")
+    
+    if len(mapeamento) < _HEADER.size:
+        raise InvalidDataError(f"Arquivo de dados compartilhado inválido: {path}")
+    
+    magic, versao_formato, meta_len, offset, matrix_len = _HEADER.unpack_from(mapeamento)
+    if magic != MAGIC or versao_formato != SHARED_FORMAT_VERSION:
+        raise InvalidDataError(f"Arquivo de dados compartilhado em formato desconhecido: {path}")
+    if offset + matrix_len > len(mapeamento):
+        raise InvalidDataError(f"Arquivo de dados compartilhado truncado: {path}")
+    
+    meta = json.loads(mapeamento[_HEADER.size:_HEADER.size + meta_len].decode('utf-8'))
+    campos = tuple(meta['campos'])
+    canais = tuple(meta['canais'])
+    if matrix_len != len(campos) * len(canais):
+        raise InvalidDataError(f"Matriz de status incompatível em {path}")
+    
+    # Linhas da matriz apontam direto para o mapeamento (sem cópia)
+    matrix_view = memoryview(mapeamento)[offset:offset + matrix_len]
+    n = len(campos)
+    matrix = tuple(matrix_view[i * n:(i + 1) * n] for i in range(len(canais)))
+    
+    dados = LoadedData(
+        comentarios=meta['comentarios'],
+        mapa_rede_canal=meta['mapa_rede_canal'],
+        status_table=StatusTable(campos, canais, matrix),
+        versao=meta['versao'],
+    )
+    return dados, meta['fontes']
@@ -0,0 +1,119 @@
+"""
+Leitura das planilhas de origem.
+
+Único ponto que depende de pandas/openpyxl: converte as planilhas nas
+estruturas compactas de LoadedData (tuplas, dicionários e bytes). Usado pelo
+gerador de snapshot e, na aplicação, apenas quando não há snapshot
+atualizado.
+"""
+import sys
+from typing import Dict
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from config import Config
+from .data_loader import LoadedData
+from .status_table import StatusTable
+from .utils import normalize_campo, InvalidDataError
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def parse_sources(versao: str = "") -> LoadedData:
+    """
+    Processa as planilhas e monta uma nova versão dos dados.
+    
+    Args:
+        versao: Versão dos dados (hash das planilhas)
+    
+    Returns:
+        LoadedData sem nenhum objeto do pandas
+    """
+    df_redes = load_redes()
+    df_campos = load_and_normalize_campos()
+    return LoadedData(
+        comentarios=load_comentarios(),
+        mapa_rede_canal=create_rede_canal_map(df_redes),
+        status_table=build_status_table(df_campos),
+        versao=versao,
+    )
+
+
+def load_redes() -> pd.DataFrame:
+    """Carrega planilha de redes"""
+    logger.info("Carregando redes de %s", Config.REDES_FILE.name)
+    df = pd.read_excel(Config.REDES_FILE)
+    
+    # Validação
+    required_columns = ['Rede', 'Canal']
+    missing = set(required_columns) - set(df.columns)
+    if missing:
+        raise InvalidDataError(f"Colunas faltando em Redes: {missing}")
+    
+    if df['Rede'].isna().any():
+        raise InvalidDataError("Existem redes com valores nulos")
+    
+    logger.info("Carregadas %s redes", len(df))
+    return df
+
+
+def load_and_normalize_campos() -> pd.DataFrame:
+    """Carrega e normaliza planilha de campos"""
+    logger.info("Carregando campos de %s", Config.CAMPOS_FILE.name)
+    df = pd.read_excel(Config.CAMPOS_FILE)
+    
+    # Validação
+    if 'CAMPO' not in df.columns:
+        raise InvalidDataError("Coluna 'CAMPO' não encontrada")
+    
+    if df['CAMPO'].isna().any():
+        raise InvalidDataError("Existem campos com valores nulos")
+    
+    # Normalização
+    df['CAMPO_NORMALIZADO'] = df['CAMPO'].apply(normalize_campo)
+    
+    logger.info("Carregados %s campos", len(df))
+    logger.debug("Campos normalizados: %s...", df['CAMPO_NORMALIZADO'].tolist()[:5])
+    
+    return df
+
+
+def load_comentarios() -> Dict[str, str]:
+    """Extrai comentários do modelo Excel"""
+    logger.info("Extraindo comentários de %s", Config.MODELO_FILE.name)
+    comentarios = {}
+    
+    wb = load_workbook(Config.MODELO_FILE, data_only=True)
+    ws = wb.active
+    
+    for cell in ws[1]:
+        if cell.comment and cell.value:
+            key = cell.value.strip().lower()
+            comentarios[key] = cell.comment.text.strip()
+    
+    logger.info("Extraídos %s comentários", len(comentarios))
+    return comentarios
+
+
+def create_rede_canal_map(df_redes: pd.DataFrame) -> Dict[str, str]:
+    """
+    Cria mapeamento de rede para canal.
+    
+    Valores são convertidos para str (nada de tipos numpy no snapshot) e os
+    nomes de canal, repetidos em todas as redes, são internados.
+    """
+    mapa = {
+        str(rede): sys.intern(str(canal))
+        for rede, canal in zip(df_redes['Rede'].tolist(), df_redes['Canal'].tolist())
+    }
+    logger.debug("Criado mapa com %s redes", len(mapa))
+    return mapa
+
+
+def build_status_table(df_campos: pd.DataFrame) -> StatusTable:
+    """Compila a matriz canal × campo usada nas consultas"""
+    tabela = StatusTable.from_dataframe(df_campos)
+    logger.debug("Tabela de status: %s canais x %s campos", len(tabela.canais), len(tabela.campos))
+    return tabela
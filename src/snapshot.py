@@ -0,0 +1,165 @@
+"""
+Snapshot binário dos dados das planilhas.
+
+Evita reprocessar os arquivos Excel a cada inicialização: os dados já
+processados são gravados em um arquivo pickle junto com a impressão digital
+(tamanho, mtime e sha256) de cada planilha de origem. O snapshot só é usado
+enquanto as planilhas não mudarem.
+
+Na implantação o snapshot pode ser pré-gerado com:
+    python build_snapshot.py
+"""
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Incrementar sempre que o conteúdo do snapshot mudar de formato
+SNAPSHOT_VERSION = 5
+
+
+def _sha256(filepath: Path) -> str:
+    """Calcula o sha256 de um arquivo"""
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def fingerprint(filepaths: Iterable[Path]) -> Dict[str, Dict[str, Any]]:
+    """
+    Gera a impressão digital dos arquivos de origem.
+    
+    Args:
+        filepaths: Planilhas de origem
+    
+    Returns:
+        Dicionário nome -> {'tamanho', 'mtime_ns', 'sha256'}
+    """
+    fontes = {}
+    for filepath in filepaths:
+        stat = filepath.stat()
+        fontes[filepath.name] = {
+            'tamanho': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': _sha256(filepath),
+        }
+    return fontes
+
+
+def versao(fontes: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Calcula a versão dos dados a partir do conteúdo das planilhas.
+    
+    Args:
+        fontes: Impressão digital das planilhas
+    
+    Returns:
+        Hash hexadecimal que muda sempre que alguma planilha muda
+    """
+    h = hashlib.sha256()
+    for nome in sorted(fontes):
+        h.update(f"{nome}:{fontes[nome]['sha256']};".encode())
+    return h.hexdigest()
+
+
+def is_fresh(fontes: Dict[str, Dict[str, Any]], filepaths: Iterable[Path]) -> bool:
+    """
+    Verifica se as planilhas ainda correspondem à impressão digital salva.
+    
+    Tamanho e mtime iguais dispensam a leitura do arquivo; se o mtime mudou
+    (ex.: checkout novo na implantação) compara o sha256 do conteúdo.
+    
+    Args:
+        fontes: Impressão digital salva no snapshot
+        filepaths: Planilhas de origem
+    
+    Returns:
+        True se nenhuma planilha mudou
+    """
+    filepaths = list(filepaths)
+    if set(fontes) != {f.name for f in filepaths}:
+        return False
+    
+    for filepath in filepaths:
+        salvo = fontes[filepath.name]
+        stat = filepath.stat()
+        if stat.st_size != salvo['tamanho']:
+            return False
+        if stat.st_mtime_ns != salvo['mtime_ns'] and _sha256(filepath) != salvo['sha256']:
+            return False
+    return True
+
+
+def save_snapshot(path: Path, dados: Any, fontes: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Grava o snapshot de forma atômica (arquivo temporário + rename).
+    
+    Args:
+        path: Caminho do snapshot
+        dados: Dados processados
+        fontes: Impressão digital das planilhas usadas para gerar os dados
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    conteudo = {'version': SNAPSHOT_VERSION, 'fontes': fontes, 'dados': dados}
+    
+    try:
+        with open(tmp, 'wb') as f:
+            pickle.dump(conteudo, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    
+    logger.info("Snapshot gravado em %s", path)
+
+
+def load_snapshot(path: Path, filepaths: Iterable[Path]) -> Optional[Tuple[Any, Dict[str, Dict[str, Any]]]]:
+    """
+    Carrega o snapshot se existir e estiver atualizado.
+    
+    Args:
+        path: Caminho do snapshot
+        filepaths: Planilhas de origem
+    
+    Returns:
+        Tupla (dados processados, impressão digital atual das planilhas), ou
+        None se o snapshot não existir, estiver desatualizado ou corrompido
+    """
+    filepaths = list(filepaths)
+    if not path.exists():
+        logger.info("Snapshot não encontrado")
+        return None
+    
+    try:
+        with open(path, 'rb') as f:
+            conteudo = pickle.load(f)
+    except Exception as e:
+        logger.warning("Snapshot inválido, ignorando: %s", e)
+        return None
+    
+    if not isinstance(conteudo, dict) or conteudo.get('version') != SNAPSHOT_VERSION:
+        logger.info("Snapshot de versão antiga, ignorando")
+        return None
+    
+    if not is_fresh(conteudo['fontes'], filepaths):
+        logger.info("Planilhas alteradas desde o último snapshot")
+        return None
+    
+    # Conteúdo confirmado: atualiza tamanho/mtime para que as próximas
+    # verificações não precisem recalcular o hash
+    fontes = {}
+    for filepath in filepaths:
+        stat = filepath.stat()
+        fontes[filepath.name] = dict(
+            conteudo['fontes'][filepath.name], tamanho=stat.st_size, mtime_ns=stat.st_mtime_ns
+        )
+    
+    return conteudo['dados'], fontes
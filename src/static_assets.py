@@ -0,0 +1,441 @@
+"""
+Arquivos estáticos (PWA e /public) com cache HTTP e compressão.
+
+Cada arquivo é lido uma única vez por processo e servido a partir da memória:
+
+- ETag forte com o hash do conteúdo e resposta 304 para requisições
+  condicionais (If-None-Match);
+- URLs versionadas (``/public/arquivo.png?v=<hash>``, ver StaticAssets.url)
+  recebem Cache-Control imutável de um ano; as demais são revalidadas
+  a cada uso (no-cache), o que custa apenas um 304;
+- arquivos de texto recebem variantes brotli e gzip pré-calculadas;
+- imagens PNG/JPEG ganham derivados AVIF/WebP, enviados quando o navegador
+  os aceita. Os derivados vêm de Config.STATIC_BUILD_DIR (gerados na
+  implantação com ``python build_snapshot.py --static``) ou de
+  Config.STATIC_CACHE_DIR; faltando nos dois, cada formato é codificado em
+  segundo plano só quando um navegador o pede, e até lá serve-se o original.
+
+brotli e Pillow são opcionais: sem eles, ficam só o gzip e a imagem original.
+"""
+import gzip
+import hashlib
+import io
+import mimetypes
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Set, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Tipos que valem a pena comprimir (PNG/JPEG/WebP já são comprimidos)
+TIPOS_COMPRESSIVEIS = (
+    'text/',
+    'application/javascript',
+    'application/json',
+    'application/manifest+json',
+    'image/svg+xml',
+    'image/x-icon',
+    'image/vnd.microsoft.icon',
+)
+
+# Imagens que recebem derivados em formatos modernos
+TIPOS_IMAGEM_RASTER = ('image/png', 'image/jpeg')
+
+# Derivados de imagem em ordem de preferência: (media type, formato do Pillow)
+FORMATOS_DERIVADOS = (
+    ('image/avif', 'AVIF'),
+    ('image/webp', 'WEBP'),
+)
+
+# Codificações pré-calculadas em ordem de preferência
+CODIFICACOES = ('br', 'gzip')
+
+CACHE_IMUTAVEL = f"public, max-age={Config.STATIC_MAX_AGE_S}, immutable"
+CACHE_REVALIDAR = "no-cache"
+
+# Tamanho do hash usado nas URLs versionadas
+_TAMANHO_VERSAO = 12
+
+
+@dataclass(frozen=True)
+class Representacao:
+    """Conteúdo pronto para envio de um arquivo (original, comprimido ou derivado)"""
+    conteudo: bytes
+    media_type: str
+    etag: str
+    encoding: Optional[str] = None
+
+
+@dataclass
+class Asset:
+    """Arquivo estático carregado, com as variantes disponíveis"""
+    nome: str
+    hash: str
+    original: Representacao
+    comprimidos: Dict[str, Representacao] = field(default_factory=dict)
+    derivados: Dict[str, Representacao] = field(default_factory=dict)
+    
+    @property
+    def versao(self) -> str:
+        """Trecho do hash usado nas URLs versionadas"""
+        return self.hash[:_TAMANHO_VERSAO]
+    
+    @property
+    def raster(self) -> bool:
+        return self.original.media_type in TIPOS_IMAGEM_RASTER
+
+
+def _media_type(caminho: Path) -> str:
+    if caminho.suffix == '.webmanifest' or caminho.name.endswith('manifest.json'):
+        return 'application/manifest+json'
+    tipo = mimetypes.guess_type(caminho.name)[0] or 'application/octet-stream'
+    if tipo.startswith('text/') or tipo in ('application/javascript', 'application/json'):
+        tipo += '; charset=utf-8'
+    return tipo
+
+
+def _comprimir(conteudo: bytes, encoding: str) -> Optional[bytes]:
+    """Comprime com o nível máximo (feito uma vez por arquivo); None se indisponível"""
+    if encoding == 'gzip':
+        return gzip.compress(conteudo, compresslevel=9, mtime=0)
+    try:
+        import brotli
+    except ImportError:
+        return None
+    comprimido: bytes = brotli.compress(conteudo, quality=11)
+    return comprimido
+
+
+def _aceitos(cabecalho: Optional[str]) -> Set[str]:
+    """Valores de Accept/Accept-Encoding com q > 0 (em minúsculas, sem parâmetros)"""
+    aceitos = set()
+    for item in (cabecalho or "").split(','):
+        valor, _, parametros = item.partition(';')
+        valor = valor.strip().lower()
+        if not valor:
+            continue
+        q = parametros.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        aceitos.add(valor)
+    return aceitos
+
+
+def _etag_confere(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparação fraca de If-None-Match (RFC 9110, 13.1.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    alvo = etag.removeprefix('W/')
+    return any(t.strip().removeprefix('W/') == alvo for t in if_none_match.split(','))
+
+
+def criar_asset(nome: str, conteudo: bytes, media_type: str) -> Asset:
+    """
+    Monta o Asset de um conteúdo e pré-calcula as variantes comprimidas.
+    
+    Args:
+        nome: Nome do arquivo (usado nos logs)
+        conteudo: Bytes do arquivo
+        media_type: Content-Type do conteúdo
+    
+    Returns:
+        Asset sem derivados de imagem (ver StaticAssets.gerar_derivados)
+    """
+    hash_conteudo = hashlib.sha256(conteudo).hexdigest()
+    asset = Asset(
+        nome=nome,
+        hash=hash_conteudo,
+        original=Representacao(conteudo, media_type, f'"{hash_conteudo[:32]}"'),
+    )
+    
+    if media_type.startswith(TIPOS_COMPRESSIVEIS):
+        for encoding in CODIFICACOES:
+            comprimido = _comprimir(conteudo, encoding)
+            # Só vale a pena se economizar pelo menos 10%
+            if comprimido is not None and len(comprimido) < len(conteudo) * 0.9:
+                asset.comprimidos[encoding] = Representacao(
+                    comprimido, media_type, f'"{hash_conteudo[:32]}-{encoding}"', encoding
+                )
+    return asset
+
+
+def carregar_asset(caminho: Path, nome: str) -> Asset:
+    """Lê o arquivo do disco (ver criar_asset)"""
+    return criar_asset(nome, caminho.read_bytes(), _media_type(caminho))
+
+
+def responder_asset(request: Request, asset: Asset, imutavel: bool = True) -> Response:
+    """
+    Responde a uma requisição GET/HEAD com a melhor representação do Asset.
+    
+    Args:
+        request: Requisição (Accept, Accept-Encoding, If-None-Match e ?v=)
+        asset: Conteúdo a enviar
+        imutavel: Se False, nunca usa cache imutável (ex.: sw.js)
+    
+    Returns:
+        200 com a representação aceita ou 304 se o cliente já a tiver
+    """
+    representacao = _escolher(asset, request)
+    versionada = imutavel and request.query_params.get('v') == asset.versao
+    headers = {
+        'ETag': representacao.etag,
+        'Cache-Control': CACHE_IMUTAVEL if versionada else CACHE_REVALIDAR,
+        'Vary': 'Accept' if asset.raster else 'Accept-Encoding',
+    }
+    
+    if _etag_confere(request.headers.get('if-none-match'), representacao.etag):
+        return Response(status_code=304, headers=headers)
+    
+    if representacao.encoding:
+        headers['Content-Encoding'] = representacao.encoding
+    return Response(representacao.conteudo, media_type=representacao.media_type, headers=headers)
+
+
+def _escolher(asset: Asset, request: Request) -> Representacao:
+    """Melhor representação aceita pelo cliente"""
+    if asset.derivados:
+        aceitos = _aceitos(request.headers.get('accept'))
+        for media_type, _ in FORMATOS_DERIVADOS:
+            if media_type in asset.derivados and media_type in aceitos:
+                return asset.derivados[media_type]
+    
+    if asset.comprimidos:
+        aceitos = _aceitos(request.headers.get('accept-encoding'))
+        for encoding in CODIFICACOES:
+            if encoding in asset.comprimidos and encoding in aceitos:
+                return asset.comprimidos[encoding]
+    
+    return asset.original
+
+
+class StaticAssets:
+    """Arquivos de um diretório servidos da memória com ETag, compressão e derivados"""
+    
+    def __init__(self, diretorio: Path, prefixo: str = ""):
+        """
+        Args:
+            diretorio: Diretório dos arquivos
+            prefixo: Prefixo das URLs (ex.: "/public"), usado em url()
+        """
+        self.diretorio = Path(diretorio).resolve()
+        self.prefixo = prefixo.rstrip('/')
+        self._assets: Dict[str, Asset] = {}
+        self._derivados_iniciados: Set[Tuple[str, str]] = set()
+        self._derivados_pendentes: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+    
+    def get(self, nome: str) -> Optional[Asset]:
+        """
+        Obtém o arquivo, carregando-o no primeiro acesso.
+        
+        Derivados de imagem já prontos em disco são carregados junto; os que
+        faltam só são codificados quando pedidos (ver responder).
+        
+        Args:
+            nome: Caminho relativo ao diretório
+        
+        Returns:
+            Asset ou None se o arquivo não existir (ou estiver fora do diretório)
+        """
+        asset = self._assets.get(nome)
+        if asset is None:
+            asset = self._carregar(nome)
+        return asset
+    
+    def url(self, nome: str) -> str:
+        """
+        URL versionada pelo conteúdo (servida com cache imutável).
+        
+        Args:
+            nome: Caminho relativo ao diretório
+        
+        Returns:
+            URL com ?v=<hash>, ou sem versão se o arquivo não existir
+        """
+        asset = self.get(nome)
+        base = f"{self.prefixo}/{nome}"
+        return f"{base}?v={asset.versao}" if asset else base
+    
+    def preparar(self, derivados: bool = False, destino: Optional[Path] = None) -> None:
+        """
+        Carrega e comprime todos os arquivos.
+        
+        Args:
+            derivados: Também codifica os derivados de imagem que faltarem
+                (etapa de implantação; na inicialização eles ficam para o
+                primeiro pedido de cada formato)
+            destino: Diretório onde gravar os derivados codificados
+                (padrão: Config.STATIC_CACHE_DIR)
+        """
+        for caminho in sorted(self.diretorio.rglob('*')):
+            if caminho.is_file() and not caminho.name.startswith('.'):
+                nome = caminho.relative_to(self.diretorio).as_posix()
+                asset = self.get(nome)
+                if derivados and asset is not None and asset.raster:
+                    self.gerar_derivados(asset, destino=destino)
+        logger.info("Arquivos estáticos prontos: %s em %s", len(self._assets), self.diretorio.name)
+    
+    def gerar_derivados(
+        self,
+        asset: Asset,
+        media_types: Optional[Sequence[str]] = None,
+        somente_primeiro: bool = False,
+        destino: Optional[Path] = None
+    ) -> None:
+        """
+        Gera (ou lê do disco) os derivados AVIF/WebP de uma imagem.
+        
+        Derivados maiores que o original são descartados; formatos sem suporte
+        no Pillow instalado são ignorados.
+        
+        Args:
+            asset: Imagem original
+            media_types: Formatos desejados (padrão: todos de FORMATOS_DERIVADOS)
+            somente_primeiro: Para no primeiro formato disponível, na ordem de preferência
+            destino: Diretório onde gravar os codificados (padrão: Config.STATIC_CACHE_DIR)
+        """
+        for media_type, formato in FORMATOS_DERIVADOS:
+            if media_types is not None and media_type not in media_types:
+                continue
+            if media_type not in asset.derivados:
+                conteudo = self._derivado(asset, formato, destino)
+                if conteudo is not None and len(conteudo) < len(asset.original.conteudo):
+                    asset.derivados[media_type] = Representacao(
+                        conteudo, media_type, f'"{asset.hash[:32]}-{formato.lower()}"'
+                    )
+            if somente_primeiro and media_type in asset.derivados:
+                return
+    
+    def responder(self, request: Request, nome: str, imutavel: bool = True) -> Response:
+        """
+        Responde a uma requisição GET/HEAD de um arquivo.
+        
+        Args:
+            request: Requisição (Accept, Accept-Encoding, If-None-Match e ?v=)
+            nome: Caminho relativo ao diretório
+            imutavel: Se False, nunca usa cache imutável (ex.: sw.js)
+        
+        Returns:
+            200 com a melhor representação aceita, 304 ou 404
+        """
+        asset = self.get(nome)
+        if asset is None:
+            return Response("Not Found", status_code=404, media_type='text/plain')
+        # Com um derivado aceito ainda em codificação, o original não pode
+        # ficar no cache imutável do navegador no lugar dele
+        if asset.raster and self._iniciar_derivados(asset, request):
+            imutavel = False
+        return responder_asset(request, asset, imutavel)
+    
+    def _carregar(self, nome: str) -> Optional[Asset]:
+        caminho = (self.diretorio / nome).resolve()
+        if not caminho.is_relative_to(self.diretorio) or not caminho.is_file():
+            return None
+        
+        asset = carregar_asset(caminho, nome)
+        if asset.raster:
+            # Só o que já está em disco: nada é codificado no carregamento
+            for media_type, formato in FORMATOS_DERIVADOS:
+                conteudo = self._derivado_em_disco(asset, formato)
+                if conteudo is not None and len(conteudo) < len(asset.original.conteudo):
+                    asset.derivados[media_type] = Representacao(
+                        conteudo, media_type, f'"{asset.hash[:32]}-{formato.lower()}"'
+                    )
+        with self._lock:
+            return self._assets.setdefault(nome, asset)
+    
+    def _iniciar_derivados(self, asset: Asset, request: Request) -> bool:
+        """
+        Codifica em segundo plano o formato preferido aceito pelo cliente, se
+        ainda não existir; até lá, serve-se o original.
+        
+        Returns:
+            True se algum formato aceito pelo cliente ainda está em codificação
+        """
+        aceitos = _aceitos(request.headers.get('accept'))
+        pedidos = [m for m, _ in FORMATOS_DERIVADOS if m in aceitos]
+        if not pedidos or pedidos[0] in asset.derivados:
+            return False
+        
+        with self._lock:
+            novos = [m for m in pedidos if (asset.nome, m) not in self._derivados_iniciados]
+            self._derivados_iniciados.update((asset.nome, m) for m in novos)
+            self._derivados_pendentes.update((asset.nome, m) for m in novos)
+            pendente = any((asset.nome, m) in self._derivados_pendentes for m in pedidos)
+        if novos:
+            threading.Thread(
+                target=self._gerar_pendentes,
+                args=(asset, novos),
+                name="lg-ai-derivados",
+                daemon=True
+            ).start()
+        return pendente
+    
+    def _gerar_pendentes(self, asset: Asset, media_types: Sequence[str]) -> None:
+        """Gera o primeiro formato disponível e libera os pendentes ao terminar"""
+        try:
+            self.gerar_derivados(asset, media_types, somente_primeiro=True)
+        finally:
+            with self._lock:
+                self._derivados_pendentes.difference_update((asset.nome, m) for m in media_types)
+    
+    @staticmethod
+    def _derivado_em_disco(asset: Asset, formato: str) -> Optional[bytes]:
+        """Derivado gerado na implantação ou em cache em disco (None se não houver)"""
+        nome = f"{asset.hash}.{formato.lower()}"
+        for diretorio in (Config.STATIC_BUILD_DIR, Config.STATIC_CACHE_DIR):
+            try:
+                return (diretorio / nome).read_bytes()
+            except OSError:
+                continue
+        return None
+    
+    @classmethod
+    def _derivado(cls, asset: Asset, formato: str, diretorio: Optional[Path] = None) -> Optional[bytes]:
+        """Conteúdo do derivado, reaproveitando o disco ou codificando com o Pillow"""
+        conteudo_em_disco = cls._derivado_em_disco(asset, formato)
+        if conteudo_em_disco is not None:
+            return conteudo_em_disco
+        
+        destino = (diretorio or Config.STATIC_CACHE_DIR) / f"{asset.hash}.{formato.lower()}"
+        try:
+            from PIL import Image
+            
+            with Image.open(io.BytesIO(asset.original.conteudo)) as imagem:
+                buffer = io.BytesIO()
+                imagem.save(buffer, format=formato, quality=Config.STATIC_QUALIDADE_IMAGEM)
+        except (ImportError, KeyError, OSError, ValueError) as e:
+            logger.debug("Derivado %s indisponível para %s: %s", formato, asset.nome, e)
+            return None
+        
+        conteudo = buffer.getvalue()
+        try:
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            tmp = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(conteudo)
+            os.replace(tmp, destino)
+        except OSError as e:
+            logger.warning("Não foi possível gravar %s: %s", destino, e)
+        
+        logger.info("Derivado %s de %s: %s -> %s bytes", formato, asset.nome, len(asset.original.conteudo), len(conteudo))
+        return conteudo
+
+
+# Diretórios servidos pela aplicação (nada é lido até o primeiro acesso)
+PUBLIC = StaticAssets(Config.ASSETS_DIR, "/public")
+PWA = StaticAssets(Config.SRC_DIR / "pwa")
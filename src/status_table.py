@@ -0,0 +1,116 @@
+import sys
+from typing import TYPE_CHECKING, Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+# Códigos de status armazenados na matriz
+OBRIGATORIO = 0
+OPCIONAL = 1
+BRANCO = 2
+
+STATUS_NOMES: Tuple[str, ...] = ('obrigatorio', 'opcional', 'branco')
+
+# Símbolos usados na planilha de campos
+SIMBOLOS_STATUS: Dict[str, int] = {
+    '✓': OBRIGATORIO,
+    '✗': BRANCO,
+}
+
+# Colunas da planilha de campos que não representam canais
+COLUNAS_NAO_CANAL = ('CAMPO', 'CAMPO_NORMALIZADO')
+
+
+def codificar_status(valor) -> int:
+    """
+    Converte o valor de uma célula da planilha de campos em código de status.
+    
+    Args:
+        valor: Conteúdo da célula ('✓', '✗' ou qualquer outro valor)
+    
+    Returns:
+        Código de status (OBRIGATORIO, OPCIONAL ou BRANCO)
+    """
+    return SIMBOLOS_STATUS.get(valor, OPCIONAL) if isinstance(valor, str) else OPCIONAL
+
+
+class StatusTable:
+    """
+    Tabela compilada de status canal × campo.
+    
+    Cada canal ocupa uma linha ``bytes`` com um código de status por campo,
+    na mesma ordem de ``campos``. As consultas são feitas por índice, sem
+    nenhuma operação de pandas.
+    """
+    
+    __slots__ = ('campos', 'campo_index', 'canais', 'canal_index', 'matrix')
+    
+    def __init__(
+        self, campos: Tuple[str, ...], canais: Tuple[str, ...], matrix: Tuple[Union[bytes, memoryview], ...]
+    ):
+        if len(matrix) != len(canais):
+            raise ValueError("Matriz de status incompatível com a lista de canais")
+        if any(len(linha) != len(campos) for linha in matrix):
+            raise ValueError("Matriz de status incompatível com a lista de campos")
+        
+        self.campos = campos
+        self.canais = canais
+        self.matrix = matrix
+        
+        # Em caso de campos repetidos prevalece a primeira linha da planilha
+        self.campo_index: Dict[str, int] = {}
+        for i, campo in enumerate(campos):
+            self.campo_index.setdefault(campo, i)
+        self.canal_index: Dict[str, int] = {canal: i for i, canal in enumerate(canais)}
+    
+    @classmethod
+    def from_columns(cls, campos: Iterable[str], colunas: Mapping[str, Sequence]) -> "StatusTable":
+        """
+        Compila a tabela a partir das colunas da planilha de campos.
+        
+        Args:
+            campos: Campos normalizados, na ordem das linhas
+            colunas: Canal -> valores das células ('✓', '✗', ...) na mesma ordem
+        
+        Returns:
+            StatusTable compilada
+        """
+        canais = tuple(sys.intern(str(canal)) for canal in colunas)
+        matrix = tuple(
+            bytes(codificar_status(v) for v in valores)
+            for valores in colunas.values()
+        )
+        return cls(tuple(str(c) for c in campos), canais, matrix)
+    
+    @classmethod
+    def from_dataframe(cls, df_campos: "pd.DataFrame") -> "StatusTable":
+        """
+        Compila a tabela a partir da planilha de campos normalizada.
+        
+        Args:
+            df_campos: DataFrame com 'CAMPO_NORMALIZADO' e uma coluna por canal
+        
+        Returns:
+            StatusTable compilada
+        """
+        return cls.from_columns(
+            df_campos['CAMPO_NORMALIZADO'].tolist(),
+            {c: df_campos[c].tolist() for c in df_campos.columns if c not in COLUNAS_NAO_CANAL}
+        )
+    
+    def get_status(self, canal: str, campo_norm: str) -> Optional[str]:
+        """
+        Obtém o status de um campo para um canal.
+        
+        Args:
+            canal: Canal já mapeado
+            campo_norm: Campo normalizado
+        
+        Returns:
+            'obrigatorio' | 'opcional' | 'branco', ou None se canal ou campo não existirem
+        """
+        col = self.canal_index.get(canal)
+        row = self.campo_index.get(campo_norm)
+        if col is None or row is None:
+            return None
+        return STATUS_NOMES[self.matrix[col][row]]
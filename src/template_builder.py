@@ -0,0 +1,218 @@
+"""
+Modelo de planilha de vendas gerado por canal.
+
+Em vez do modelo estático único, cada canal recebe uma planilha com as
+colunas obrigatórias primeiro, depois as opcionais e, por último, as que
+devem ficar em branco (em cinza). Os cabeçalhos usam os nomes das colunas
+do modelo original (os mesmos aceitos no upload) e mantêm os comentários de
+formato.
+
+A planilha é gravada com o openpyxl em modo write-only e mantida em memória
+por canal e versão dos dados: só existem alguns canais, então downloads
+repetidos não geram o arquivo de novo.
+"""
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+from config import Config
+from .data_loader import DataLoader
+from .report_export import limpar_exportacoes
+from .status_table import BRANCO, OBRIGATORIO, OPCIONAL
+from .utils import ValidationError
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Ordem das colunas no modelo
+ORDEM_STATUS = (OBRIGATORIO, OPCIONAL, BRANCO)
+
+# Aparência dos cabeçalhos por status
+_COR_CABECALHO = {
+    OBRIGATORIO: "A50034",  # Vermelho LG
+    OPCIONAL: "4B5563",
+    BRANCO: "D1D5DB",
+}
+_COR_TEXTO = {
+    OBRIGATORIO: "FFFFFF",
+    OPCIONAL: "FFFFFF",
+    BRANCO: "6B7280",
+}
+
+_AVISO_BRANCO = "Deve ficar em branco para o canal {canal}."
+
+
+class TemplateBuilder:
+    """Gera e mantém em cache os modelos de planilha por canal"""
+    
+    def __init__(self, data_loader: DataLoader):
+        self.data_loader = data_loader
+        self._cache: Dict[Tuple[str, str], Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+    
+    def resolver_canal(self, canal: str = "", rede: str = "") -> str:
+        """
+        Determina o canal do modelo a partir do canal ou da rede informada.
+        
+        Args:
+            canal: Nome do canal (aceita também os nomes originais da planilha de redes)
+            rede: Nome da rede, usado quando o canal não é informado
+        
+        Returns:
+            Canal existente na tabela de campos
+        
+        Raises:
+            ValidationError: Se o canal ou a rede não existirem
+        """
+        dados = self.data_loader.require_data()
+        if not canal and rede:
+            canal = dados.get_canal(rede.strip())
+            if not canal:
+                raise ValidationError(f"Canal não encontrado para a rede {rede}")
+        
+        canal = canal.strip().upper()
+        canal = Config.MAPEAMENTO_CANAIS.get(canal, canal)
+        if canal not in dados.status_table.canal_index:
+            raise ValidationError(f"Canal '{canal}' não existe na planilha de campos")
+        return canal
+    
+    def gerar(self, canal: str) -> Tuple[bytes, str]:
+        """
+        Obtém o modelo do canal, gerando-o apenas na primeira vez por versão dos dados.
+        
+        Args:
+            canal: Canal já resolvido (ver resolver_canal)
+        
+        Returns:
+            Tupla (conteúdo .xlsx, ETag)
+        """
+        dados = self.data_loader.require_data()
+        chave = (dados.versao, canal)
+        
+        with self._lock:
+            item = self._cache.get(chave)
+            if item is not None:
+                return item
+        
+        conteudo = self._montar(dados, canal)
+        etag = 'W/"' + hashlib.sha256(f"{dados.versao}:{canal}".encode()).hexdigest()[:32] + '"'
+        
+        with self._lock:
+            # Nova versão dos dados: modelos antigos não servem mais
+            if any(v != dados.versao for v, _ in self._cache):
+                self._cache.clear()
+            self._cache[chave] = (conteudo, etag)
+        
+        logger.info("Modelo gerado para o canal %s (%s bytes)", canal, len(conteudo))
+        return conteudo, etag
+    
+    def salvar(self, canal: str) -> Path:
+        """
+        Grava o modelo do canal em Config.EXPORT_DIR (para downloads pela interface).
+        
+        Os modelos ficam em um diretório por versão dos dados, apagado junto
+        com as exportações após Config.EXPORT_TTL_S sem uso.
+        
+        Args:
+            canal: Canal já resolvido (ver resolver_canal)
+        
+        Returns:
+            Caminho do arquivo, reaproveitado enquanto a versão dos dados não mudar
+        """
+        versao = (self.data_loader.require_data().versao or 'atual')[:12]
+        destino = Config.EXPORT_DIR / f"modelos_{versao}" / self.nome_arquivo(canal)
+        try:
+            # Reaproveitado: a validade do diretório conta a partir do último uso
+            os.utime(destino.parent)
+            if destino.exists():
+                return destino
+        except FileNotFoundError:
+            pass
+        
+        conteudo, _ = self.gerar(canal)
+        limpar_exportacoes(Config.EXPORT_DIR)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        # Temporário único: downloads simultâneos do mesmo modelo não se atropelam
+        fd, nome_tmp = tempfile.mkstemp(dir=destino.parent, prefix=f"{destino.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(conteudo)
+            os.replace(nome_tmp, destino)
+        finally:
+            if os.path.exists(nome_tmp):
+                os.unlink(nome_tmp)
+        return destino
+    
+    @staticmethod
+    def nome_arquivo(canal: str) -> str:
+        """Nome do arquivo para download"""
+        return f"Modelo_Arquivo_Vendas_{canal.replace(' ', '_')}.xlsx"
+    
+    @staticmethod
+    def _colunas_modelo(dados) -> Dict[str, str]:
+        """
+        Mapeia cada campo normalizado da tabela para o cabeçalho do modelo original.
+        
+        As chaves dos comentários são os cabeçalhos do modelo; campos com nome
+        diferente na tabela (ex.: data -> data_venda) são resolvidos por
+        Config.SINONIMOS_COMENTARIOS. Sem correspondência, vale o próprio campo.
+        """
+        originais: Dict[str, str] = {}
+        for chave in dados.comentarios:
+            originais.setdefault(chave.replace("__", "_"), chave)
+            originais.setdefault(chave, chave)
+        
+        colunas = {}
+        for campo in dados.status_table.campos:
+            destino = Config.SINONIMOS_COMENTARIOS.get(campo, campo)
+            colunas[campo] = originais.get(campo) or originais.get(destino) or campo
+        return colunas
+    
+    @classmethod
+    def _montar(cls, dados, canal: str) -> bytes:
+        """Grava a planilha do canal em memória (openpyxl write-only)"""
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.comments import Comment
+        from openpyxl.styles import Font, PatternFill
+        from openpyxl.utils import get_column_letter
+        
+        tabela = dados.status_table
+        linha_status = tabela.matrix[tabela.canal_index[canal]]
+        nomes = cls._colunas_modelo(dados)
+        colunas = sorted(
+            tabela.campo_index.items(),
+            key=lambda item: ORDEM_STATUS.index(linha_status[item[1]])
+        )
+        
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title="Vendas")
+        ws.freeze_panes = "A2"
+        
+        cabecalho = []
+        for n, (campo, i) in enumerate(colunas, start=1):
+            status = linha_status[i]
+            nome = nomes[campo]
+            cell = WriteOnlyCell(ws, value=nome)
+            cell.font = Font(bold=True, color=_COR_TEXTO[status])
+            cell.fill = PatternFill("solid", fgColor=_COR_CABECALHO[status])
+            
+            texto = dados.get_formato(campo)
+            if status == BRANCO:
+                texto = "\n".join(filter(None, [_AVISO_BRANCO.format(canal=canal), texto]))
+            if texto:
+                cell.comment = Comment(texto, "Clube LG")
+            
+            ws.column_dimensions[get_column_letter(n)].width = max(14, len(nome) + 4)
+            cabecalho.append(cell)
+        
+        ws.append(cabecalho)
+        
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
+
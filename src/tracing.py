@@ -0,0 +1,235 @@
+"""
+Tracing das consultas em spans, gravado em arquivo local.
+
+Um trace começa em ``trace()`` (ex.: em responder_interface) e cada etapa
+instrumentada com ``span()`` registra início e duração relativos a ele. Ao
+final, traces sorteados (Config.TRACE_SAMPLE_RATE) e mais lentos que
+Config.TRACE_LIMIAR_MS são gravados como uma linha JSON em
+Config.TRACE_DIR/traces.jsonl. A gravação é feita por uma thread dedicada:
+quem encerra o trace (inclusive handlers async no event loop) só enfileira.
+
+Com o tracing desligado, ou fora de um trace, ``span()`` devolve um
+gerenciador de contexto vazio compartilhado: o custo é uma leitura de
+ContextVar.
+"""
+import atexit
+import json
+import queue
+import random
+import threading
+import time
+from contextvars import ContextVar, Token
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_trace_atual: ContextVar[Optional["Trace"]] = ContextVar("lg_ai_trace", default=None)
+
+# Traces encerrados aguardando a thread de gravação (ou marcadores de flush)
+_fila: "queue.SimpleQueue[Union[Trace, threading.Event]]" = queue.SimpleQueue()
+_gravador: Optional[threading.Thread] = None
+_gravador_lock = threading.Lock()
+
+
+class _Nulo:
+    """Gerenciador de contexto vazio usado quando não há trace ativo"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+_NULO = _Nulo()
+
+
+class Trace:
+    """Spans de uma consulta, com tempos relativos ao início do trace"""
+    
+    __slots__ = ('nome', 'atributos', 'inicio', 'timestamp', 'spans', 'nivel', 'duracao', 'erro', '_token')
+    
+    def __init__(self, nome: str, atributos: Dict[str, Any]):
+        self.nome = nome
+        self.atributos = atributos
+        self.timestamp = datetime.now()
+        self.inicio = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.nivel = 0
+        self.duracao = 0.0
+        self.erro: Optional[str] = None
+        self._token: Optional[Token] = None
+    
+    def __enter__(self) -> "Trace":
+        self._token = _trace_atual.set(self)
+        return self
+    
+    def __exit__(self, tipo, valor, tb) -> None:
+        self.duracao = time.perf_counter() - self.inicio
+        if self._token is not None:
+            _trace_atual.reset(self._token)
+        if tipo is not None:
+            self.erro = tipo.__name__
+        if self.duracao * 1000 >= Config.TRACE_LIMIAR_MS:
+            gravar(self)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'nome': self.nome,
+            'timestamp': self.timestamp.isoformat(),
+            'duracao_ms': round(self.duracao * 1000, 3),
+            'atributos': self.atributos,
+            'erro': self.erro,
+            'spans': self.spans,
+        }
+
+
+class _Span:
+    """Etapa de um trace; registrada ao sair do bloco"""
+    
+    __slots__ = ('trace', 'nome', 'inicio', 'nivel')
+    
+    def __init__(self, trace: Trace, nome: str):
+        self.trace = trace
+        self.nome = nome
+    
+    def __enter__(self) -> "_Span":
+        self.nivel = self.trace.nivel
+        self.trace.nivel += 1
+        self.inicio = time.perf_counter()
+        return self
+    
+    def __exit__(self, tipo, valor, tb) -> None:
+        fim = time.perf_counter()
+        self.trace.nivel -= 1
+        span = {
+            'nome': self.nome,
+            'nivel': self.nivel,
+            'inicio_ms': round((self.inicio - self.trace.inicio) * 1000, 3),
+            'duracao_ms': round((fim - self.inicio) * 1000, 3),
+        }
+        if tipo is not None:
+            span['erro'] = tipo.__name__
+        self.trace.spans.append(span)
+
+
+def trace(nome: str, **atributos: Any):
+    """
+    Inicia um trace, se o tracing estiver ligado e a consulta for sorteada.
+    
+    Dentro de um trace já ativo não inicia outro: os spans continuam no trace
+    externo.
+    
+    Args:
+        nome: Nome da operação (ex.: 'responder_interface')
+        **atributos: Dados da consulta gravados junto (ex.: rede e campo)
+    
+    Returns:
+        Gerenciador de contexto do trace (vazio quando não rastreado)
+    """
+    if (
+        not Config.TRACE_ENABLED
+        or _trace_atual.get() is not None
+        or random.random() >= Config.TRACE_SAMPLE_RATE
+    ):
+        return _NULO
+    return Trace(nome, atributos)
+
+
+def span(nome: str):
+    """
+    Mede uma etapa dentro do trace atual.
+    
+    Args:
+        nome: Nome da etapa (ex.: 'validator.busca')
+    
+    Returns:
+        Gerenciador de contexto do span (vazio fora de um trace)
+    """
+    atual = _trace_atual.get()
+    if atual is None:
+        return _NULO
+    return _Span(atual, nome)
+
+
+def arquivo_traces() -> Path:
+    """Arquivo JSONL onde os traces são gravados"""
+    return Config.TRACE_DIR / "traces.jsonl"
+
+
+def gravar(trace: Trace) -> None:
+    """
+    Enfileira o trace para a thread de gravação (não faz I/O na chamada).
+    
+    Args:
+        trace: Trace encerrado
+    """
+    _iniciar_gravador()
+    _fila.put(trace)
+
+
+def flush(timeout: Optional[float] = None) -> bool:
+    """
+    Aguarda a gravação dos traces já enfileirados.
+    
+    Args:
+        timeout: Tempo máximo de espera em segundos (None = sem limite)
+    
+    Returns:
+        True se a fila foi gravada dentro do prazo
+    """
+    if _gravador is None or not _gravador.is_alive():
+        return True
+    gravado = threading.Event()
+    _fila.put(gravado)
+    return gravado.wait(timeout)
+
+
+def _iniciar_gravador() -> None:
+    """Inicia a thread de gravação no primeiro trace gravado"""
+    global _gravador
+    if _gravador is not None and _gravador.is_alive():
+        return
+    with _gravador_lock:
+        if _gravador is None or not _gravador.is_alive():
+            primeira = _gravador is None
+            _gravador = threading.Thread(target=_loop_gravador, name="lg-ai-traces", daemon=True)
+            _gravador.start()
+            if primeira:
+                atexit.register(flush, 5.0)
+
+
+def _loop_gravador() -> None:
+    while True:
+        # Tudo o que já estiver na fila é gravado com uma única abertura do arquivo
+        lote = [_fila.get()]
+        while True:
+            try:
+                lote.append(_fila.get_nowait())
+            except queue.Empty:
+                break
+        
+        traces = [item for item in lote if isinstance(item, Trace)]
+        if traces:
+            _gravar_lote(traces)
+        for item in lote:
+            if isinstance(item, threading.Event):
+                item.set()
+
+
+def _gravar_lote(traces: List[Trace]) -> None:
+    """Acrescenta os traces ao arquivo de traces"""
+    try:
+        linhas = "".join(json.dumps(t.to_dict(), ensure_ascii=False) + "\n" for t in traces)
+        Config.TRACE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(arquivo_traces(), "a", encoding="utf-8") as f:
+            f.write(linhas)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("Erro ao gravar %s trace(s): %s", len(traces), e)
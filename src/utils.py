@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 
 class LGAIException(Exception):
@@ -17,9 +17,17 @@ class InvalidDataError(LGAIException):
     pass
 
 
+class DataNotLoadedError(LGAIException):
+    """Erro quando os dados das planilhas ainda não foram carregados"""
+    pass
+
+
 class ValidationError(LGAIException):
     """Erro de validação de dados"""
-    pass
+    
+    def __init__(self, message: str = "", sugestoes: Optional[List[str]] = None):
+        super().__init__(message)
+        self.sugestoes = sugestoes or []
 
 
 def validate_file_exists(filepath: Path) -> None:
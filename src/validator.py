@@ -1,19 +1,29 @@
-from typing import Dict, Optional
-from config import Config
-from .data_loader import DataLoader
+import time
+from typing import Any, Dict, List, Optional
+from .data_loader import DataLoader, LoadedData
+from .status_table import STATUS_NOMES
 from .utils import normalize_campo, ValidationError, sanitize_input
 from .logger import setup_logger
+from .metrics import VALIDACAO
+from .tracing import span
 
 logger = setup_logger(__name__)
 
 
+def _com_sugestoes(mensagem: str, sugestoes: List[str]) -> str:
+    """Acrescenta "você quis dizer" à mensagem de erro quando houver sugestões"""
+    if not sugestoes:
+        return mensagem
+    return f"{mensagem}. Você quis dizer: {', '.join(sugestoes)}?"
+
+
 class Validator:
     """Valida campos de acordo com rede e canal"""
     
     def __init__(self, data_loader: DataLoader):
         self.data_loader = data_loader
     
-    def validar_campo(self, rede: str, campo: str) -> Dict[str, any]:
+    def validar_campo(self, rede: str, campo: str) -> Dict[str, Any]:
         """
         Valida campo de acordo com rede e canal.
         
@@ -35,59 +45,68 @@ class Validator:
         Raises:
             ValidationError: Se rede ou campo inválidos
         """
+        inicio = time.perf_counter()
+        try:
+            resultado = self._validar_campo(rede, campo)
+        except ValidationError:
+            VALIDACAO.observe(time.perf_counter() - inicio, 'error', '')
+            raise
+        VALIDACAO.observe(time.perf_counter() - inicio, resultado['status'], resultado['canal'])
+        return resultado
+    
+    def _validar_campo(self, rede: str, campo: str) -> Dict[str, Any]:
+        """Validação em si (validar_campo acrescenta as métricas de latência)"""
         # Sanitização
         try:
-            rede = sanitize_input(rede, max_length=100)
-            campo = sanitize_input(campo, max_length=100)
+            with span("validator.sanitize"):
+                rede = sanitize_input(rede, max_length=100)
+                campo = sanitize_input(campo, max_length=100)
         except ValidationError as e:
-            logger.warning(f"Input inválido: {e}")
+            logger.warning("Input inválido: %s", e)
             raise
         
         if not rede or not campo:
             raise ValidationError("Rede e campo são obrigatórios")
         
-        logger.info(f"Validando campo '{campo}' para rede '{rede}'")
+        logger.info("Validando campo '%s' para rede '%s'", campo, rede)
         
         # Normalização
         campo_formatado = campo.strip().upper()
         campo_norm = normalize_campo(campo)
         
-        # Obter canal
-        canal = self.data_loader.get_canal_for_rede(rede.strip())
-        
-        if not canal:
-            raise ValidationError(f"Canal não encontrado para a rede {rede}")
-        
-        if canal not in self.data_loader.df_campos.columns:
-            raise ValidationError(f"Canal '{canal}' não existe na planilha de campos")
-        
-        # Buscar campo na tabela
-        linha = self.data_loader.df_campos[
-            self.data_loader.df_campos['CAMPO_NORMALIZADO'] == campo_norm
-        ]
+        # Versão dos dados usada durante toda a validação
+        dados = self.data_loader.require_data()
         
-        if linha.empty:
-            logger.warning(f"Campo '{campo}' não encontrado na tabela")
-            raise ValidationError(f"Campo '{campo_formatado}' não encontrado na tabela de obrigatoriedade")
+        # Obter canal e buscar campo na tabela
+        with span("validator.busca"):
+            canal = self.get_canal(rede, dados)
+            tabela = dados.status_table
+            col = tabela.canal_index[canal]
+            row = tabela.campo_index.get(campo_norm)
         
-        # Obter valor
-        valor = linha.iloc[0][canal]
+        if row is None:
+            logger.warning("Campo '%s' não encontrado na tabela", campo)
+            sugestoes = dados.busca_campos.suggest(campo)
+            raise ValidationError(
+                _com_sugestoes(f"Campo '{campo_formatado}' não encontrado na tabela de obrigatoriedade", sugestoes),
+                sugestoes
+            )
         
         # Determinar status
-        if valor == '✓':
-            status = 'obrigatorio'
+        status = STATUS_NOMES[tabela.matrix[col][row]]
+        
+        if status == 'obrigatorio':
             status_texto = f"O campo {campo_formatado} é OBRIGATÓRIO para a rede {rede} (Canal: {canal})."
-        elif valor == '✗':
-            status = 'branco'
+        elif status == 'branco':
             status_texto = f"O campo {campo_formatado} deve ficar em branco para a rede {rede} (Canal: {canal})."
         else:
-            status = 'opcional'
             status_texto = f"O campo {campo_formatado} é opcional para a rede {rede} (Canal: {canal})."
         
         # Buscar formato/comentário
-        formato = self._get_formato(campo_norm)
+        with span("validator.formato"):
+            formato = self._get_formato(campo_norm, dados)
         
-        logger.info(f"Validação concluída: {status}")
+        logger.info("Validação concluída: %s", status)
         
         return {
             'status': status,
@@ -98,27 +117,102 @@ class Validator:
             'formato': formato
         }
     
-    def _get_formato(self, campo_norm: str) -> Optional[str]:
+    def relatorio_rede(self, rede: str) -> Dict[str, Any]:
+        """
+        Status de todos os campos para uma rede, em uma única consulta.
+        
+        Lê apenas a linha do canal da rede na tabela de status, em vez de
+        uma chamada a validar_campo por campo.
+        
+        Args:
+            rede: Nome da rede
+        
+        Returns:
+            Dicionário com o relatório:
+            {
+                'rede': str,
+                'canal': str,
+                'versao': str,
+                'campos': [{'campo': str, 'status': str, 'formato': str | None}, ...],
+                'totais': {'obrigatorio': int, 'opcional': int, 'branco': int}
+            }
+        
+        Raises:
+            ValidationError: Se a rede for inválida
+        """
+        rede = sanitize_input(rede, max_length=100)
+        if not rede:
+            raise ValidationError("Rede é obrigatória")
+        
+        dados = self.data_loader.require_data()
+        canal = self.get_canal(rede, dados)
+        
+        tabela = dados.status_table
+        linha_status = tabela.matrix[tabela.canal_index[canal]]
+        
+        # campo_index mantém a ordem da planilha e a primeira linha de campos repetidos
+        campos: List[Dict[str, Any]] = [
+            {
+                'campo': campo.upper(),
+                'status': STATUS_NOMES[linha_status[i]],
+                'formato': dados.get_formato(campo),
+            }
+            for campo, i in tabela.campo_index.items()
+        ]
+        
+        totais = {status: 0 for status in STATUS_NOMES}
+        for item in campos:
+            totais[item['status']] += 1
+        
+        logger.info("Relatório de campos gerado para rede '%s' (%s campos)", rede, len(campos))
+        
+        return {
+            'rede': rede,
+            'canal': canal,
+            'versao': dados.versao,
+            'campos': campos,
+            'totais': totais
+        }
+    
+    def get_canal(self, rede: str, dados: Optional[LoadedData] = None) -> str:
+        """
+        Obtém o canal de uma rede, garantindo que exista na tabela de campos.
+        
+        Args:
+            rede: Nome da rede
+            dados: Versão dos dados a consultar (padrão: a atual)
+        
+        Returns:
+            Nome do canal
+        
+        Raises:
+            ValidationError: Se a rede não tiver canal ou o canal não existir na tabela
+        """
+        dados = dados or self.data_loader.require_data()
+        canal = dados.get_canal(rede.strip())
+        
+        if not canal:
+            sugestoes = dados.busca_redes.suggest(rede)
+            raise ValidationError(
+                _com_sugestoes(f"Canal não encontrado para a rede {rede}", sugestoes),
+                sugestoes
+            )
+        
+        if canal not in dados.status_table.canal_index:
+            raise ValidationError(f"Canal '{canal}' não existe na planilha de campos")
+        
+        return canal
+    
+    def _get_formato(self, campo_norm: str, dados: Optional[LoadedData] = None) -> Optional[str]:
         """
         Obtém formato/comentário para um campo.
         
         Args:
             campo_norm: Campo normalizado
+            dados: Versão dos dados a consultar (padrão: a atual)
         
         Returns:
             Texto do comentário ou None
         """
-        # Aplicar sinônimos
-        campo_para_comentario = Config.SINONIMOS_COMENTARIOS.get(
-            campo_norm, 
-            campo_norm
-        )
-        
-        # Buscar comentário
-        campo_real = next(
-            (c for c in self.data_loader.comentarios.keys()
-             if c.replace("__", "_") == campo_para_comentario),
-            campo_para_comentario
-        )
-        
-        return self.data_loader.comentarios.get(campo_real)
+        # Sinônimos e chaves com "__" já resolvidos no índice montado na carga
+        return (dados or self.data_loader.require_data()).get_formato(campo_norm)
@@ -1,14 +1,16 @@
 import pytest
-import pandas as pd
 from pathlib import Path
+import shutil
 import sys
 
 # Adiciona src ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.data_loader import DataLoader
+from config import Config
+from src.data_loader import DataLoader, LoadedData
 from src.validator import Validator
 from src.formatter import ResponseFormatter
+from src.status_table import StatusTable
 
 
 @pytest.fixture
@@ -16,32 +18,31 @@ def mock_data_loader():
     """Cria DataLoader com dados mockados"""
     loader = DataLoader()
     
-    # Mock df_redes
-    loader.df_redes = pd.DataFrame({
-        'Rede': ['MAGAZINE LUIZA', 'CASAS BAHIA'],
-        'Canal': ['VAREJO', 'VAREJO']
-    })
-    
-    # Mock df_campos
-    loader.df_campos = pd.DataFrame({
-        'CAMPO': ['NUM_CUPOM_NOTA', 'DATA_VENDA', 'OBSERVACAO'],
-        'CAMPO_NORMALIZADO': ['num_cupom_nota', 'data_venda', 'observacao'],
-        'VAREJO': ['✓', '✓', '']
-    })
+    # Mock tabela de campos (campos normalizados e uma coluna por canal)
+    status_table = StatusTable.from_columns(
+        ['num_cupom_nota', 'data_venda', 'observacao'],
+        {'VAREJO': ['✓', '✓', '']}
+    )
     
     # Mock comentarios
-    loader.comentarios = {
+    comentarios = {
         'num_cupom_nota': 'Número do cupom fiscal',
         'data_venda': 'Data no formato DD/MM/AAAA'
     }
     
     # Mock mapa
-    loader.mapa_rede_canal = {
+    mapa_rede_canal = {
         'MAGAZINE LUIZA': 'VAREJO',
         'CASAS BAHIA': 'VAREJO'
     }
     
-    loader._loaded = True
+    # Publica os dados mockados
+    loader.set_data(LoadedData(
+        comentarios=comentarios,
+        mapa_rede_canal=mapa_rede_canal,
+        status_table=status_table,
+        versao='mock'
+    ))
     
     return loader
 
@@ -56,3 +57,15 @@ def validator(mock_data_loader):
 def formatter():
     """Cria ResponseFormatter"""
     return ResponseFormatter()
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Cópia das planilhas reais em diretório temporário"""
+    for attr in ('REDES_FILE', 'CAMPOS_FILE', 'MODELO_FILE', 'MANUAL_FILE'):
+        origem = getattr(Config, attr)
+        destino = tmp_path / origem.name
+        shutil.copy2(origem, destino)
+        monkeypatch.setattr(Config, attr, destino)
+    monkeypatch.setattr(Config, 'SNAPSHOT_FILE', tmp_path / ".snapshot" / "dados.pkl")
+    return tmp_path
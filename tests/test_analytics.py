@@ -0,0 +1,278 @@
+import json
+import threading
+import time
+from datetime import date, timedelta
+import pytest
+from config import Config
+from src.analytics import Analytics
+
+
+@pytest.fixture
+def analytics(tmp_path):
+    a = Analytics(log_file=tmp_path / "analytics.jsonl", batch_size=10, flush_interval=60)
+    yield a
+    a.close()
+
+
+def _linhas(path):
+    if not path.exists():
+        return []
+    return [json.loads(l) for l in path.read_text(encoding='utf-8').splitlines()]
+
+
+class TestAnalytics:
+    def test_log_query_nao_grava_na_requisicao(self, analytics):
+        analytics.log_query('MAGAZINE LUIZA', 'DATA_VENDA', 'obrigatorio')
+        assert _linhas(analytics.log_file) == []
+        
+        assert analytics.flush(timeout=5)
+        eventos = _linhas(analytics.log_file)
+        assert len(eventos) == 1
+        assert eventos[0]['rede'] == 'MAGAZINE LUIZA'
+    
+    def test_grava_ao_completar_lote(self, analytics):
+        escrito = threading.Event()
+        original = analytics._write_batch
+        
+        def _write_batch(batch):
+            original(batch)
+            if batch:
+                escrito.set()
+        analytics._write_batch = _write_batch
+        
+        for i in range(10):
+            analytics.log_query('REDE', f'CAMPO_{i}', 'opcional')
+        
+        assert escrito.wait(timeout=5)
+        assert len(_linhas(analytics.log_file)) == 10
+    
+    def test_grava_por_tempo(self, tmp_path):
+        a = Analytics(log_file=tmp_path / "a.jsonl", batch_size=1000, flush_interval=0.05)
+        try:
+            a.log_query('REDE', 'CAMPO', 'opcional')
+            for _ in range(100):
+                if _linhas(a.log_file):
+                    break
+                threading.Event().wait(0.05)
+            assert len(_linhas(a.log_file)) == 1
+        finally:
+            a.close()
+    
+    def test_close_grava_pendentes(self, analytics):
+        for i in range(3):
+            analytics.log_query('REDE', 'CAMPO', 'branco')
+        analytics.close()
+        assert len(_linhas(analytics.log_file)) == 3
+    
+    def test_fila_cheia_descarta(self, tmp_path):
+        liberar = threading.Event()
+        a = Analytics(log_file=tmp_path / "a.jsonl", batch_size=1, queue_size=1)
+        a._write_batch = lambda batch: liberar.wait(5)
+        try:
+            for _ in range(5):
+                a.log_query('REDE', 'CAMPO', 'opcional')
+            assert a.dropped >= 1
+        finally:
+            liberar.set()
+            a.close()
+    
+    def test_sem_bloqueio_descarta_na_hora(self, tmp_path, monkeypatch):
+        """bloquear=False (event loop) não espera vaga na fila"""
+        monkeypatch.setattr(Config, "ANALYTICS_PUT_TIMEOUT_S", 5.0)
+        liberar = threading.Event()
+        a = Analytics(log_file=tmp_path / "a.jsonl", batch_size=1, queue_size=1)
+        a._write_batch = lambda batch: liberar.wait(5)
+        try:
+            inicio = time.monotonic()
+            for _ in range(5):
+                a.log_query('REDE', 'CAMPO', 'opcional', bloquear=False)
+            assert time.monotonic() - inicio < 1
+            assert a.dropped >= 1
+        finally:
+            liberar.set()
+            a.close()
+    
+    def test_descartes_contados_entre_threads(self, tmp_path):
+        """Descartes simultâneos em várias threads não perdem incrementos"""
+        liberar = threading.Event()
+        a = Analytics(log_file=tmp_path / "a.jsonl", batch_size=1, queue_size=1)
+        a._write_batch = lambda batch: liberar.wait(5)
+        
+        def registrar():
+            for _ in range(500):
+                a.log_query('REDE', 'CAMPO', 'opcional', bloquear=False)
+        
+        try:
+            threads = [threading.Thread(target=registrar) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert a.dropped + a.get_stats()['total_queries'] == 8 * 500
+        finally:
+            liberar.set()
+            a.close()
+    
+    def test_flush_com_gravacao_travada(self, tmp_path):
+        """Com a fila cheia e a gravação parada, flush desiste no prazo em vez de travar"""
+        liberar = threading.Event()
+        a = Analytics(log_file=tmp_path / "a.jsonl", batch_size=1, queue_size=1)
+        a._write_batch = lambda batch: liberar.wait(5)
+        try:
+            for _ in range(3):
+                a.log_query('REDE', 'CAMPO', 'opcional', bloquear=False)
+            inicio = time.monotonic()
+            assert a.flush(timeout=0.2) is False
+            assert time.monotonic() - inicio < 2
+        finally:
+            liberar.set()
+            a.close()
+    
+    def test_get_stats(self, analytics):
+        analytics.log_query('MAGAZINE LUIZA', 'DATA_VENDA', 'obrigatorio')
+        analytics.log_query('MAGAZINE LUIZA', 'OBS', 'opcional')
+        stats = analytics.get_stats()
+        assert stats['total_queries'] == 2
+        assert stats['top_redes'] == [('MAGAZINE LUIZA', 2)]
+    
+    def test_get_stats_sem_esperar_gravacao(self, analytics):
+        analytics.log_query('REDE', 'CAMPO', 'branco')
+        stats = analytics.get_stats()
+        assert stats['total_queries'] == 1
+        assert stats['por_resultado'] == {'branco': 1}
+
+
+class TestCheckpoint:
+    def test_recupera_do_checkpoint(self, tmp_path):
+        log_file = tmp_path / "analytics.jsonl"
+        a = Analytics(log_file=log_file)
+        for _ in range(3):
+            a.log_query('REDE A', 'CAMPO', 'opcional')
+        a.close()
+        assert a.checkpoint_file.exists()
+        
+        b = Analytics(log_file=log_file)
+        try:
+            assert b.get_stats()['total_queries'] == 3
+            assert b.get_stats()['top_redes'] == [('REDE A', 3)]
+        finally:
+            b.close()
+    
+    def test_reprocessa_apenas_o_final(self, tmp_path, monkeypatch):
+        log_file = tmp_path / "analytics.jsonl"
+        a = Analytics(log_file=log_file)
+        a.log_query('REDE A', 'CAMPO', 'opcional')
+        a.close()
+        
+        # Eventos gravados depois do checkpoint (ex.: queda antes do próximo)
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'timestamp': 'x', 'rede': 'REDE B', 'campo': 'C', 'resultado': 'branco'}) + '\n')
+        
+        # Conteúdo anterior ao checkpoint não é relido
+        checkpoint = json.loads(a.checkpoint_file.read_text())
+        conteudo = log_file.read_bytes()
+        log_file.write_bytes(b'\0' * checkpoint['offset'] + conteudo[checkpoint['offset']:])
+        
+        b = Analytics(log_file=log_file)
+        try:
+            stats = b.get_stats()
+            assert stats['total_queries'] == 2
+            assert stats['por_resultado'] == {'opcional': 1, 'branco': 1}
+        finally:
+            b.close()
+    
+    def test_sem_checkpoint_recalcula_tudo(self, tmp_path):
+        log_file = tmp_path / "analytics.jsonl"
+        a = Analytics(log_file=log_file)
+        a.log_query('REDE A', 'CAMPO', 'opcional')
+        a.close()
+        a.checkpoint_file.unlink()
+        
+        b = Analytics(log_file=log_file)
+        try:
+            assert b.get_stats()['total_queries'] == 1
+        finally:
+            b.close()
+
+
+class TestRotacao:
+    def test_rotaciona_por_tamanho(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, 'ANALYTICS_MAX_BYTES', 300)
+        a = Analytics(log_file=tmp_path / "analytics.jsonl", batch_size=1)
+        try:
+            for i in range(10):
+                a.log_query('REDE', f'CAMPO_{i}', 'opcional')
+                a.flush(timeout=5)
+            segmentos = a.list_segments()
+            assert segmentos
+            assert all(s.name.endswith('.jsonl.gz') for s in segmentos)
+            assert a.log_file.stat().st_size <= 300
+            assert sum(1 for _ in a.iter_events()) == 10
+        finally:
+            a.close()
+    
+    def test_rotaciona_por_dia(self, tmp_path):
+        a = Analytics(log_file=tmp_path / "analytics.jsonl")
+        try:
+            a.log_query('REDE', 'CAMPO', 'opcional')
+            a.flush(timeout=5)
+            a._segment_day = date.today() - timedelta(days=1)
+            a.log_query('REDE', 'CAMPO', 'opcional')
+            a.flush(timeout=5)
+            assert len(a.list_segments()) == 1
+            assert len(_linhas(a.log_file)) == 1
+        finally:
+            a.close()
+    
+    def test_retencao_por_quantidade(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, 'ANALYTICS_MAX_SEGMENTS', 2)
+        a = Analytics(log_file=tmp_path / "analytics.jsonl")
+        try:
+            for _ in range(4):
+                a.log_query('REDE', 'CAMPO', 'opcional')
+                a.flush(timeout=5)
+                a.rotate()
+            assert len(a.list_segments()) == 2
+        finally:
+            a.close()
+    
+    def test_stats_recalculadas_entre_segmentos(self, tmp_path):
+        a = Analytics(log_file=tmp_path / "analytics.jsonl")
+        try:
+            a.log_query('REDE A', 'CAMPO', 'opcional')
+            a.flush(timeout=5)
+            a.rotate()
+            a.log_query('REDE B', 'CAMPO', 'branco')
+            stats = a.get_stats(recalcular=True)
+            assert stats['total_queries'] == 2
+            assert stats == a.get_stats()
+        finally:
+            a.close()
+    
+    def test_sem_checkpoint_agrega_segmentos(self, tmp_path):
+        log_file = tmp_path / "analytics.jsonl"
+        a = Analytics(log_file=log_file)
+        a.log_query('REDE A', 'CAMPO', 'opcional')
+        a.flush(timeout=5)
+        a.rotate()
+        a.log_query('REDE A', 'CAMPO', 'opcional')
+        a.close()
+        a.checkpoint_file.unlink()
+        
+        b = Analytics(log_file=log_file)
+        try:
+            assert b.get_stats()['total_queries'] == 2
+        finally:
+            b.close()
+    
+    def test_zstd(self, tmp_path, monkeypatch):
+        pytest.importorskip('zstandard')
+        monkeypatch.setattr(Config, 'ANALYTICS_COMPRESSION', 'zstd')
+        a = Analytics(log_file=tmp_path / "analytics.jsonl")
+        try:
+            a.log_query('REDE', 'CAMPO', 'opcional')
+            a.flush(timeout=5)
+            assert a.rotate().name.endswith('.jsonl.zst')
+            assert [e['rede'] for e in a.iter_events()] == ['REDE']
+        finally:
+            a.close()
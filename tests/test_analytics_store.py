@@ -0,0 +1,177 @@
+import json
+import os
+from datetime import datetime, timedelta
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from config import Config
+from src import analytics_store
+from src.analytics import Analytics
+
+
+def _evento(timestamp, rede, campo, resultado, canal='VAREJO'):
+    return json.dumps({
+        'timestamp': timestamp.isoformat(), 'rede': rede, 'campo': campo,
+        'resultado': resultado, 'canal': canal
+    }) + '\n'
+
+
+@pytest.fixture
+def analytics(tmp_path, monkeypatch):
+    # Os testes usam datas fixas: a retenção não pode apagar as partições deles
+    monkeypatch.setattr(Config, 'ANALYTICS_RETENTION_DAYS', 36500)
+    a = Analytics(log_file=tmp_path / "analytics.jsonl")
+    yield a
+    a.close()
+
+
+@pytest.fixture
+def agora():
+    return datetime(2026, 10, 17, 15, 30)
+
+
+class TestColumnarStore:
+    def test_compacta_segmentos(self, analytics, agora):
+        with open(analytics.log_file, 'w', encoding='utf-8') as f:
+            f.write(_evento(agora, 'REDE A', 'DATA', 'obrigatorio'))
+            f.write(_evento(agora - timedelta(days=1), 'REDE A', 'OBS', 'opcional'))
+        analytics.rotate()
+        
+        assert analytics.compact() == 1
+        assert analytics.compact() == 0
+        particoes = sorted(p.name for p in analytics.store_dir.iterdir() if p.is_dir())
+        assert particoes == ['data=2026-10-16', 'data=2026-10-17']
+    
+    def test_query_combina_compactado_e_pendente(self, analytics, agora):
+        with open(analytics.log_file, 'w', encoding='utf-8') as f:
+            f.write(_evento(agora, 'REDE A', 'DATA', 'obrigatorio'))
+            f.write(_evento(agora, 'REDE A', 'DATA', 'obrigatorio'))
+            f.write(_evento(agora, 'REDE A', 'OBS', 'opcional'))
+        analytics.rotate()
+        analytics.compact()
+        # Ainda no log ativo, sem compactar
+        with open(analytics.log_file, 'w', encoding='utf-8') as f:
+            f.write(_evento(agora, 'REDE B', 'DATA', 'obrigatorio'))
+        
+        linhas = analytics.query(agora - timedelta(hours=1), agora + timedelta(hours=1), ['rede', 'campo'])
+        assert linhas[0] == {'rede': 'REDE A', 'campo': 'DATA', 'total': 2}
+        assert {'rede': 'REDE B', 'campo': 'DATA', 'total': 1} in linhas
+        assert len(linhas) == 3
+    
+    def test_intervalo_de_tempo(self, analytics, agora):
+        with open(analytics.log_file, 'w', encoding='utf-8') as f:
+            f.write(_evento(agora - timedelta(days=10), 'REDE A', 'DATA', 'obrigatorio'))
+            f.write(_evento(agora, 'REDE A', 'DATA', 'obrigatorio'))
+        analytics.rotate()
+        analytics.compact()
+        
+        linhas = analytics.query(agora - timedelta(days=7), agora + timedelta(seconds=1), [])
+        assert linhas == [{'total': 1}]
+    
+    def test_top_k_por_grupo(self, analytics, agora):
+        with open(analytics.log_file, 'w', encoding='utf-8') as f:
+            for campo, n in (('DATA', 3), ('OBS', 2), ('TIPO', 1)):
+                for _ in range(n):
+                    f.write(_evento(agora, 'REDE A', campo, 'opcional'))
+            f.write(_evento(agora, 'REDE B', 'TIPO', 'opcional'))
+        
+        linhas = analytics.query(agora - timedelta(hours=1), agora + timedelta(hours=1), ['rede', 'campo'], top_k=2)
+        assert [(l['rede'], l['campo']) for l in linhas] == [
+            ('REDE A', 'DATA'), ('REDE A', 'OBS'), ('REDE B', 'TIPO')
+        ]
+    
+    def test_status_por_canal_por_hora(self, analytics, agora):
+        with open(analytics.log_file, 'w', encoding='utf-8') as f:
+            f.write(_evento(agora, 'REDE A', 'DATA', 'obrigatorio', canal='IT'))
+            f.write(_evento(agora + timedelta(minutes=10), 'REDE A', 'OBS', 'obrigatorio', canal='IT'))
+            f.write(_evento(agora + timedelta(hours=1), 'REDE A', 'OBS', 'branco', canal='IT'))
+        analytics.rotate()
+        analytics.compact()
+        
+        linhas = analytics.status_por_canal_por_hora(agora - timedelta(hours=1), agora + timedelta(hours=2))
+        assert {'hora': datetime(2026, 10, 17, 15), 'canal': 'IT', 'resultado': 'obrigatorio', 'total': 2} in linhas
+        assert {'hora': datetime(2026, 10, 17, 16), 'canal': 'IT', 'resultado': 'branco', 'total': 1} in linhas
+    
+    def test_coluna_invalida(self, analytics, agora):
+        with pytest.raises(ValueError):
+            analytics.query(agora, agora, ['timestamp'])
+    
+    def test_segmento_comprimido_apos_compactar(self, analytics, agora, monkeypatch):
+        """Segmento compactado como .jsonl e comprimido depois não é contado duas vezes"""
+        with open(analytics.log_file, 'w', encoding='utf-8') as f:
+            f.write(_evento(agora, 'REDE A', 'DATA', 'obrigatorio'))
+        # Rotação sem compressão; a compressão acontece só depois da compactação
+        monkeypatch.setattr(Config, 'ANALYTICS_COMPRESSION', 'none')
+        segmento = analytics.rotate()
+        assert analytics.compact() == 1
+        
+        monkeypatch.setattr(Config, 'ANALYTICS_COMPRESSION', 'gzip')
+        analytics._compress_segment(segmento)
+        assert [s.suffix for s in analytics.list_segments()] == ['.gz']
+        
+        assert analytics.compact() == 0
+        linhas = analytics.query(agora - timedelta(hours=1), agora + timedelta(hours=1), [])
+        assert linhas == [{'total': 1}]
+    
+    def test_retencao_das_particoes(self, analytics, monkeypatch):
+        """Partições além de ANALYTICS_RETENTION_DAYS são removidas na compactação"""
+        monkeypatch.setattr(Config, 'ANALYTICS_RETENTION_DAYS', 30)
+        recente = datetime.now().replace(microsecond=0)
+        antigo = recente - timedelta(days=40)
+        with open(analytics.log_file, 'w', encoding='utf-8') as f:
+            f.write(_evento(antigo, 'REDE A', 'DATA', 'obrigatorio'))
+            f.write(_evento(recente, 'REDE A', 'DATA', 'obrigatorio'))
+        analytics.rotate()
+        analytics.compact()
+        
+        particoes = [p.name for p in analytics.store_dir.iterdir() if p.is_dir()]
+        assert particoes == [f"data={recente.date().isoformat()}"]
+    
+    def test_manifesto_sem_segmentos_apagados(self, analytics, agora):
+        """Segmentos removidos pela retenção do log saem do manifesto; os dados continuam no Parquet"""
+        with open(analytics.log_file, 'w', encoding='utf-8') as f:
+            f.write(_evento(agora, 'REDE A', 'DATA', 'obrigatorio'))
+        segmento = analytics.rotate()
+        analytics.compact()
+        assert analytics.store.compacted_segments() == [segmento.name[:-len('.gz')]]
+        
+        os.remove(segmento)
+        analytics.compact()
+        assert analytics.store.compacted_segments() == []
+        linhas = analytics.query(agora - timedelta(hours=1), agora + timedelta(hours=1), [])
+        assert linhas == [{'total': 1}]
+    
+    def test_rotacao_durante_compactacao(self, analytics, agora, monkeypatch):
+        """A conversão não segura o rotation_lock e segue lendo o segmento que a rotação comprimiu"""
+        monkeypatch.setattr(analytics_store, 'LOTE_COMPACTACAO', 1)
+        monkeypatch.setattr(Config, 'ANALYTICS_COMPRESSION', 'none')
+        with open(analytics.log_file, 'w', encoding='utf-8') as f:
+            f.write(_evento(agora, 'REDE A', 'DATA', 'obrigatorio'))
+            f.write(_evento(agora + timedelta(minutes=1), 'REDE A', 'OBS', 'opcional'))
+        analytics.rotate()
+        
+        write_dataset = analytics_store.ds.write_dataset
+        rotacoes = []
+        
+        def write_dataset_com_rotacao(*args, **kwargs):
+            # Após o primeiro lote: a thread de gravação consegue rotacionar
+            if not rotacoes:
+                monkeypatch.setattr(Config, 'ANALYTICS_COMPRESSION', 'gzip')
+                with open(analytics.log_file, 'w', encoding='utf-8') as f:
+                    f.write(_evento(agora + timedelta(minutes=2), 'REDE B', 'DATA', 'obrigatorio'))
+                assert analytics.rotation_lock.acquire(timeout=1)
+                try:
+                    rotacoes.append(analytics._rotate())
+                finally:
+                    analytics.rotation_lock.release()
+            return write_dataset(*args, **kwargs)
+        
+        monkeypatch.setattr(analytics_store.ds, 'write_dataset', write_dataset_com_rotacao)
+        assert analytics.compact() == 1
+        assert [s.suffix for s in analytics.list_segments()] == ['.gz', '.gz']
+        
+        intervalo = (agora - timedelta(hours=1), agora + timedelta(hours=1))
+        assert analytics.query(*intervalo, []) == [{'total': 3}]
+        assert analytics.compact() == 1
+        assert analytics.query(*intervalo, []) == [{'total': 3}]
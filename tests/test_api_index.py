@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from config import Config
+
+ROOT = Path(__file__).parent.parent
+
+# Executado em processo separado: mede a importação a frio, sem módulos já
+# carregados por outros testes
+SCRIPT = """
+import json, sys, time
+inicio = time.perf_counter()
+import api.index
+duracao = time.perf_counter() - inicio
+
+from fastapi.testclient import TestClient
+client = TestClient(api.index.app)
+status = {url: client.get(url).status_code for url in ('/sw.js', '/favicon.ico', '/app-manifest.json', '/metrics')}
+
+import src.services
+print(json.dumps({
+    'duracao': duracao,
+    'status': status,
+    'carregados': [m for m in ('gradio', 'pandas', 'openpyxl') if m in sys.modules],
+    'dados_carregados': src.services.is_loaded(),
+}))
+"""
+
+
+def _partida_a_frio():
+    resultado = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+    assert resultado.returncode == 0, resultado.stderr
+    return json.loads(resultado.stdout.strip().splitlines()[-1])
+
+
+class TestPartidaAFrio:
+    def test_importacao_leve(self):
+        """Importar api/index.py e servir rotas estáticas não carrega gradio, pandas, openpyxl nem os dados"""
+        medicao = _partida_a_frio()
+        assert medicao['carregados'] == []
+        assert medicao['dados_carregados'] is False
+        assert set(medicao['status'].values()) == {200}
+    
+    def test_orcamento_de_importacao(self):
+        """Importação dentro de Config.IMPORT_BUDGET_S (melhor de 3 medições)"""
+        duracao = min(_partida_a_frio()['duracao'] for _ in range(3))
+        assert duracao < Config.IMPORT_BUDGET_S, f"importação levou {duracao:.2f}s"
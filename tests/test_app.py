@@ -0,0 +1,105 @@
+import asyncio
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+import app
+from config import Config
+from src import metrics, tracing
+from src.services import Services
+
+
+@pytest.fixture
+def services(mock_data_loader, validator, formatter):
+    """Serviços com os dados mockados e analytics falso"""
+    return Services(
+        data_loader=mock_data_loader,
+        validator=validator,
+        file_validator=MagicMock(),
+        formatter=formatter,
+        analytics=MagicMock(),
+        template_builder=MagicMock()
+    )
+
+
+@pytest.fixture
+def servicos_carregados(services, monkeypatch):
+    """responder_interface recebe os serviços já criados"""
+    async def _get_services_async():
+        return services
+    monkeypatch.setattr(app, "get_services_async", _get_services_async)
+    return services
+
+
+class TestResponderInterface:
+    def test_consulta(self, servicos_carregados):
+        """Handler async responde no event loop e não bloqueia no analytics"""
+        html = asyncio.run(app.responder_interface("MAGAZINE LUIZA", "num_cupom_nota"))
+        assert "NUM_CUPOM_NOTA" in html
+        servicos_carregados.analytics.log_query.assert_called_once_with(
+            "MAGAZINE LUIZA", "num_cupom_nota", "obrigatorio", "VAREJO", bloquear=False
+        )
+    
+    def test_erro_de_validacao(self, servicos_carregados):
+        html = asyncio.run(app.responder_interface("REDE INEXISTENTE", "num_cupom_nota"))
+        assert "Erro:" in html and "Erro interno" not in html
+        servicos_carregados.analytics.log_query.assert_not_called()
+    
+    def test_erro_inesperado(self, servicos_carregados):
+        servicos_carregados.analytics.log_query.side_effect = RuntimeError("falhou")
+        html = asyncio.run(app.responder_interface("MAGAZINE LUIZA", "num_cupom_nota"))
+        assert "Erro interno: falhou" in html
+    
+    def test_consultas_concorrentes(self, servicos_carregados):
+        """Várias consultas no mesmo event loop"""
+        async def _consultas():
+            return await asyncio.gather(*(
+                app.responder_interface("MAGAZINE LUIZA", campo)
+                for campo in ["num_cupom_nota", "data_venda", "observacao"] * 5
+            ))
+        
+        respostas = asyncio.run(_consultas())
+        assert len(respostas) == 15
+        assert not any("Erro" in r for r in respostas)
+    
+    def test_trace_gravado_fora_do_event_loop(self, servicos_carregados, tmp_path, monkeypatch):
+        """Com tracing ligado o handler só enfileira o trace; o arquivo é gravado pela thread de traces"""
+        monkeypatch.setattr(Config, "TRACE_ENABLED", True)
+        monkeypatch.setattr(Config, "TRACE_SAMPLE_RATE", 1.0)
+        monkeypatch.setattr(Config, "TRACE_LIMIAR_MS", 0.0)
+        monkeypatch.setattr(Config, "TRACE_DIR", tmp_path)
+        threads = []
+        gravar_lote = tracing._gravar_lote
+        
+        def _registrar(traces):
+            threads.append(threading.current_thread())
+            gravar_lote(traces)
+        
+        monkeypatch.setattr(tracing, "_gravar_lote", _registrar)
+        asyncio.run(app.responder_interface("MAGAZINE LUIZA", "num_cupom_nota"))
+        
+        assert tracing.flush(5)
+        [gravado] = [json.loads(linha) for linha in tracing.arquivo_traces().read_text(encoding="utf-8").splitlines()]
+        assert gravado['nome'] == "responder_interface"
+        assert {"services", "validator", "formatter.render"} <= {s['nome'] for s in gravado['spans']}
+        assert threads and threading.main_thread() not in threads
+
+
+class TestResponder:
+    def test_metricas_incluem_acertos_do_cache(self, services):
+        """Consultas respondidas pelo cache de respostas também entram nas métricas"""
+        consultas = metrics.CONSULTAS.contagem("obrigatorio", "VAREJO")
+        validacoes = metrics.VALIDACAO.contagem("obrigatorio", "VAREJO")
+        for _ in range(3):
+            app._responder(services, "MAGAZINE LUIZA", "num_cupom_nota")
+        assert metrics.CONSULTAS.contagem("obrigatorio", "VAREJO") == consultas + 3
+        assert metrics.VALIDACAO.contagem("obrigatorio", "VAREJO") == validacoes + 1
+        assert services.analytics.log_query.call_count == 3
+    
+    def test_metricas_com_erro(self, services):
+        antes = metrics.CONSULTAS.contagem("error", "")
+        with pytest.raises(app.ValidationError):
+            app._responder(services, "REDE INEXISTENTE", "num_cupom_nota")
+        assert metrics.CONSULTAS.contagem("error", "") == antes + 1
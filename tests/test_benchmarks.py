@@ -0,0 +1,36 @@
+from benchmarks.load_test import comparar, resumir
+from benchmarks.synthetic import CAMPOS_BASE, CANAIS, REDES_BASE, gerar_dados
+
+
+class TestDadosSinteticos:
+    def test_escala(self):
+        dados = gerar_dados(escala=3)
+        assert len(dados.status_table.campo_index) == 3 * CAMPOS_BASE
+        assert len(dados.mapa_rede_canal) == 3 * REDES_BASE
+        assert dados.status_table.canais == CANAIS
+    
+    def test_deterministico(self):
+        a, b = gerar_dados(semente=7), gerar_dados(semente=7)
+        assert a.mapa_rede_canal == b.mapa_rede_canal
+        assert a.status_table.matrix == b.status_table.matrix
+        assert gerar_dados(semente=8).status_table.matrix != a.status_table.matrix
+    
+    def test_todos_os_status(self):
+        codigos = set(b"".join(gerar_dados().status_table.matrix))
+        assert codigos == {0, 1, 2}
+
+
+class TestTesteCarga:
+    def test_resumir(self):
+        resumo = resumir([i / 1000 for i in range(1, 101)], duracao=2.0)
+        assert resumo['requisicoes'] == 100
+        assert resumo['vazao_rps'] == 50.0
+        assert resumo['p50_ms'] == 50.0
+        assert resumo['p99_ms'] == 99.0
+        assert resumo['max_ms'] == 100.0
+    
+    def test_comparar(self):
+        base = {'total': {'p99_ms': 10.0, 'vazao_rps': 100.0}, 'rotas': {}}
+        assert comparar({'total': {'p99_ms': 11.0, 'vazao_rps': 90.0}, 'rotas': {}}, base, 0.2) == []
+        regressoes = comparar({'total': {'p99_ms': 13.0, 'vazao_rps': 70.0}, 'rotas': {}}, base, 0.2)
+        assert len(regressoes) == 2
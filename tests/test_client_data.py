@@ -0,0 +1,43 @@
+import json
+import re
+
+from config import Config
+from src.client_data import CLIENT_DATA_FORMAT, dados_cliente_asset, montar_dados_cliente
+from src.data_loader import LoadedData
+
+
+class TestDadosCliente:
+    def test_resumo(self, mock_data_loader):
+        """Um dígito de status por campo e canal, redes mapeadas e formatos"""
+        resumo = montar_dados_cliente(mock_data_loader.data)
+        assert resumo['versao'] == 'mock'
+        assert resumo['canais'] == ['VAREJO']
+        assert resumo['campos'] == ['num_cupom_nota', 'data_venda', 'observacao']
+        assert resumo['status'] == {'VAREJO': '001'}
+        assert resumo['redes'] == {'MAGAZINE LUIZA': 'VAREJO', 'CASAS BAHIA': 'VAREJO'}
+        assert resumo['formatos'] == {
+            'num_cupom_nota': 'Número do cupom fiscal',
+            'data_venda': 'Data no formato DD/MM/AAAA',
+        }
+    
+    def test_redes_sem_canal_na_tabela(self, mock_data_loader):
+        """Redes cujo canal não existe na tabela ficam para o servidor responder"""
+        dados = mock_data_loader.data
+        outra = LoadedData(
+            comentarios=dados.comentarios,
+            mapa_rede_canal={**dados.mapa_rede_canal, 'REDE NOVA': 'CANAL NOVO'},
+            status_table=dados.status_table,
+            versao='outra'
+        )
+        assert 'REDE NOVA' not in montar_dados_cliente(outra)['redes']
+    
+    def test_asset_por_versao(self, mock_data_loader):
+        """JSON serializado uma vez por versão publicada dos dados"""
+        asset = dados_cliente_asset(mock_data_loader.data)
+        assert dados_cliente_asset(mock_data_loader.data) is asset
+        assert json.loads(asset.original.conteudo)['formato'] == CLIENT_DATA_FORMAT
+    
+    def test_formato_igual_ao_service_worker(self):
+        """sw.js descarta dados em formato diferente do que ele sabe ler"""
+        sw = (Config.SRC_DIR / "pwa" / "sw.js").read_text(encoding='utf-8')
+        assert int(re.search(r"const FORMATO_DADOS = (\d+);", sw).group(1)) == CLIENT_DATA_FORMAT
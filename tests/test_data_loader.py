@@ -1,5 +1,13 @@
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
 import pytest
-from src.data_loader import DataLoader
+from openpyxl import load_workbook
+from config import Config
+from src.data_loader import DataLoader, LoadedData
+from src.utils import DataNotLoadedError
 
 
 class TestDataLoader:
@@ -28,3 +36,119 @@ class TestDataLoader:
         # Segunda chamada (deve usar cache)
         canal2 = mock_data_loader.get_canal_for_rede('MAGAZINE LUIZA')
         assert canal1 == canal2
+    
+    def test_require_data(self, mock_data_loader):
+        """Acesso aos dados nas requisições falha com erro claro antes da carga"""
+        assert mock_data_loader.require_data() is mock_data_loader.data
+        with pytest.raises(DataNotLoadedError):
+            DataLoader().require_data()
+
+
+def _adicionar_rede(nome, canal):
+    """Acrescenta uma rede à planilha de redes"""
+    wb = load_workbook(Config.REDES_FILE)
+    wb.active.append([nome, 'NOVA0001', canal])
+    wb.save(Config.REDES_FILE)
+
+
+class TestFormatoIndex:
+    def _dados(self, mock_data_loader, comentarios):
+        atual = mock_data_loader.data
+        return LoadedData(
+            comentarios=comentarios,
+            mapa_rede_canal=atual.mapa_rede_canal,
+            status_table=atual.status_table
+        )
+    
+    def test_chave_com_duplo_underscore(self, mock_data_loader):
+        """Coluna 'num__cupom_nota' do modelo atende o campo 'num_cupom_nota'"""
+        dados = self._dados(mock_data_loader, {'num__cupom_nota': 'Cupom'})
+        assert dados.get_formato('num_cupom_nota') == 'Cupom'
+        assert dados.get_formato('num__cupom_nota') == 'Cupom'
+    
+    def test_sinonimo(self, mock_data_loader):
+        """Sinônimos apontam para o comentário do campo de destino"""
+        dados = self._dados(mock_data_loader, {'data': 'Outro', 'data_venda': 'DD/MM/AAAA'})
+        assert Config.SINONIMOS_COMENTARIOS['data'] == 'data_venda'
+        assert dados.get_formato('data') == 'DD/MM/AAAA'
+    
+    def test_sem_comentario(self, mock_data_loader):
+        """Campo sem comentário retorna None"""
+        assert mock_data_loader.data.get_formato('observacao') is None
+    
+    def test_indice_reverso(self, mock_data_loader):
+        """Campos que compartilham o mesmo comentário"""
+        dados = self._dados(mock_data_loader, {'num_cupom_nota': 'Texto', 'data_venda': 'Texto'})
+        assert dados.get_campos_por_formato('Texto') == ('num_cupom_nota', 'data_venda')
+        assert dados.get_campos_por_formato('Inexistente') == ()
+
+
+class TestReload:
+    def test_sem_alteracao(self, data_dir):
+        loader = DataLoader()
+        loader.load_all()
+        assert loader.reload() is False
+    
+    def test_planilha_alterada(self, data_dir):
+        loader = DataLoader()
+        loader.load_all()
+        dados_antigos = loader.data
+        notificados = []
+        loader.add_reload_listener(notificados.append)
+        
+        _adicionar_rede('REDE NOVA', 'Varejo')
+        
+        assert loader.reload() is True
+        assert loader.get_canal_for_rede('REDE NOVA') == 'VAREJO'
+        assert loader.data.versao != dados_antigos.versao
+        assert notificados == [loader.data]
+        # Quem já tinha a versão antiga continua com dados consistentes
+        assert dados_antigos.get_canal('REDE NOVA') == ''
+    
+    def test_erro_mantem_dados_atuais(self, data_dir):
+        loader = DataLoader()
+        loader.load_all()
+        dados = loader.data
+        
+        Config.CAMPOS_FILE.write_bytes(b'corrompido')
+        
+        assert loader.reload() is False
+        assert loader.data is dados
+    
+    def test_recarga_automatica(self, data_dir):
+        loader = DataLoader()
+        loader.load_all()
+        recarregado = threading.Event()
+        loader.add_reload_listener(lambda dados: recarregado.set())
+        
+        loader.start_auto_reload(interval=0.05)
+        try:
+            _adicionar_rede('REDE NOVA', 'Varejo')
+            assert recarregado.wait(timeout=5)
+        finally:
+            loader.stop_auto_reload()
+        
+        assert 'REDE NOVA' in loader.get_lista_redes()
+
+
+class TestSemPandas:
+    def test_runtime_a_partir_do_snapshot(self, tmp_path):
+        """Com snapshot atualizado a validação não importa pandas nem openpyxl"""
+        raiz = Path(__file__).parent.parent
+        env = dict(os.environ, LG_AI_SNAPSHOT_FILE=str(tmp_path / "dados.pkl"), LG_AI_AUTO_RELOAD="0")
+        subprocess.run([sys.executable, "build_snapshot.py"], cwd=raiz, env=env, check=True, capture_output=True)
+        
+        script = (
+            "import sys\n"
+            "from src.data_loader import DataLoader\n"
+            "from src.validator import Validator\n"
+            "loader = DataLoader()\n"
+            "loader.load_all()\n"
+            "rede = loader.get_lista_redes()[0]\n"
+            "Validator(loader).validar_campo(rede, loader.get_lista_campos()[0])\n"
+            "print(sorted(m for m in ('pandas', 'numpy', 'openpyxl') if m in sys.modules))\n"
+        )
+        resultado = subprocess.run(
+            [sys.executable, "-c", script], cwd=raiz, env=env, check=True, capture_output=True, text=True
+        )
+        assert resultado.stdout.strip().splitlines()[-1] == "[]"
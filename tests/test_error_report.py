@@ -0,0 +1,93 @@
+import csv
+import os
+import time
+
+import pytest
+from openpyxl import load_workbook
+
+from config import Config
+from src.error_report import RelatorioErros, destino_relatorio_erros
+
+
+def _ler_csv(path):
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return list(csv.reader(f, delimiter=';'))
+
+
+class TestRelatorioErros:
+    def test_csv_com_resumo(self, tmp_path):
+        erros = RelatorioErros(tmp_path / "erros.csv")
+        erros.adicionar(2, 'cpf_vendedor', "formato inválido", "123", "máximo de 11 dígitos")
+        erros.adicionar(3, 'data_venda', "obrigatório não preenchido")
+        caminho = erros.fechar(['cnpj_loja'])
+        
+        linhas = _ler_csv(caminho)
+        assert linhas[0] == ['LINHA', 'CAMPO', 'ERRO', 'VALOR', 'DETALHE']
+        assert linhas[1] == ['2', 'CPF_VENDEDOR', 'formato inválido', '123', 'máximo de 11 dígitos']
+        assert linhas[2] == ['3', 'DATA_VENDA', 'obrigatório não preenchido', '', '']
+        assert linhas[3] == []
+        assert linhas[4] == ['CAMPO', 'VIOLAÇÕES', 'LISTADAS NO RELATÓRIO']
+        assert ['CNPJ_LOJA', 'coluna obrigatória ausente', ''] in linhas
+    
+    def test_limite_por_campo(self, tmp_path):
+        """Violações além do limite entram só no resumo"""
+        erros = RelatorioErros(tmp_path / "erros.csv", max_por_campo=2)
+        listadas = [erros.adicionar(n, 'obs', "deve ficar em branco", "x") for n in range(2, 7)]
+        erros.adicionar(7, 'tipo', "deve ficar em branco", "x")
+        erros.fechar()
+        
+        assert listadas == [True, True, False, False, False]
+        assert erros.totais == {'obs': 5, 'tipo': 1}
+        assert erros.truncado
+        linhas = _ler_csv(erros.destino)
+        assert ['OBS', '5', '2'] in linhas
+        assert sum(1 for l in linhas if l[1:2] == ['OBS']) == 2
+    
+    def test_limite_total(self, tmp_path):
+        erros = RelatorioErros(tmp_path / "erros.csv", max_por_campo=10, max_linhas=3)
+        for campo in ('a', 'b', 'c', 'd'):
+            erros.adicionar(2, campo, "erro")
+        erros.fechar()
+        assert erros.linhas_gravadas == 3
+        assert erros.totais['d'] == 1
+    
+    def test_xlsx(self, tmp_path):
+        erros = RelatorioErros(tmp_path / "erros.xlsx")
+        erros.adicionar(2, 'quantidade', "formato inválido", "dez", "deve conter somente números")
+        erros.fechar()
+        
+        wb = load_workbook(erros.destino, read_only=True)
+        assert wb.sheetnames == ["Resumo", "Erros"]
+        resumo = list(wb["Resumo"].iter_rows(values_only=True))
+        assert resumo[1] == ('QUANTIDADE', 1, 1)
+        linhas = list(wb["Erros"].iter_rows(values_only=True))
+        assert linhas[1] == (2, 'QUANTIDADE', "formato inválido", "dez", "deve conter somente números")
+        wb.close()
+    
+    def test_descartar(self, tmp_path):
+        erros = RelatorioErros(tmp_path / "erros.csv")
+        erros.adicionar(2, 'obs', "erro")
+        erros.descartar()
+        assert not erros.destino.exists()
+    
+    def test_formato_invalido(self, tmp_path):
+        with pytest.raises(ValueError):
+            RelatorioErros(tmp_path / "erros.txt")
+
+
+class TestDestino:
+    def test_diretorio_exclusivo(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "EXPORT_DIR", tmp_path)
+        a = destino_relatorio_erros("/tmp/Vendas Março.xlsx", "csv")
+        b = destino_relatorio_erros("/tmp/Vendas Março.xlsx", "csv")
+        assert a.name == "erros_Vendas_Mar_o.csv"
+        assert a.parent != b.parent
+    
+    def test_remove_antigos(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "EXPORT_DIR", tmp_path)
+        antigo = destino_relatorio_erros("vendas.csv", "csv").parent
+        vencido = time.time() - Config.RELATORIO_ERROS_TTL_S - 60
+        os.utime(antigo, (vencido, vencido))
+        
+        destino_relatorio_erros("vendas.csv", "xlsx")
+        assert not antigo.exists()
@@ -0,0 +1,184 @@
+import csv
+import dataclasses
+import pytest
+from config import Config
+from openpyxl import Workbook
+from src.file_validator import FileValidator, Progresso
+from src.status_table import StatusTable
+from src.utils import ValidationError
+
+
+@pytest.fixture
+def file_validator(validator, mock_data_loader):
+    """FileValidator com um campo que deve ficar em branco no VAREJO"""
+    status_table = StatusTable.from_columns(
+        mock_data_loader.status_table.campos, {'VAREJO': ['✓', '✓', '✗']}
+    )
+    mock_data_loader.set_data(dataclasses.replace(mock_data_loader.data, status_table=status_table))
+    return FileValidator(validator, max_violacoes=2)
+
+
+def _write_csv(path, linhas, sep=';'):
+    path.write_text("\n".join(sep.join(linha) for linha in linhas), encoding='utf-8')
+    return path
+
+
+class TestFileValidator:
+    def test_arquivo_valido(self, file_validator, tmp_path):
+        arquivo = _write_csv(tmp_path / "vendas.csv", [
+            ["num_cupom_nota", "data_venda", "observacao"],
+            ["123", "28012025", ""],
+        ])
+        relatorio = file_validator.validar_arquivo("MAGAZINE LUIZA", arquivo)
+        assert relatorio['valido']
+        assert relatorio['total_linhas'] == 1
+        assert relatorio['canal'] == 'VAREJO'
+    
+    def test_coluna_obrigatoria_faltando(self, file_validator, tmp_path):
+        arquivo = _write_csv(tmp_path / "vendas.csv", [["num_cupom_nota"], ["123"]], sep=',')
+        relatorio = file_validator.validar_arquivo("MAGAZINE LUIZA", arquivo)
+        faltando = [c['campo'] for c in relatorio['colunas_obrigatorias_faltando']]
+        assert faltando == ['data_venda']
+        assert 'DD/MM/AAAA' in relatorio['colunas_obrigatorias_faltando'][0]['formato']
+        assert not relatorio['valido']
+    
+    def test_violacoes_por_linha(self, file_validator, tmp_path):
+        arquivo = _write_csv(tmp_path / "vendas.csv", [
+            ["NUM_CUPOM_NOTA", "DATA_VENDA", "OBSERVACAO", "EXTRA"],
+            ["", "28012025", "texto", "x"],
+            ["1", "", "texto", "x"],
+            ["", "", "", ""],
+        ])
+        relatorio = file_validator.validar_arquivo("MAGAZINE LUIZA", arquivo)
+        assert relatorio['total_linhas'] == 2
+        assert relatorio['total_violacoes'] == 4
+        assert relatorio['violacoes_por_campo'] == {
+            'num_cupom_nota': 1, 'data_venda': 1, 'observacao': 2
+        }
+        assert relatorio['colunas_branco_preenchidas'] == ['observacao']
+        assert relatorio['colunas_desconhecidas'] == ['EXTRA']
+        # Lista de violações limitada por max_violacoes
+        assert len(relatorio['violacoes']) == 2
+        assert relatorio['violacoes_truncadas']
+        assert relatorio['violacoes'][0] == {
+            'linha': 2, 'campo': 'num_cupom_nota', 'tipo': 'obrigatorio_vazio', 'valor': '',
+            'motivo': None
+        }
+    
+    def test_xlsx(self, file_validator, tmp_path):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["num_cupom_nota", "data_venda"])
+        ws.append([123, None])
+        ws.append([None, None])
+        arquivo = tmp_path / "vendas.xlsx"
+        wb.save(arquivo)
+        
+        relatorio = file_validator.validar_arquivo("MAGAZINE LUIZA", arquivo)
+        assert relatorio['total_linhas'] == 1
+        assert relatorio['violacoes_por_campo'] == {'data_venda': 1}
+    
+    def test_formato_nao_suportado(self, file_validator, tmp_path):
+        arquivo = tmp_path / "vendas.txt"
+        arquivo.write_text("num_cupom_nota")
+        with pytest.raises(ValidationError):
+            file_validator.validar_arquivo("MAGAZINE LUIZA", arquivo)
+    
+    def test_rede_invalida(self, file_validator, tmp_path):
+        arquivo = _write_csv(tmp_path / "vendas.csv", [["num_cupom_nota"]])
+        with pytest.raises(ValidationError):
+            file_validator.validar_arquivo("REDE_INEXISTENTE", arquivo)
+    
+    def test_regras_de_formato(self, file_validator, mock_data_loader, tmp_path):
+        """Valores preenchidos seguem a regra do comentário do campo, inclusive em opcionais"""
+        comentarios = {
+            'num_cupom_nota': 'NUM_CUPOM_NOTA: 10 dígitos (Somente números).',
+            'data_venda': 'DATA_VENDA: 8 dígitos (DDMMAAAA).',
+        }
+        mock_data_loader.set_data(dataclasses.replace(mock_data_loader.data, comentarios=comentarios))
+        arquivo = _write_csv(tmp_path / "vendas.csv", [
+            ["num_cupom_nota", "data_venda"],
+            ["123", "28012025"],
+            ["12a", "31022025"],
+        ])
+        relatorio = file_validator.validar_arquivo("MAGAZINE LUIZA", arquivo)
+        assert relatorio['violacoes_por_campo'] == {'num_cupom_nota': 1, 'data_venda': 1}
+        assert relatorio['violacoes'][0] == {
+            'linha': 3, 'campo': 'num_cupom_nota', 'tipo': 'formato_invalido', 'valor': '12a',
+            'motivo': 'deve conter somente números'
+        }
+        assert not relatorio['valido']
+    
+    def test_relatorio_de_erros(self, file_validator, tmp_path):
+        """Todas as violações vão para o arquivo, mesmo além de max_violacoes"""
+        arquivo = _write_csv(tmp_path / "vendas.csv", [
+            ["num_cupom_nota", "data_venda", "observacao"],
+            *[["", "28012025", "x"] for _ in range(5)],
+        ])
+        destino = tmp_path / "erros" / "erros.csv"
+        relatorio = file_validator.validar_arquivo("MAGAZINE LUIZA", arquivo, destino)
+        
+        assert relatorio['relatorio_erros'] == str(destino)
+        assert len(relatorio['violacoes']) == 2
+        with open(destino, encoding='utf-8-sig', newline='') as f:
+            linhas = list(csv.reader(f, delimiter=';'))
+        erros = linhas[1:linhas.index([])]
+        assert len(erros) == relatorio['total_violacoes'] == 10
+        assert ['OBSERVACAO', '5', '5'] in linhas
+    
+    def test_progresso(self, file_validator, tmp_path):
+        arquivo = _write_csv(tmp_path / "vendas.csv", [
+            ["num_cupom_nota", "data_venda"],
+            *[["1", ""] for _ in range(7)],
+        ])
+        progresso = list(file_validator.iter_validacao("MAGAZINE LUIZA", arquivo, intervalo=3))
+        
+        assert [(p.linhas, p.violacoes) for p in progresso] == [(3, 3), (6, 6), (7, 7)]
+        assert all(p.relatorio is None for p in progresso[:-1])
+        assert 0 < progresso[0].fracao <= progresso[1].fracao <= 1
+        assert progresso[-1].relatorio['total_linhas'] == 7
+    
+    def test_interrompido_descarta_relatorio(self, file_validator, tmp_path):
+        """Validação abandonada no meio (ex.: usuário saiu da página) apaga o relatório parcial"""
+        arquivo = _write_csv(tmp_path / "vendas.csv", [
+            ["num_cupom_nota", "data_venda"],
+            *[["1", ""] for _ in range(10)],
+        ])
+        destino = tmp_path / "erros.xlsx"
+        validacao = file_validator.iter_validacao("MAGAZINE LUIZA", arquivo, destino, intervalo=2)
+        assert isinstance(next(validacao), Progresso)
+        validacao.close()
+        assert not destino.exists()
+    
+    def test_csv_com_latin1_apos_a_amostra(self, file_validator, tmp_path, monkeypatch):
+        """Byte latin-1 depois da amostra de detecção não interrompe a leitura do UTF-8"""
+        monkeypatch.setattr(Config, 'CSV_AMOSTRA_BYTES', 256)
+        arquivo = tmp_path / "vendas.csv"
+        arquivo.write_bytes(
+            "num_cupom_nota;data_venda;vendedor\n".encode('utf-8')
+            + b"".join(b"1;28012025;ok\n" for _ in range(50))
+            + "2;28012025;Jos\xe9\n".encode('latin-1')
+        )
+        relatorio = file_validator.validar_arquivo("MAGAZINE LUIZA", arquivo)
+        assert relatorio['total_linhas'] == 51
+        assert relatorio['valido']
+    
+    def test_arquivo_fechado_se_configuracao_falhar(self, file_validator, tmp_path, monkeypatch):
+        """Erro entre a leitura do cabeçalho e a validação das linhas não deixa o arquivo aberto"""
+        arquivo = _write_csv(tmp_path / "vendas.csv", [["num_cupom_nota"], ["1"]])
+        leituras = []
+        iter_linhas = FileValidator._iter_linhas
+        
+        def _registrar(self, caminho):
+            leitura = iter_linhas(self, caminho)
+            leituras.append(leitura[0])
+            return leitura
+        
+        def _falha(*args):
+            raise RuntimeError("falha")
+        
+        monkeypatch.setattr(FileValidator, '_iter_linhas', _registrar)
+        monkeypatch.setattr(FileValidator, '_mapear_colunas', _falha)
+        with pytest.raises(RuntimeError):
+            file_validator.validar_arquivo("MAGAZINE LUIZA", arquivo)
+        assert leituras[0].gi_frame is None
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+
+from src.format_rules import (
+    TIPO_ALFANUMERICO, TIPO_DATA, TIPO_DECIMAL, TIPO_LETRAS, TIPO_NUMEROS,
+    parse_regra, regras_por_campo
+)
+
+
+class TestParseRegra:
+    @pytest.mark.parametrize("comentario, tipo, tamanho", [
+        ("CPF_VENDEDOR: 11 dígitos (Somente números).\nEX.: 12345678900", TIPO_NUMEROS, 11),
+        ("NOME_VENDEDOR: 60 caracteres (Somente letras).\nEX.: João da Silva", TIPO_LETRAS, 60),
+        ("CODIGO_REDE: 10 caracteres (Letras e números).\nEX.: REDE01", TIPO_ALFANUMERICO, 10),
+        ("VALOR_UNITARIO: 8 dígitos (Formato decimal).\nEX.:1.000,00", TIPO_DECIMAL, 8),
+        ("DATA_VENDA: 8 dígitos (DDMMAAAA).\nEX.:28012025", TIPO_DATA, 8),
+        ("TIPO: 1 caractere (Letra).\nEX.:V", TIPO_LETRAS, 1),
+    ])
+    def test_comentarios_do_modelo(self, comentario, tipo, tamanho):
+        regra = parse_regra(comentario)
+        assert (regra.tipo, regra.tamanho) == (tipo, tamanho)
+        assert "\n" not in regra.descricao
+    
+    @pytest.mark.parametrize("comentario", [None, "", "Número do cupom fiscal", "Data no formato DD/MM/AAAA"])
+    def test_fora_do_padrao(self, comentario):
+        assert parse_regra(comentario) is None
+    
+    def test_regras_por_campo(self, mock_data_loader):
+        """Só campos com comentário no padrão recebem regra"""
+        assert regras_por_campo(mock_data_loader.data, ['num_cupom_nota', 'data_venda']) == {}
+
+
+class TestValidar:
+    def test_numeros(self):
+        regra = parse_regra("CPF: 11 dígitos (Somente números).")
+        assert regra.validar("12345678900") is None
+        assert regra.validar(12345678900) is None
+        assert regra.validar(12345678900.0) is None
+        assert regra.validar("123.456.789-00") == "deve conter somente números"
+        assert regra.validar(12.5) == "deve conter somente números"
+        assert regra.validar("123456789001") == "máximo de 11 dígitos"
+    
+    def test_letras(self):
+        regra = parse_regra("NOME: 10 caracteres (Somente letras).")
+        assert regra.validar("João Silva") is None
+        assert regra.validar("João 2") == "deve conter somente letras"
+        assert regra.validar("Maria da Silva") == "máximo de 10 caracteres"
+    
+    def test_alfanumerico(self):
+        regra = parse_regra("CODIGO: 6 caracteres (Letras e números).")
+        assert regra.validar("PRO.12") is None
+        assert regra.validar("PRO.123") == "máximo de 6 caracteres"
+    
+    def test_decimal(self):
+        regra = parse_regra("VALOR: 8 dígitos (Formato decimal).")
+        for valor in ("1.000,00", "1000,5", "1000.50", 1000, 99.9):
+            assert regra.validar(valor) is None
+        assert regra.validar("R$ 10") == "valor decimal inválido (ex.: 1.000,00)"
+        assert regra.validar("1.000.000,00") == "máximo de 8 dígitos"
+    
+    def test_data(self):
+        regra = parse_regra("DATA: 8 dígitos (DDMMAAAA).")
+        assert regra.validar("28012025") is None
+        assert regra.validar(datetime(2025, 1, 28)) is None
+        # Número do Excel sem o zero à esquerda
+        assert regra.validar(1022025) is None
+        assert regra.validar("32012025") == "data inválida (use DDMMAAAA)"
+        assert regra.validar("28/01/2025") == "data inválida (use DDMMAAAA)"
@@ -0,0 +1,81 @@
+import pytest
+
+from src.formatter import ResponseFormatter
+from src.utils import ValidationError
+
+
+class TestFormatResponse:
+    def test_status_obrigatorio(self, validator, formatter):
+        """HTML contém campo, rede e status"""
+        resultado = validator.validar_campo("MAGAZINE LUIZA", "NUM_CUPOM_NOTA")
+        resposta = formatter.format_response(resultado)
+        assert 'NUM_CUPOM_NOTA' in resposta
+        assert 'MAGAZINE LUIZA' in resposta
+        assert 'Obrigatório' in resposta
+
+    
+    def test_relatorio_rede(self, validator, formatter):
+        """Campos agrupados por status, com totais"""
+        resposta = formatter.format_relatorio_rede(validator.relatorio_rede("MAGAZINE LUIZA"))
+        assert 'Obrigatórios 🔴</b></span> (2)' in resposta
+        assert 'OBSERVACAO' in resposta
+        assert 'Devem ficar em branco' not in resposta
+
+
+class TestRenderCached:
+    def test_reaproveita_resposta(self, validator, formatter):
+        """Segunda consulta do mesmo par não chama o validador"""
+        chamadas = []
+        
+        def validar():
+            chamadas.append(1)
+            return validator.validar_campo("MAGAZINE LUIZA", "DATA_VENDA")
+        
+        primeiro = formatter.render_cached(('v1', "MAGAZINE LUIZA", "DATA_VENDA"), validar)
+        segundo = formatter.render_cached(('v1', "MAGAZINE LUIZA", "DATA_VENDA"), validar)
+        assert len(chamadas) == 1
+        assert segundo == primeiro
+        assert segundo[1] == formatter.format_response(primeiro[0])
+    
+    def test_limite_lru(self, validator):
+        """Entrada menos usada é descartada ao exceder o limite"""
+        formatter = ResponseFormatter(cache_size=2)
+        chamadas = []
+        
+        def validar(campo):
+            def _validar():
+                chamadas.append(campo)
+                return validator.validar_campo("MAGAZINE LUIZA", campo)
+            return _validar
+        
+        for campo in ("NUM_CUPOM_NOTA", "DATA_VENDA", "NUM_CUPOM_NOTA", "OBSERVACAO", "NUM_CUPOM_NOTA", "DATA_VENDA"):
+            formatter.render_cached(campo, validar(campo))
+        
+        assert chamadas == ["NUM_CUPOM_NOTA", "DATA_VENDA", "OBSERVACAO", "DATA_VENDA"]
+    
+    def test_erro_nao_armazenado(self, validator, formatter):
+        """Erros de validação são propagados e não entram no cache"""
+        for _ in range(2):
+            with pytest.raises(ValidationError):
+                formatter.render_cached(
+                    "x", lambda: validator.validar_campo("MAGAZINE LUIZA", "CAMPO_INEXISTENTE")
+                )
+        assert not formatter._cache
+    
+    def test_invalidado_na_recarga(self, mock_data_loader, validator, formatter):
+        """Publicar novos dados limpa o cache"""
+        mock_data_loader.add_reload_listener(formatter.clear_cache)
+        formatter.render_cached("x", lambda: validator.validar_campo("MAGAZINE LUIZA", "DATA_VENDA"))
+        assert formatter._cache
+        
+        mock_data_loader.set_data(mock_data_loader.data)
+        assert not formatter._cache
+    
+    def test_formatador_personalizado(self, validator, formatter):
+        """Relatórios usam o próprio formatador e ficam em cache separado"""
+        relatorio, resposta = formatter.render_cached(
+            ('relatorio', "MAGAZINE LUIZA"),
+            lambda: validator.relatorio_rede("MAGAZINE LUIZA"),
+            formatter.format_relatorio_rede
+        )
+        assert resposta == formatter.format_relatorio_rede(relatorio)
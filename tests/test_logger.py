@@ -0,0 +1,133 @@
+import logging
+import sys
+
+import pytest
+
+from config import Config
+from src import logger as logger_mod
+from src.logger import SamplingFilter, setup_logger, stop_logging
+
+
+def _registro(nivel=logging.INFO, msg="mensagem %s", args=("x",)):
+    return logging.LogRecord("teste", nivel, __file__, 1, msg, args, None)
+
+
+class _Coletor(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.mensagens = []
+    
+    def emit(self, record):
+        self.mensagens.append(self.format(record))
+
+
+class TestSetupLogger:
+    def test_sem_handlers_duplicados(self):
+        """Chamadas repetidas reaproveitam os handlers compartilhados"""
+        log = setup_logger("teste.duplicados")
+        setup_logger("teste.duplicados")
+        setup_logger("teste.duplicados", level="DEBUG")
+        assert len(log.handlers) == 1
+        assert log.level == logging.DEBUG
+    
+    def test_preserva_handlers_externos(self):
+        """Handlers adicionados por terceiros não são removidos"""
+        log = logging.getLogger("teste.externo")
+        externo = _Coletor()
+        log.addHandler(externo)
+        setup_logger("teste.externo")
+        setup_logger("teste.externo")
+        assert externo in log.handlers
+        assert len(log.handlers) == 2
+        log.removeHandler(externo)
+    
+    def test_handlers_compartilhados(self):
+        """Loggers diferentes usam o mesmo handler de console/fila"""
+        a = setup_logger("teste.compartilhado.a")
+        b = setup_logger("teste.compartilhado.b")
+        assert a.handlers[0] is b.handlers[0]
+    
+    def test_modo_sincrono(self, monkeypatch):
+        monkeypatch.setattr(Config, "LOG_ASYNC", False)
+        log = setup_logger("teste.sincrono")
+        assert log.handlers == [logger_mod._get_console()]
+    
+    def test_arquivo(self, tmp_path):
+        """Mensagens chegam ao arquivo após a fila ser esvaziada"""
+        arquivo = tmp_path / "app.log"
+        log = setup_logger("teste.arquivo", log_file=arquivo)
+        log.info("linha %d de %s", 1, "teste")
+        log.debug("descartada pelo nível")
+        stop_logging()
+        conteudo = arquivo.read_text(encoding="utf-8")
+        assert "teste.arquivo - INFO - linha 1 de teste" in conteudo
+        assert "descartada" not in conteudo
+    
+    def test_thread_reiniciada(self, tmp_path):
+        """Depois de stop_logging, o próximo setup_logger volta a gravar"""
+        arquivo = tmp_path / "reinicio.log"
+        log = setup_logger("teste.reinicio", log_file=arquivo)
+        stop_logging()
+        setup_logger("teste.reinicio", log_file=arquivo)
+        log.warning("depois do reinício")
+        stop_logging()
+        assert "depois do reinício" in arquivo.read_text(encoding="utf-8")
+    
+    def test_amostragem_por_config(self, monkeypatch):
+        monkeypatch.setattr(Config, "LOG_SAMPLING", {"teste.amostrado": 0.25})
+        log = setup_logger("teste.amostrado")
+        filtros = [f for f in log.filters if isinstance(f, SamplingFilter)]
+        assert len(filtros) == 1 and filtros[0].taxa == 0.25
+        
+        # Nova configuração substitui o filtro anterior
+        setup_logger("teste.amostrado", amostragem=1.0)
+        assert not [f for f in log.filters if isinstance(f, SamplingFilter)]
+
+
+class TestQueueHandler:
+    def test_formatacao_preguicosa(self):
+        """A mensagem só é montada na thread de gravação"""
+        handler = logger_mod._QueueHandler(logger_mod._fila, ())
+        registro = handler.prepare(_registro())
+        assert registro.msg == "mensagem %s"
+        assert registro.args == ("x",)
+        assert registro.getMessage() == "mensagem x"
+    
+    def test_excecao_convertida(self):
+        """Traceback vira texto antes de enfileirar (frames não cruzam a fila)"""
+        handler = logger_mod._QueueHandler(logger_mod._fila, ())
+        try:
+            raise ValueError("falhou")
+        except ValueError:
+            registro = logging.LogRecord(
+                "teste", logging.ERROR, __file__, 1, "erro", (), sys.exc_info()
+            )
+        preparado = handler.prepare(registro)
+        assert preparado.exc_info is None
+        assert "ValueError: falhou" in preparado.exc_text
+    
+    def test_roteamento(self):
+        """Cada registro vai apenas para os destinos do logger de origem"""
+        destino, outro = _Coletor(), _Coletor()
+        handler = logger_mod._QueueHandler(logger_mod._fila, (destino,))
+        logger_mod._Roteador().handle(handler.prepare(_registro()))
+        assert destino.mensagens == ["mensagem x"]
+        assert outro.mensagens == []
+
+
+class TestSamplingFilter:
+    def test_mantem_uma_a_cada_n(self):
+        filtro = SamplingFilter(0.1)
+        mantidos = sum(filtro.filter(_registro()) for _ in range(100))
+        assert mantidos == 10
+    
+    def test_warning_sempre_passa(self):
+        filtro = SamplingFilter(0)
+        assert not filtro.filter(_registro(logging.INFO))
+        assert filtro.filter(_registro(logging.WARNING))
+        assert filtro.filter(_registro(logging.ERROR))
+    
+    @pytest.mark.parametrize("taxa", [1.0, 2.0])
+    def test_taxa_total(self, taxa):
+        filtro = SamplingFilter(taxa)
+        assert all(filtro.filter(_registro()) for _ in range(10))
@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+
+from src import metrics
+from src.metrics import Counter, Histogram
+from src.utils import ValidationError
+
+
+@pytest.fixture
+def histograma():
+    h = Histogram("teste_segundos", "Histograma de teste", ("status",), buckets=(0.1, 1.0))
+    yield h
+    metrics._metricas.remove(h)
+
+
+@pytest.fixture
+def contador():
+    c = Counter("teste_total", "Contador de teste", ("resultado",))
+    yield c
+    metrics._metricas.remove(c)
+
+
+class TestHistogram:
+    def test_buckets_acumulados(self, histograma):
+        for valor in (0.05, 0.1, 0.5, 2.0):
+            histograma.observe(valor, "ok")
+        linhas = histograma.render()
+        assert 'teste_segundos_bucket{status="ok",le="0.1"} 2' in linhas
+        assert 'teste_segundos_bucket{status="ok",le="1"} 3' in linhas
+        assert 'teste_segundos_bucket{status="ok",le="+Inf"} 4' in linhas
+        assert 'teste_segundos_sum{status="ok"} 2.65' in linhas
+        assert 'teste_segundos_count{status="ok"} 4' in linhas
+    
+    def test_soma_das_threads(self, histograma):
+        """Cada thread grava no próprio dicionário; a leitura soma todos"""
+        def observar():
+            for _ in range(1000):
+                histograma.observe(0.01, "ok")
+        
+        threads = [threading.Thread(target=observar) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        # Valores de threads encerradas continuam contando
+        assert histograma.contagem("ok") == 4000
+        assert len(histograma._shards) == 4
+    
+    def test_medir_bloco_com_excecao(self, histograma):
+        with pytest.raises(RuntimeError):
+            with histograma.time("falha"):
+                raise RuntimeError()
+        assert histograma.contagem("falha") == 1
+    
+    def test_reset(self, histograma):
+        histograma.observe(0.5, "ok")
+        histograma.reset()
+        assert histograma.contagem("ok") == 0
+
+
+class TestCounter:
+    def test_inc(self, contador):
+        contador.inc("acerto")
+        contador.inc("acerto", valor=2)
+        assert contador.valor("acerto") == 3
+        assert contador.render() == ['teste_total{resultado="acerto"} 3']
+    
+    def test_escapa_rotulos(self, contador):
+        contador.inc('a"b\\c\nd')
+        assert contador.render() == ['teste_total{resultado="a\\"b\\\\c\\nd"} 1']
+
+
+class TestRender:
+    def test_formato(self, contador):
+        contador.inc("acerto")
+        texto = metrics.render()
+        assert "# HELP teste_total Contador de teste\n# TYPE teste_total counter\n" in texto
+        assert "# TYPE lg_ai_validacao_segundos histogram" in texto
+        assert texto.endswith("\n")
+
+
+class TestInstrumentacao:
+    def test_validacao_por_status_e_canal(self, validator):
+        antes = metrics.VALIDACAO.contagem("obrigatorio", "VAREJO")
+        validator.validar_campo("MAGAZINE LUIZA", "num_cupom_nota")
+        assert metrics.VALIDACAO.contagem("obrigatorio", "VAREJO") == antes + 1
+    
+    def test_validacao_com_erro(self, validator):
+        antes = metrics.VALIDACAO.contagem("error", "")
+        with pytest.raises(ValidationError):
+            validator.validar_campo("REDE INEXISTENTE", "num_cupom_nota")
+        assert metrics.VALIDACAO.contagem("error", "") == antes + 1
+    
+    def test_cache_de_respostas(self, formatter):
+        acertos = metrics.RESPOSTAS_CACHE.valor("acerto")
+        formatacoes = metrics.FORMATACAO.contagem()
+        resultado = {
+            'status': 'opcional', 'campo_formatado': 'X', 'rede': 'R', 'canal': 'C',
+            'status_texto': 'texto', 'formato': None
+        }
+        for _ in range(3):
+            formatter.render_cached(("v", "R", "X"), lambda: resultado)
+        assert metrics.FORMATACAO.contagem() == formatacoes + 1
+        assert metrics.RESPOSTAS_CACHE.valor("acerto") == acertos + 2
+    
+    def test_analytics(self, tmp_path):
+        from src.analytics import Analytics
+        
+        gravados = metrics.ANALYTICS_EVENTOS.valor("gravado")
+        analytics = Analytics(log_file=tmp_path / "analytics.jsonl")
+        analytics.log_query("REDE", "campo", "opcional", "VAREJO")
+        analytics.close()
+        assert metrics.ANALYTICS_EVENTOS.valor("gravado") == gravados + 1
+        assert metrics.ANALYTICS_GRAVACAO.contagem() >= 1
@@ -0,0 +1,53 @@
+import threading
+import time
+
+from config import Config
+from src import profiler
+from src.profiler import SamplingProfiler, iniciar_profiler
+
+
+def _ocupado(parar):
+    while not parar.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler:
+    def test_pilhas_collapsed(self, tmp_path):
+        parar = threading.Event()
+        thread = threading.Thread(target=_ocupado, args=(parar,), name="trabalho")
+        thread.start()
+        try:
+            prof = SamplingProfiler(tmp_path / "perfil.collapsed")
+            for _ in range(5):
+                prof.amostrar()
+        finally:
+            parar.set()
+            thread.join()
+        
+        linhas = prof.collapsed().splitlines()
+        assert prof.amostras == 5
+        trabalho = [l for l in linhas if l.startswith("trabalho;")]
+        assert trabalho and all("_ocupado (test_profiler.py:" in l for l in trabalho)
+        # Uma pilha por linha, terminada pela contagem
+        assert sum(int(l.rsplit(" ", 1)[1]) for l in trabalho) == 5
+    
+    def test_ignora_propria_thread(self, tmp_path):
+        prof = SamplingProfiler(tmp_path / "perfil.collapsed")
+        prof.amostrar()
+        assert "test_ignora_propria_thread" not in prof.collapsed()
+    
+    def test_thread_grava_arquivo(self, tmp_path):
+        arquivo = tmp_path / "perfil" / "saida.collapsed"
+        prof = SamplingProfiler(arquivo, intervalo_ms=1, flush_interval=0.01)
+        prof.start()
+        time.sleep(0.1)
+        prof.stop()
+        
+        assert prof.amostras > 0
+        assert arquivo.read_text(encoding="utf-8") == prof.collapsed()
+        assert not arquivo.with_name("saida.collapsed.tmp").exists()
+    
+    def test_desligado_por_padrao(self, monkeypatch):
+        monkeypatch.setattr(Config, "PROFILE_ENABLED", False)
+        assert iniciar_profiler() is None
+        assert profiler._profiler is None
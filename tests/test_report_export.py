@@ -0,0 +1,100 @@
+import csv
+import io
+import os
+import threading
+import time
+import pytest
+from openpyxl import load_workbook
+from config import Config
+from src import report_export
+from src.report_export import exportar, iter_csv
+
+
+@pytest.fixture
+def relatorio(validator, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'EXPORT_DIR', tmp_path / "exports")
+    return validator.relatorio_rede("MAGAZINE LUIZA")
+
+
+class TestReportExport:
+    def test_csv_em_trechos(self, relatorio):
+        """Um trecho por linha de campo, com BOM e cabeçalho no primeiro"""
+        trechos = list(iter_csv(relatorio))
+        assert len(trechos) == len(relatorio['campos'])
+        assert trechos[0].startswith('\ufeffCAMPO;STATUS;FORMATO')
+        
+        linhas = list(csv.reader(io.StringIO("".join(trechos).lstrip('\ufeff')), delimiter=';'))
+        assert linhas[1] == ['NUM_CUPOM_NOTA', 'Obrigatório', 'Número do cupom fiscal']
+        assert linhas[3] == ['OBSERVACAO', 'Opcional', '']
+    
+    def test_xlsx(self, relatorio):
+        caminho = exportar(relatorio, 'xlsx')
+        ws = load_workbook(caminho).active
+        linhas = list(ws.iter_rows(values_only=True))
+        assert linhas[0] == ('CAMPO', 'STATUS', 'FORMATO')
+        assert linhas[2] == ('DATA_VENDA', 'Obrigatório', 'Data no formato DD/MM/AAAA')
+        assert len(linhas) == 4
+    
+    def test_cache_por_versao(self, relatorio):
+        """Mesma rede e versão reaproveitam o arquivo; nova versão gera outro"""
+        primeiro = exportar(relatorio, 'csv')
+        assert exportar(relatorio, 'csv') == primeiro
+        assert primeiro.read_text(encoding='utf-8-sig').startswith('CAMPO;STATUS')
+        
+        novo = exportar(dict(relatorio, versao='outra'), 'csv')
+        assert novo != primeiro
+    
+    def test_formato_invalido(self, relatorio):
+        with pytest.raises(ValueError):
+            exportar(relatorio, 'pdf')
+    
+    def test_redes_com_mesmo_nome_legivel(self, relatorio):
+        """Redes que diferem só em acentos ou pontuação não compartilham o arquivo em cache"""
+        primeiro = exportar(dict(relatorio, rede='CASA & CIA'), 'csv')
+        segundo = exportar(dict(relatorio, rede='CASA CIA'), 'csv')
+        assert primeiro != segundo
+        assert primeiro.name.startswith('campos_CASA_CIA_')
+    
+    def test_exportacoes_simultaneas(self, relatorio, monkeypatch):
+        """Threads exportando a mesma rede usam temporários distintos"""
+        barreira = threading.Barrier(2, timeout=10)
+        write_csv = report_export.write_csv
+        
+        def write_csv_simultaneo(relatorio, path):
+            # As duas threads gravam antes de qualquer uma mover o arquivo
+            write_csv(relatorio, path)
+            barreira.wait()
+        
+        monkeypatch.setattr(report_export, 'write_csv', write_csv_simultaneo)
+        resultados, erros = [], []
+        
+        def exportar_thread():
+            try:
+                resultados.append(exportar(relatorio, 'csv'))
+            except Exception as e:
+                erros.append(e)
+        
+        threads = [threading.Thread(target=exportar_thread) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert erros == []
+        assert resultados[0] == resultados[1]
+        assert resultados[0].read_text(encoding='utf-8-sig').startswith('CAMPO;STATUS')
+        assert list(Config.EXPORT_DIR.glob('*.tmp')) == []
+    
+    def test_exportacoes_antigas_apagadas(self, relatorio, monkeypatch):
+        """Arquivos sem uso há mais de EXPORT_TTL_S são apagados na próxima exportação"""
+        antigo = exportar(relatorio, 'csv')
+        usado = exportar(relatorio, 'xlsx')
+        passado = time.time() - Config.EXPORT_TTL_S - 60
+        os.utime(antigo, (passado, passado))
+        os.utime(usado, (passado, passado))
+        
+        # Reaproveitar renova a validade
+        assert exportar(relatorio, 'xlsx') == usado
+        exportar(dict(relatorio, versao='outra'), 'csv')
+        assert not antigo.exists()
+        assert usado.exists()
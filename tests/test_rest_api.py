@@ -0,0 +1,147 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from config import Config
+from src.rest_api import create_router
+
+
+@pytest.fixture
+def client(validator):
+    """Cliente HTTP da API REST com dados mockados"""
+    app = FastAPI()
+    app.include_router(create_router(lambda: validator))
+    return TestClient(app)
+
+
+class TestValidacao:
+    def test_campo_obrigatorio(self, client):
+        """Retorna o resultado da validação em JSON"""
+        resposta = client.get("/v1/validacao", params={'rede': 'MAGAZINE LUIZA', 'campo': 'NUM_CUPOM_NOTA'})
+        assert resposta.status_code == 200
+        dados = resposta.json()
+        assert dados['status'] == 'obrigatorio'
+        assert dados['canal'] == 'VAREJO'
+        assert dados['campo_formatado'] == 'NUM_CUPOM_NOTA'
+    
+    def test_campo_invalido(self, client):
+        """Erro de validação vira 422 com a mensagem"""
+        resposta = client.get("/v1/validacao", params={'rede': 'MAGAZINE LUIZA', 'campo': 'CAMPO_INEXISTENTE'})
+        assert resposta.status_code == 422
+        assert 'CAMPO_INEXISTENTE' in resposta.json()['detail']
+    
+    def test_parametros_obrigatorios(self, client):
+        """Sem rede/campo a requisição é rejeitada"""
+        assert client.get("/v1/validacao").status_code == 422
+
+
+class TestLote:
+    def test_lote(self, client):
+        """Resultados na ordem das consultas, com erro por item"""
+        resposta = client.post("/v1/validacao/lote", json={'consultas': [
+            {'rede': 'MAGAZINE LUIZA', 'campo': 'NUM_CUPOM_NOTA'},
+            {'rede': 'REDE INEXISTENTE', 'campo': 'DATA_VENDA'},
+            {'rede': 'CASAS BAHIA', 'campo': 'OBSERVACAO'},
+        ]})
+        assert resposta.status_code == 200
+        resultados = resposta.json()['resultados']
+        assert len(resultados) == 3
+        assert resultados[0]['resultado']['status'] == 'obrigatorio'
+        assert resultados[1]['resultado'] is None
+        assert 'REDE INEXISTENTE' in resultados[1]['erro']
+        assert resultados[1]['sugestoes'] == []
+        assert resultados[2]['resultado']['status'] == 'opcional'
+    
+    def test_limite_lote(self, client):
+        """Lotes acima de Config.API_MAX_LOTE são rejeitados"""
+        consultas = [{'rede': 'MAGAZINE LUIZA', 'campo': 'DATA_VENDA'}] * (Config.API_MAX_LOTE + 1)
+        resposta = client.post("/v1/validacao/lote", json={'consultas': consultas})
+        assert resposta.status_code == 422
+    
+    def test_registra_analytics(self, validator, tmp_path):
+        """Consultas bem-sucedidas são registradas no analytics"""
+        from src.analytics import Analytics
+        analytics = Analytics(log_file=tmp_path / "analytics.jsonl")
+        app = FastAPI()
+        app.include_router(create_router(lambda: validator, lambda: analytics))
+        TestClient(app).post("/v1/validacao/lote", json={'consultas': [
+            {'rede': 'MAGAZINE LUIZA', 'campo': 'NUM_CUPOM_NOTA'},
+            {'rede': 'MAGAZINE LUIZA', 'campo': 'INEXISTENTE'},
+        ]})
+        analytics.flush()
+        assert analytics.get_stats()['total_queries'] == 1
+        analytics.close()
+
+
+class TestBusca:
+    def test_busca_redes(self, client):
+        resposta = client.get("/v1/busca/redes", params={'q': 'casas'})
+        assert resposta.json() == {'resultados': ['CASAS BAHIA']}
+    
+    def test_busca_campos(self, client):
+        resposta = client.get("/v1/busca/campos", params={'q': 'cupom', 'limite': 1})
+        assert resposta.json() == {'resultados': ['NUM_CUPOM_NOTA']}
+
+
+class TestRelatorio:
+    def test_json(self, client):
+        resposta = client.get("/v1/relatorio", params={'rede': 'MAGAZINE LUIZA'})
+        assert resposta.status_code == 200
+        assert resposta.json()['totais'] == {'obrigatorio': 2, 'opcional': 1, 'branco': 0}
+    
+    def test_csv(self, client):
+        resposta = client.get("/v1/relatorio", params={'rede': 'MAGAZINE LUIZA', 'formato': 'csv'})
+        assert resposta.headers['content-type'].startswith('text/csv')
+        assert 'attachment' in resposta.headers['content-disposition']
+        assert resposta.content.decode('utf-8-sig').splitlines()[1].startswith('NUM_CUPOM_NOTA;')
+    
+    def test_xlsx(self, client, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, 'EXPORT_DIR', tmp_path)
+        resposta = client.get("/v1/relatorio", params={'rede': 'MAGAZINE LUIZA', 'formato': 'xlsx'})
+        assert resposta.status_code == 200
+        assert resposta.content[:2] == b'PK'
+    
+    def test_rede_invalida(self, client):
+        assert client.get("/v1/relatorio", params={'rede': 'X'}).status_code == 422
+
+
+class TestModelo:
+    @pytest.fixture
+    def client_modelo(self, validator):
+        from src.template_builder import TemplateBuilder
+        
+        builder = TemplateBuilder(validator.data_loader)
+        app = FastAPI()
+        app.include_router(create_router(lambda: validator, get_template_builder=lambda: builder))
+        return TestClient(app)
+    
+    def test_download_e_etag(self, client_modelo):
+        """Modelo em Excel com ETag; revalidação com If-None-Match responde 304"""
+        resposta = client_modelo.get("/v1/modelo", params={'rede': 'MAGAZINE LUIZA'})
+        assert resposta.status_code == 200
+        assert resposta.content[:2] == b'PK'
+        assert 'VAREJO' in resposta.headers['content-disposition']
+        
+        etag = resposta.headers['etag']
+        revalidacao = client_modelo.get("/v1/modelo", params={'canal': 'VAREJO'}, headers={'If-None-Match': etag})
+        assert revalidacao.status_code == 304
+        assert revalidacao.content == b''
+    
+    def test_canal_invalido(self, client_modelo):
+        assert client_modelo.get("/v1/modelo", params={'canal': 'X'}).status_code == 422
+        assert client_modelo.get("/v1/modelo").status_code == 422
+    
+    def test_sem_builder(self, client):
+        """Sem TemplateBuilder a rota não é registrada"""
+        assert client.get("/v1/modelo", params={'canal': 'VAREJO'}).status_code == 404
+
+
+class TestDadosCliente:
+    def test_etag(self, client):
+        """Resumo da tabela em JSON; com o mesmo ETag responde 304"""
+        resposta = client.get("/v1/dados")
+        assert resposta.status_code == 200
+        assert resposta.json()['status'] == {'VAREJO': '001'}
+        
+        etag = resposta.headers['etag']
+        assert client.get("/v1/dados", headers={'If-None-Match': etag}).status_code == 304
@@ -0,0 +1,52 @@
+import pytest
+from src.search_index import SearchIndex, fold
+
+
+@pytest.fixture
+def indice():
+    return SearchIndex([
+        'ARMAZÉM MATEUS', 'CASAS BAHIA', 'CASSOL', 'MAGAZINE LUIZA', 'GAZIN', 'GAZIN ATACADO'
+    ])
+
+
+class TestFold:
+    def test_acentos_e_separadores(self):
+        assert fold("Número__Cupom-Nota") == "numero cupom nota"
+        assert fold("  ARMAZÉM   MATEUS ") == "armazem mateus"
+
+
+class TestSearchIndex:
+    def test_prefixo(self, indice):
+        assert indice.search("cas") == ['CASSOL', 'CASAS BAHIA']
+    
+    def test_prefixo_de_palavra(self, indice):
+        assert indice.search("luiza")[0] == 'MAGAZINE LUIZA'
+    
+    def test_sem_acento(self, indice):
+        assert indice.search("armazem")[0] == 'ARMAZÉM MATEUS'
+    
+    def test_exato_primeiro(self, indice):
+        assert indice.search("gazin")[:2] == ['GAZIN', 'GAZIN ATACADO']
+    
+    def test_erro_de_digitacao(self, indice):
+        assert indice.search("magazni luiza")[0] == 'MAGAZINE LUIZA'
+    
+    def test_consulta_vazia(self, indice):
+        assert indice.search("", limite=2) == ['ARMAZÉM MATEUS', 'CASAS BAHIA']
+    
+    def test_sem_resultado(self, indice):
+        assert indice.search("xyz") == []
+    
+    def test_limite(self, indice):
+        assert indice.search("gazin", limite=1) == ['GAZIN']
+
+
+class TestSuggest:
+    def test_sugere_termo_parecido(self):
+        indice = SearchIndex(['NUM_CUPOM_NOTA', 'CNPJ_EMISSAO', 'CNPJ_LOJA'])
+        assert indice.suggest('cnpj_emisao')[0] == 'CNPJ_EMISSAO'
+        assert indice.suggest('CUPOM_NOTA') == ['NUM_CUPOM_NOTA']
+    
+    def test_sem_sugestao_para_termo_distante(self):
+        indice = SearchIndex(['NUM_CUPOM_NOTA', 'CNPJ_EMISSAO'])
+        assert indice.suggest('observacao') == []
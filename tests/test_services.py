@@ -0,0 +1,67 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from config import Config
+from src import analytics, services
+
+
+@pytest.fixture
+def criacoes(monkeypatch):
+    """Substitui a criação dos serviços, registrando a thread de cada chamada"""
+    threads = []
+    
+    def _create_services():
+        threads.append(threading.current_thread())
+        return MagicMock(spec=services.Services)
+    
+    monkeypatch.setattr(services, "_services", None)
+    monkeypatch.setattr(services, "_create_services", _create_services)
+    return threads
+
+
+class TestServices:
+    def test_criados_uma_vez(self, criacoes):
+        assert not services.is_loaded()
+        services.warm_up()
+        assert services.is_loaded()
+        assert services.get_services() is services.get_services()
+        assert len(criacoes) == 1
+    
+    def test_async_carrega_fora_do_event_loop(self, criacoes):
+        """Primeira chamada (leitura das planilhas) roda em thread; as seguintes não"""
+        async def _duas_chamadas():
+            return await services.get_services_async(), await services.get_services_async()
+        
+        primeiro, segundo = asyncio.run(_duas_chamadas())
+        assert primeiro is segundo
+        assert len(criacoes) == 1
+        assert criacoes[0] is not threading.main_thread()
+    
+    def test_async_chamadas_concorrentes(self, criacoes):
+        """Várias consultas simultâneas na partida a frio criam os serviços uma única vez"""
+        async def _concorrentes():
+            return await asyncio.gather(*(services.get_services_async() for _ in range(10)))
+        
+        resultados = asyncio.run(_concorrentes())
+        assert all(r is resultados[0] for r in resultados)
+        assert len(criacoes) == 1
+    
+    def test_criacao_real(self, data_dir, monkeypatch):
+        """Serviços montados a partir das planilhas, com o cache de respostas ligado à recarga"""
+        monkeypatch.setattr(services, "_services", None)
+        monkeypatch.setattr(Config, "AUTO_RELOAD", False)
+        criar_analytics = analytics.Analytics
+        monkeypatch.setattr(
+            analytics, "Analytics", lambda: criar_analytics(log_file=data_dir / "analytics.jsonl")
+        )
+        
+        criados = services.get_services()
+        try:
+            assert criados.data_loader.get_lista_redes()
+            assert criados.file_validator.validator is criados.validator
+            assert criados.formatter.clear_cache in criados.data_loader._reload_listeners
+        finally:
+            criados.analytics.close()
@@ -0,0 +1,91 @@
+import dataclasses
+import pytest
+from config import Config
+from src import shared_data
+from src.data_loader import DataLoader
+from src.validator import Validator
+import build_snapshot
+
+
+def _sem_planilhas(monkeypatch):
+    """Faz qualquer leitura das planilhas falhar"""
+    def _falha(self, versao=""):
+        raise AssertionError("Planilhas não deveriam ser lidas")
+    monkeypatch.setattr(DataLoader, '_parse_sources', _falha)
+
+
+@pytest.fixture
+def publicado(data_dir):
+    """Dados lidos das planilhas e publicados no arquivo compartilhado"""
+    original = DataLoader()
+    original.load_all(use_snapshot=False)
+    path = original.save_shared(data_dir / "dados.bin")
+    return original, path
+
+
+class TestSharedData:
+    def test_mesmos_dados(self, publicado):
+        original, path = publicado
+        dados, fontes = shared_data.load_shared(path)
+        
+        assert fontes == original._fontes
+        assert dados.versao == original.data.versao
+        assert dados.comentarios == original.comentarios
+        assert dados.canal_por_rede == original.data.canal_por_rede
+        assert dados.status_table.campos == original.status_table.campos
+        assert [bytes(l) for l in dados.status_table.matrix] == list(original.status_table.matrix)
+    
+    def test_matriz_sem_copia(self, publicado):
+        """Linhas da matriz são views sobre o arquivo mapeado"""
+        _, path = publicado
+        dados, _ = shared_data.load_shared(path)
+        assert all(isinstance(linha, memoryview) for linha in dados.status_table.matrix)
+    
+    def test_worker_nao_le_planilhas(self, publicado, monkeypatch):
+        original, path = publicado
+        _sem_planilhas(monkeypatch)
+        
+        loader = DataLoader(shared_file=path)
+        loader.load_all()
+        
+        rede = loader.get_lista_redes()[0]
+        campo = loader.get_lista_campos()[0]
+        assert Validator(loader).validar_campo(rede, campo) == Validator(original).validar_campo(rede, campo)
+    
+    def test_recarga_por_troca_atomica(self, publicado):
+        original, path = publicado
+        loader = DataLoader(shared_file=path)
+        loader.load_all()
+        assert loader.reload() is False
+        
+        # Nova versão publicada com uma rede a menos
+        rede = loader.get_lista_redes()[0]
+        mapa = {r: c for r, c in original.mapa_rede_canal.items() if r != rede}
+        novos = dataclasses.replace(original.data, mapa_rede_canal=mapa, versao="nova")
+        shared_data.save_shared(path, novos, original._fontes)
+        
+        assert loader.reload() is True
+        assert loader.data.versao == "nova"
+        assert rede not in loader.get_lista_redes()
+    
+    def test_arquivo_corrompido_le_planilhas(self, data_dir):
+        path = data_dir / "dados.bin"
+        path.write_bytes(b"lixo")
+        loader = DataLoader(shared_file=path)
+        loader.load_all()
+        assert loader.get_lista_redes()
+    
+    def test_modo_ativado_por_config(self, data_dir, monkeypatch):
+        monkeypatch.setattr(Config, 'SHARED_DATA', True)
+        monkeypatch.setattr(Config, 'SHARED_DATA_FILE', data_dir / "dados.bin")
+        assert DataLoader().shared_file == data_dir / "dados.bin"
+    
+    def test_cli_shared(self, data_dir, monkeypatch):
+        destino = data_dir / "deploy.bin"
+        assert build_snapshot.main(['--shared', '--check', '--output', str(destino)]) == 1
+        assert build_snapshot.main(['--shared', '--output', str(destino)]) == 0
+        assert build_snapshot.main(['--shared', '--check', '--output', str(destino)]) == 0
+        
+        with open(Config.REDES_FILE, 'ab') as f:
+            f.write(b'\0')
+        assert build_snapshot.main(['--shared', '--check', '--output', str(destino)]) == 1
@@ -0,0 +1,55 @@
+import os
+from config import Config
+from src import snapshot
+from src.data_loader import DataLoader
+import build_snapshot
+
+
+def _sem_planilhas(monkeypatch):
+    """Faz qualquer leitura das planilhas falhar"""
+    def _falha(self, versao=""):
+        raise AssertionError("Planilhas não deveriam ser lidas")
+    monkeypatch.setattr(DataLoader, '_parse_sources', _falha)
+
+
+class TestSnapshot:
+    def test_primeira_carga_grava_snapshot(self, data_dir):
+        DataLoader().load_all()
+        assert Config.SNAPSHOT_FILE.exists()
+    
+    def test_segunda_carga_usa_snapshot(self, data_dir, monkeypatch):
+        original = DataLoader()
+        original.load_all()
+        
+        _sem_planilhas(monkeypatch)
+        loader = DataLoader()
+        loader.load_all()
+        assert loader.get_lista_redes() == original.get_lista_redes()
+        assert loader.comentarios == original.comentarios
+        assert loader.status_table.matrix == original.status_table.matrix
+    
+    def test_mtime_alterado_com_mesmo_conteudo(self, data_dir, monkeypatch):
+        DataLoader().load_all()
+        os.utime(Config.CAMPOS_FILE, ns=(0, 0))
+        
+        _sem_planilhas(monkeypatch)
+        DataLoader().load_all()
+    
+    def test_planilha_alterada_invalida_snapshot(self, data_dir):
+        DataLoader().load_all()
+        with open(Config.REDES_FILE, 'ab') as f:
+            f.write(b'\0')
+        
+        fontes = snapshot.load_snapshot(Config.SNAPSHOT_FILE, DataLoader.get_source_files())
+        assert fontes is None
+    
+    def test_snapshot_corrompido(self, data_dir):
+        Config.SNAPSHOT_FILE.parent.mkdir()
+        Config.SNAPSHOT_FILE.write_bytes(b'lixo')
+        assert snapshot.load_snapshot(Config.SNAPSHOT_FILE, DataLoader.get_source_files()) is None
+    
+    def test_cli_build_e_check(self, data_dir, capsys):
+        destino = data_dir / "deploy.pkl"
+        assert build_snapshot.main(['--check', '--output', str(destino)]) == 1
+        assert build_snapshot.main(['--output', str(destino)]) == 0
+        assert build_snapshot.main(['--check', '--output', str(destino)]) == 0
@@ -0,0 +1,176 @@
+import gzip
+import threading
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from config import Config
+from src.static_assets import CACHE_IMUTAVEL, StaticAssets
+
+
+@pytest.fixture
+def assets(tmp_path, monkeypatch):
+    """Diretório com um script e uma imagem PNG"""
+    from PIL import Image
+    
+    monkeypatch.setattr(Config, 'STATIC_CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(Config, 'STATIC_BUILD_DIR', tmp_path / 'build')
+    diretorio = tmp_path / 'public'
+    diretorio.mkdir()
+    (diretorio / 'app.js').write_text("console.log('LG');\n" * 200)
+    Image.new('RGB', (256, 256), (165, 0, 52)).save(diretorio / 'logo.png', compress_level=0)
+    (tmp_path / 'segredo.txt').write_text("não servir")
+    return StaticAssets(diretorio, "/public")
+
+
+@pytest.fixture
+def client(assets):
+    app = FastAPI()
+    
+    @app.get("/public/{nome:path}")
+    def public(nome: str, request: Request):
+        return assets.responder(request, nome)
+    
+    return TestClient(app)
+
+
+class TestCompressao:
+    def test_brotli_preferido(self, client):
+        resposta = client.get("/public/app.js", headers={'Accept-Encoding': 'gzip, br'})
+        assert resposta.headers['content-encoding'] == 'br'
+        assert resposta.headers['vary'] == 'Accept-Encoding'
+        assert resposta.text.startswith("console.log")
+    
+    def test_gzip_e_q_zero(self, client):
+        resposta = client.get("/public/app.js", headers={'Accept-Encoding': 'br;q=0, gzip'})
+        assert resposta.headers['content-encoding'] == 'gzip'
+    
+    def test_sem_compressao(self, client, assets):
+        resposta = client.get("/public/app.js", headers={'Accept-Encoding': 'identity'})
+        assert 'content-encoding' not in resposta.headers
+        assert resposta.content == assets.get('app.js').original.conteudo
+        assert gzip.decompress(assets.get('app.js').comprimidos['gzip'].conteudo) == resposta.content
+
+
+class TestCacheHttp:
+    def test_etag_e_304(self, client):
+        """Revalidação com o ETag da mesma representação responde 304 sem corpo"""
+        primeira = client.get("/public/app.js", headers={'Accept-Encoding': 'gzip'})
+        assert primeira.headers['cache-control'] == 'no-cache'
+        
+        etag = primeira.headers['etag']
+        segunda = client.get("/public/app.js", headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        assert segunda.status_code == 304
+        assert segunda.content == b''
+        assert segunda.headers['etag'] == etag
+        
+        # Outra codificação é outra representação: não revalida com o mesmo ETag
+        outra = client.get("/public/app.js", headers={'Accept-Encoding': 'identity', 'If-None-Match': etag})
+        assert outra.status_code == 200
+    
+    def test_url_versionada_imutavel(self, client, assets):
+        url = assets.url('app.js')
+        assert url.startswith('/public/app.js?v=')
+        assert client.get(url).headers['cache-control'] == CACHE_IMUTAVEL
+        # Versão desatualizada é revalidada normalmente
+        assert client.get("/public/app.js?v=antiga").headers['cache-control'] == 'no-cache'
+    
+    def test_arquivo_inexistente(self, client, assets):
+        assert client.get("/public/nada.js").status_code == 404
+        assert assets.url('nada.js') == '/public/nada.js'
+    
+    def test_fora_do_diretorio(self, assets):
+        assert assets.get('../segredo.txt') is None
+
+
+class TestDerivadosImagem:
+    def test_formatos_modernos(self, client, assets):
+        """Com os derivados prontos, AVIF/WebP são enviados conforme o Accept"""
+        assets.preparar(derivados=True)
+        original = assets.get('logo.png').original
+        
+        webp = client.get("/public/logo.png", headers={'Accept': 'image/webp,*/*'})
+        assert webp.headers['content-type'] == 'image/webp'
+        assert webp.headers['vary'] == 'Accept'
+        assert len(webp.content) < len(original.conteudo)
+        
+        png = client.get("/public/logo.png", headers={'Accept': '*/*'})
+        assert png.headers['content-type'] == 'image/png'
+        assert png.content == original.conteudo
+        
+        if 'image/avif' in assets.get('logo.png').derivados:
+            avif = client.get("/public/logo.png", headers={'Accept': 'image/avif,image/webp'})
+            assert avif.headers['content-type'] == 'image/avif'
+    
+    def test_cache_em_disco(self, assets, tmp_path):
+        """Derivados são gravados pelo hash do original e reaproveitados"""
+        assets.preparar(derivados=True)
+        asset = assets.get('logo.png')
+        assert (tmp_path / 'cache' / f"{asset.hash}.webp").exists()
+        
+        novo = StaticAssets(assets.diretorio, "/public")
+        novo.preparar()
+        assert novo.get('logo.png').derivados['image/webp'].conteudo == asset.derivados['image/webp'].conteudo
+    
+    def test_sob_demanda_por_formato(self, client, assets, tmp_path):
+        """Nada é codificado ao carregar; só o formato pedido, fora da requisição"""
+        assets.preparar()
+        assert assets.get('logo.png').derivados == {}
+        
+        primeira = client.get("/public/logo.png", headers={'Accept': 'image/webp,*/*'})
+        assert primeira.headers['content-type'] == 'image/png'
+        _aguardar_derivados()
+        
+        asset = assets.get('logo.png')
+        assert list(asset.derivados) == ['image/webp']
+        assert not (tmp_path / 'cache' / f"{asset.hash}.avif").exists()
+        segunda = client.get("/public/logo.png", headers={'Accept': 'image/webp,*/*'})
+        assert segunda.headers['content-type'] == 'image/webp'
+        
+        # Cliente sem formatos modernos não dispara codificação
+        client.get("/public/logo.png", headers={'Accept': 'image/png'})
+        _aguardar_derivados()
+        assert list(asset.derivados) == ['image/webp']
+    
+    def test_original_nao_imutavel_durante_codificacao(self, client, assets, monkeypatch):
+        """A URL versionada só recebe cache imutável quando o derivado aceito estiver pronto"""
+        liberar = threading.Event()
+        derivado = StaticAssets._derivado
+        
+        def derivado_lento(asset, formato, diretorio=None):
+            liberar.wait(timeout=30)
+            return derivado(asset, formato, diretorio)
+        
+        monkeypatch.setattr(StaticAssets, '_derivado', staticmethod(derivado_lento))
+        url = assets.url('logo.png')
+        
+        try:
+            primeira = client.get(url, headers={'Accept': 'image/avif,image/webp'})
+            assert primeira.headers['content-type'] == 'image/png'
+            assert primeira.headers['cache-control'] != CACHE_IMUTAVEL
+            segunda = client.get(url, headers={'Accept': 'image/avif'})
+            assert segunda.headers['cache-control'] != CACHE_IMUTAVEL
+        finally:
+            liberar.set()
+            _aguardar_derivados()
+        
+        pronta = client.get(url, headers={'Accept': 'image/avif,image/webp'})
+        assert pronta.headers['content-type'] in ('image/avif', 'image/webp')
+        assert pronta.headers['cache-control'] == CACHE_IMUTAVEL
+    
+    def test_derivados_da_implantacao(self, assets, tmp_path):
+        """Derivados gerados na implantação são usados sem codificar de novo"""
+        assets.preparar(derivados=True, destino=tmp_path / 'build')
+        asset = assets.get('logo.png')
+        assert (tmp_path / 'build' / f"{asset.hash}.webp").exists()
+        assert not (tmp_path / 'cache').exists()
+        
+        novo = StaticAssets(assets.diretorio, "/public")
+        assert novo.get('logo.png').derivados['image/webp'].conteudo == asset.derivados['image/webp'].conteudo
+
+
+def _aguardar_derivados():
+    for thread in threading.enumerate():
+        if thread.name == "lg-ai-derivados":
+            thread.join(timeout=30)
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+from src.status_table import StatusTable, codificar_status, OBRIGATORIO, OPCIONAL, BRANCO
+
+
+@pytest.fixture
+def tabela():
+    df = pd.DataFrame({
+        'CAMPO': ['CPF_VENDEDOR', 'OBS', 'CNPJ_REVENDA'],
+        'CAMPO_NORMALIZADO': ['cpf_vendedor', 'obs', 'cnpj_revenda'],
+        'IT': ['✓', '●', '✓'],
+        'VAREJO': ['✓', None, '✗'],
+    })
+    return StatusTable.from_dataframe(df)
+
+
+class TestCodificarStatus:
+    def test_simbolos(self):
+        assert codificar_status('✓') == OBRIGATORIO
+        assert codificar_status('✗') == BRANCO
+    
+    def test_outros_valores_sao_opcionais(self):
+        assert codificar_status('●') == OPCIONAL
+        assert codificar_status('') == OPCIONAL
+        assert codificar_status(float('nan')) == OPCIONAL
+
+
+class TestStatusTable:
+    def test_canais_exclui_colunas_de_campo(self, tabela):
+        assert tabela.canais == ('IT', 'VAREJO')
+    
+    def test_get_status(self, tabela):
+        assert tabela.get_status('IT', 'cpf_vendedor') == 'obrigatorio'
+        assert tabela.get_status('VAREJO', 'obs') == 'opcional'
+        assert tabela.get_status('VAREJO', 'cnpj_revenda') == 'branco'
+    
+    def test_get_status_inexistente(self, tabela):
+        assert tabela.get_status('ECOMMERCE', 'obs') is None
+        assert tabela.get_status('IT', 'campo_inexistente') is None
+    
+    def test_matriz_compacta(self, tabela):
+        assert all(isinstance(linha, bytes) for linha in tabela.matrix)
+        assert len(tabela.matrix[tabela.canal_index['IT']]) == len(tabela.campos)
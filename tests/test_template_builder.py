@@ -0,0 +1,139 @@
+import io
+import os
+import threading
+import time
+
+import pytest
+from openpyxl import load_workbook
+
+from config import Config
+
+from src.data_loader import DataLoader, LoadedData
+from src.status_table import StatusTable
+from src.template_builder import TemplateBuilder
+from src.utils import ValidationError
+
+
+def _publicar(loader, versao='v1'):
+    """Dados com os três status para o canal VAREJO"""
+    loader.set_data(LoadedData(
+        comentarios={'num_cupom_nota': 'Número do cupom fiscal', 'cpf_projetista': 'CPF (11 dígitos)'},
+        mapa_rede_canal={'MAGAZINE LUIZA': 'VAREJO'},
+        status_table=StatusTable.from_columns(
+            ['cpf_projetista', 'observacao', 'num_cupom_nota'],
+            {'VAREJO': ['✗', '', '✓']}
+        ),
+        versao=versao
+    ))
+
+
+@pytest.fixture
+def builder():
+    loader = DataLoader()
+    _publicar(loader)
+    return TemplateBuilder(loader)
+
+
+def _cabecalho(conteudo):
+    return load_workbook(io.BytesIO(conteudo)).active[1]
+
+
+class TestTemplateBuilder:
+    def test_ordem_das_colunas(self, builder):
+        """Obrigatórias primeiro, depois opcionais e por último as em branco"""
+        conteudo, _ = builder.gerar('VAREJO')
+        assert [c.value for c in _cabecalho(conteudo)] == ['num_cupom_nota', 'observacao', 'cpf_projetista']
+    
+    def test_coluna_em_branco_destacada(self, builder):
+        """Coluna que deve ficar em branco sai em cinza, com aviso e formato no comentário"""
+        conteudo, _ = builder.gerar('VAREJO')
+        obrigatoria, _, branco = _cabecalho(conteudo)
+        assert obrigatoria.comment.text == 'Número do cupom fiscal'
+        assert branco.fill.fgColor.rgb.endswith('D1D5DB')
+        assert branco.comment.text.startswith('Deve ficar em branco para o canal VAREJO.')
+        assert 'CPF (11 dígitos)' in branco.comment.text
+    
+    def test_cache_por_versao(self, builder):
+        """Downloads repetidos reaproveitam o arquivo; nova versão gera outro ETag"""
+        conteudo, etag = builder.gerar('VAREJO')
+        assert builder.gerar('VAREJO')[0] is conteudo
+        
+        _publicar(builder.data_loader, versao='v2')
+        novo, novo_etag = builder.gerar('VAREJO')
+        assert novo is not conteudo
+        assert novo_etag != etag
+        assert list(builder._cache) == [('v2', 'VAREJO')]
+    
+    def test_resolver_canal(self, builder):
+        assert builder.resolver_canal(canal=' varejo ') == 'VAREJO'
+        assert builder.resolver_canal(rede='MAGAZINE LUIZA') == 'VAREJO'
+        with pytest.raises(ValidationError):
+            builder.resolver_canal(canal='INEXISTENTE')
+        with pytest.raises(ValidationError):
+            builder.resolver_canal(rede='REDE INEXISTENTE')
+    
+    def test_salvar(self, builder, tmp_path, monkeypatch):
+        """Arquivo para a interface é gravado uma vez por versão dos dados"""
+        monkeypatch.setattr(Config, 'EXPORT_DIR', tmp_path)
+        caminho = builder.salvar('VAREJO')
+        assert caminho.read_bytes() == builder.gerar('VAREJO')[0]
+        assert builder.salvar('VAREJO') == caminho
+        assert caminho.parent.name == 'modelos_v1'
+    
+    def test_salvar_simultaneo(self, builder, tmp_path, monkeypatch):
+        """Downloads simultâneos do mesmo modelo usam temporários distintos"""
+        monkeypatch.setattr(Config, 'EXPORT_DIR', tmp_path)
+        barreira = threading.Barrier(2, timeout=10)
+        replace = os.replace
+        
+        def replace_simultaneo(origem, destino):
+            # As duas threads gravam antes de qualquer uma mover o arquivo
+            barreira.wait()
+            replace(origem, destino)
+        
+        monkeypatch.setattr(os, 'replace', replace_simultaneo)
+        resultados, erros = [], []
+        
+        def salvar():
+            try:
+                resultados.append(builder.salvar('VAREJO'))
+            except Exception as e:
+                erros.append(e)
+        
+        threads = [threading.Thread(target=salvar) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert erros == []
+        assert resultados[0] == resultados[1]
+        assert resultados[0].read_bytes() == builder.gerar('VAREJO')[0]
+        assert list(resultados[0].parent.glob('*.tmp')) == []
+    
+    def test_modelos_antigos_apagados(self, builder, tmp_path, monkeypatch):
+        """Diretórios de modelos de versões antigas saem junto com as exportações vencidas"""
+        monkeypatch.setattr(Config, 'EXPORT_DIR', tmp_path)
+        antigo = builder.salvar('VAREJO')
+        passado = time.time() - Config.EXPORT_TTL_S - 60
+        os.utime(antigo.parent, (passado, passado))
+        
+        # Reaproveitar renova a validade
+        assert builder.salvar('VAREJO') == antigo
+        os.utime(antigo.parent, (passado, passado))
+        
+        _publicar(builder.data_loader, versao='v2')
+        novo = builder.salvar('VAREJO')
+        assert novo.parent.name == 'modelos_v2'
+        assert not antigo.parent.exists()
+    
+    def test_cabecalhos_do_modelo_original(self, data_dir):
+        """Cabeçalhos gerados são os mesmos do Modelo_Arquivo_Vendas (formato de upload)"""
+        loader = DataLoader()
+        loader.load_all()
+        builder = TemplateBuilder(loader)
+        
+        modelo = [c.value for c in load_workbook(Config.MODELO_FILE).active[1] if c.value]
+        for canal in loader.status_table.canais:
+            gerados = [c.value for c in _cabecalho(builder.gerar(canal)[0])]
+            assert sorted(gerados) == sorted(modelo)
@@ -0,0 +1,112 @@
+import json
+import threading
+
+import pytest
+
+from config import Config
+from src import tracing
+from src.tracing import span, trace
+from src.utils import ValidationError
+
+
+@pytest.fixture
+def tracing_ligado(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "TRACE_ENABLED", True)
+    monkeypatch.setattr(Config, "TRACE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(Config, "TRACE_LIMIAR_MS", 0.0)
+    monkeypatch.setattr(Config, "TRACE_DIR", tmp_path / "traces")
+    return tmp_path / "traces" / "traces.jsonl"
+
+
+def _traces(arquivo):
+    assert tracing.flush(5)
+    return [json.loads(linha) for linha in arquivo.read_text(encoding="utf-8").splitlines()]
+
+
+class TestTracing:
+    def test_desligado(self, tracing_ligado, monkeypatch):
+        """Sem tracing, trace e span são o mesmo contexto vazio"""
+        monkeypatch.setattr(Config, "TRACE_ENABLED", False)
+        with trace("consulta") as t:
+            assert span("etapa") is tracing._NULO
+        assert t is tracing._NULO
+        assert tracing.flush(5)
+        assert not tracing_ligado.exists()
+    
+    def test_spans_aninhados(self, tracing_ligado):
+        with trace("consulta", rede="REDE"):
+            with span("externo"):
+                with span("interno"):
+                    pass
+        
+        [gravado] = _traces(tracing_ligado)
+        assert gravado['nome'] == "consulta"
+        assert gravado['atributos'] == {'rede': "REDE"}
+        # Spans registrados ao terminar: o interno primeiro
+        assert [(s['nome'], s['nivel']) for s in gravado['spans']] == [("interno", 1), ("externo", 0)]
+        externo = gravado['spans'][1]
+        assert externo['duracao_ms'] <= gravado['duracao_ms']
+    
+    def test_trace_interno_ignorado(self, tracing_ligado):
+        """Um trace dentro de outro não é iniciado; os spans vão para o externo"""
+        with trace("externo"):
+            with trace("interno"):
+                with span("etapa"):
+                    pass
+        
+        [gravado] = _traces(tracing_ligado)
+        assert gravado['nome'] == "externo"
+        assert [s['nome'] for s in gravado['spans']] == ["etapa"]
+    
+    def test_erro_registrado(self, tracing_ligado):
+        with pytest.raises(ValidationError):
+            with trace("consulta"):
+                with span("etapa"):
+                    raise ValidationError("falhou")
+        
+        [gravado] = _traces(tracing_ligado)
+        assert gravado['erro'] == "ValidationError"
+        assert gravado['spans'][0]['erro'] == "ValidationError"
+    
+    def test_limiar(self, tracing_ligado, monkeypatch):
+        """Traces mais rápidos que o limiar não são gravados"""
+        monkeypatch.setattr(Config, "TRACE_LIMIAR_MS", 60_000.0)
+        with trace("consulta"):
+            pass
+        assert tracing.flush(5)
+        assert not tracing_ligado.exists()
+    
+    def test_gravacao_fora_da_thread_da_consulta(self, tracing_ligado, monkeypatch):
+        """Encerrar o trace só enfileira: o arquivo é gravado pela thread de traces"""
+        threads = []
+        gravar_lote = tracing._gravar_lote
+        
+        def _registrar(traces):
+            threads.append(threading.current_thread().name)
+            gravar_lote(traces)
+        
+        monkeypatch.setattr(tracing, "_gravar_lote", _registrar)
+        with trace("consulta"):
+            pass
+        
+        assert len(_traces(tracing_ligado)) == 1
+        assert threads == ["lg-ai-traces"]
+    
+    def test_amostragem(self, tracing_ligado, monkeypatch):
+        monkeypatch.setattr(Config, "TRACE_SAMPLE_RATE", 0.0)
+        assert trace("consulta") is tracing._NULO
+    
+    def test_validacao_instrumentada(self, tracing_ligado, validator, formatter):
+        """Etapas da validação e da formatação aparecem no trace"""
+        with trace("responder_interface"):
+            formatter.render_cached(
+                ("v", "MAGAZINE LUIZA", "data_venda"),
+                lambda: validator.validar_campo("MAGAZINE LUIZA", "data_venda")
+            )
+        
+        [gravado] = _traces(tracing_ligado)
+        nomes = {s['nome'] for s in gravado['spans']}
+        assert {
+            "validator", "validator.sanitize", "validator.busca",
+            "validator.formato", "formatter.render"
+        } <= nomes
@@ -59,3 +59,32 @@ class TestValidator:
             campo="NUM__CUPOM-NOTA"  # Com caracteres especiais
         )
         assert resultado['status'] == 'obrigatorio'
+
+    def test_sugestao_campo(self, validator):
+        """Campo com erro de digitação sugere o campo correto"""
+        with pytest.raises(ValidationError) as erro:
+            validator.validar_campo(rede="MAGAZINE LUIZA", campo="DATA_VNDA")
+        assert erro.value.sugestoes[0] == 'DATA_VENDA'
+        assert 'Você quis dizer: DATA_VENDA' in str(erro.value)
+    
+    def test_sugestao_rede(self, validator):
+        """Rede com erro de digitação sugere a rede correta"""
+        with pytest.raises(ValidationError) as erro:
+            validator.validar_campo(rede="MAGAZINE LUISA", campo="DATA_VENDA")
+        assert erro.value.sugestoes == ['MAGAZINE LUIZA']
+
+    def test_relatorio_rede(self, validator):
+        """Todos os campos da rede em uma única consulta"""
+        relatorio = validator.relatorio_rede("MAGAZINE LUIZA")
+        assert relatorio['canal'] == 'VAREJO'
+        assert [c['campo'] for c in relatorio['campos']] == ['NUM_CUPOM_NOTA', 'DATA_VENDA', 'OBSERVACAO']
+        assert relatorio['totais'] == {'obrigatorio': 2, 'opcional': 1, 'branco': 0}
+        
+        # Mesmo resultado de uma chamada de validar_campo por campo
+        for item in relatorio['campos']:
+            resultado = validator.validar_campo("MAGAZINE LUIZA", item['campo'])
+            assert (item['status'], item['formato']) == (resultado['status'], resultado['formato'])
+    
+    def test_relatorio_rede_invalida(self, validator):
+        with pytest.raises(ValidationError):
+            validator.relatorio_rede("REDE INEXISTENTE")